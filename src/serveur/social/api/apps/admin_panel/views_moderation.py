@@ -84,7 +84,8 @@ class RemovePostView(APIView):
             action_type='delete',
             resource_type='post',
             resource_id=post_id,
-            ip_address=get_client_ip(request)
+            ip_address=get_client_ip(request),
+            durable=True
         )
         return api_success(status_code=204)
 
@@ -109,6 +110,7 @@ class RemoveCommentView(APIView):
             action_type='delete',
             resource_type='comment',
             resource_id=comment_id,
-            ip_address=get_client_ip(request)
+            ip_address=get_client_ip(request),
+            durable=True
         )
         return api_success(status_code=204)
@@ -37,6 +37,7 @@ class DeleteTagView(APIView):
             action_type='delete',
             resource_type='tag',
             resource_id=tag_id,
-            ip_address=get_client_ip(request)
+            ip_address=get_client_ip(request),
+            durable=True
         )
         return api_success(status_code=204)
@@ -3,7 +3,8 @@ URL configuration for comments app.
 """
 from django.urls import path
 from .views import (
-    PostCommentsView, CreateCommentView, DeleteCommentView, CommentRepliesView
+    PostCommentsView, CreateCommentView, DeleteCommentView, CommentRepliesView,
+    PostThreadsView, CommentThreadView
 )
 
 app_name = 'comments'
@@ -12,9 +13,11 @@ urlpatterns = [
     # Post comments
     path('posts/<str:post_id>/', PostCommentsView.as_view(), name='post-comments'),
     path('posts/<str:post_id>/create/', CreateCommentView.as_view(), name='create-comment'),
+    path('posts/<str:post_id>/threads/', PostThreadsView.as_view(), name='post-comment-threads'),
     
     # Comment operations
     path('<str:comment_id>/delete/', DeleteCommentView.as_view(), name='delete-comment'),
     path('<str:comment_id>/replies/', CommentRepliesView.as_view(), name='comment-replies'),
+    path('<str:comment_id>/thread/', CommentThreadView.as_view(), name='comment-thread'),
 ]
 
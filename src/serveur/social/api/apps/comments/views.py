@@ -11,7 +11,7 @@ from services.apps_services.comment_service import CommentService
 from common.permissions import IsAuthenticated, IsNotBanned
 from common.rate_limiters import rate_limit_comment_create, rate_limit_general
 from common.exceptions import NotFoundError, ValidationError, PermissionDeniedError
-from common.utils import get_client_ip
+from common.utils import get_client_ip, set_next_cursor
 from .serializers import CreateCommentSerializer, CommentSerializer
 
 
@@ -25,6 +25,7 @@ class PostCommentsView(APIView):
         manual_parameters=[
             openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
             openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)'),
             openapi.Parameter('sort_by', openapi.IN_QUERY, type=openapi.TYPE_STRING, default='created_at')
         ],
         responses={200: CommentSerializer(many=True)}
@@ -34,9 +35,10 @@ class PostCommentsView(APIView):
         """Get post comments."""
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
         sort_by = request.query_params.get('sort_by', 'created_at')
         
-        comments = CommentService.get_post_comments(post_id, page, page_size, sort_by)
+        comments = CommentService.get_post_comments(post_id, page, page_size, sort_by, cursor)
         
         data = [{
             'comment_id': str(comment.comment_id),
@@ -49,7 +51,7 @@ class PostCommentsView(APIView):
             'updated_at': comment.updated_at
         } for comment in comments]
         
-        return Response(data, status=status.HTTP_200_OK)
+        return set_next_cursor(Response(data, status=status.HTTP_200_OK), comments, page_size)
 
 
 class CreateCommentView(APIView):
@@ -131,7 +133,8 @@ class CommentRepliesView(APIView):
         operation_description="Get replies to a comment",
         manual_parameters=[
             openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
-            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20)
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)')
         ],
         responses={200: CommentSerializer(many=True)}
     )
@@ -140,8 +143,9 @@ class CommentRepliesView(APIView):
         """Get comment replies."""
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
         
-        replies = CommentService.get_comment_replies(comment_id, page, page_size)
+        replies = CommentService.get_comment_replies(comment_id, page, page_size, cursor)
         
         data = [{
             'comment_id': str(reply.comment_id),
@@ -154,5 +158,111 @@ class CommentRepliesView(APIView):
             'updated_at': reply.updated_at
         } for reply in replies]
         
-        return Response(data, status=status.HTTP_200_OK)
+        return set_next_cursor(Response(data, status=status.HTTP_200_OK), replies, page_size)
+
+
+def _thread_data(comment, replies) -> dict:
+    """Serialize a comment with its replies (in path order) nested under their parents."""
+    def node(item):
+        return {
+            'comment_id': str(item.comment_id),
+            'post_id': str(item.post_id),
+            'author_id': str(item.user_id),
+            'author_username': item.user.username if item.user else None,
+            'parent_comment_id': str(item.parent_comment_id) if item.parent_comment_id else None,
+            'depth': item.depth,
+            'content': item.content,
+            'created_at': item.created_at,
+            'updated_at': item.updated_at,
+            'replies': []
+        }
+    
+    data = node(comment)
+    nodes = {comment.comment_id: data}
+    for reply in replies:
+        nodes[reply.comment_id] = node(reply)
+        # Path order lists a parent before its replies
+        parent = nodes.get(reply.parent_comment_id)
+        if parent is not None:
+            parent['replies'].append(nodes[reply.comment_id])
+    return data
+
+
+class PostThreadsView(APIView):
+    """Get comments for a post with their nested replies."""
+    
+    permission_classes = [IsAuthenticated, IsNotBanned]
+    
+    @swagger_auto_schema(
+        operation_description="Get top-level comments of a post with their nested replies, loaded in one query",
+        manual_parameters=[
+            openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)'),
+            openapi.Parameter('replies_per_thread', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('max_depth', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description='Deepest reply level (all levels by default)')
+        ],
+        responses={200: 'Top-level comments with nested replies'}
+    )
+    @rate_limit_general
+    def get(self, request, post_id):
+        """Get post comment threads."""
+        page = int(request.query_params.get('page', 1))
+        page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
+        replies_per_thread = int(request.query_params.get('replies_per_thread', 20))
+        max_depth = request.query_params.get('max_depth')
+        max_depth = int(max_depth) if max_depth is not None else None
+        
+        threads = CommentService.get_post_threads(post_id, page, page_size, cursor, replies_per_thread, max_depth)
+        
+        data = []
+        for comment in threads:
+            thread = _thread_data(comment, comment.thread_replies)
+            thread['has_more_replies'] = comment.has_more_replies
+            data.append(thread)
+        
+        return set_next_cursor(Response(data, status=status.HTTP_200_OK), threads, page_size)
+
 
+class CommentThreadView(APIView):
+    """Get the nested replies of a comment."""
+    
+    permission_classes = [IsAuthenticated, IsNotBanned]
+    
+    @swagger_auto_schema(
+        operation_description="Get the nested replies of a comment in thread order (depth first)",
+        manual_parameters=[
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page'),
+            openapi.Parameter('max_depth', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, description='Deepest reply level below the comment (all levels by default)')
+        ],
+        responses={200: CommentSerializer(many=True)}
+    )
+    @rate_limit_general
+    def get(self, request, comment_id):
+        """Get comment thread."""
+        page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
+        max_depth = request.query_params.get('max_depth')
+        max_depth = int(max_depth) if max_depth is not None else None
+        
+        replies = CommentService.get_comment_thread(comment_id, page_size, cursor, max_depth)
+        
+        data = [{
+            'comment_id': str(reply.comment_id),
+            'post_id': str(reply.post_id),
+            'author_id': str(reply.user_id),
+            'author_username': reply.user.username if reply.user else None,
+            'parent_comment_id': str(reply.parent_comment_id),
+            'depth': reply.depth,
+            'content': reply.content,
+            'created_at': reply.created_at,
+            'updated_at': reply.updated_at
+        } for reply in replies]
+        
+        # The next page starts after the path of the last reply
+        return set_next_cursor(
+            Response(data, status=status.HTTP_200_OK), replies, page_size,
+            key=lambda reply: (reply.path, reply.pk), encoder=lambda path, pk: path
+        )
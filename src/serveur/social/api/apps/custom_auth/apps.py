@@ -0,0 +1,19 @@
+"""
+Custom authentication app configuration.
+"""
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class CustomAuthConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.custom_auth'
+    verbose_name = 'Firebase Authentication'
+
+    def ready(self):
+        from apps.custom_auth.token_cache import evict_cached_user
+        from db.entities.user_entity import User
+
+        # Ban, profile update or deletion: the next request reloads the user
+        post_save.connect(evict_cached_user, sender=User, dispatch_uid='token_cache_user_saved')
+        post_delete.connect(evict_cached_user, sender=User, dispatch_uid='token_cache_user_deleted')
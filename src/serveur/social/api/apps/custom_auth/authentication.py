@@ -1,12 +1,10 @@
 from typing import Optional, Tuple
 
-from django.conf import settings
 from rest_framework.authentication import BaseAuthentication
 from rest_framework import exceptions
-import firebase_admin
 from firebase_admin import auth as firebase_auth
-from firebase_admin import credentials
 
+from apps.custom_auth.token_cache import TokenCache
 from db.entities.user_entity import User
 
 
@@ -60,19 +58,9 @@ class FirebaseAuthentication(BaseAuthentication):
         if scheme.lower() != 'bearer':
             return None
 
-        # Initialize Firebase Admin SDK if not already done
-        if not firebase_admin._apps:
-            cred_path = getattr(settings, 'FIREBASE_SERVICE_ACCOUNT_KEY', None)
-            if cred_path:
-                cred = credentials.Certificate(cred_path)
-                firebase_admin.initialize_app(cred)
-            else:
-                # Initialize with default credentials (for Cloud environments)
-                firebase_admin.initialize_app()
-
         try:
-            # Verify the Firebase ID token
-            decoded_token = firebase_auth.verify_id_token(token)
+            # Verify the Firebase ID token (cached for a few minutes, see TokenCache)
+            decoded_token = TokenCache.verify(token)
             firebase_uid = decoded_token.get('uid')
             
             if not firebase_uid:
@@ -83,15 +71,13 @@ class FirebaseAuthentication(BaseAuthentication):
             request.firebase_email = decoded_token.get('email')
             request.firebase_token = decoded_token
             
-            # Try to find user in database by firebase_uid
-            # Assuming User model has a firebase_uid field (needs to be added)
-            try:
-                user = User.objects.get(firebase_uid=firebase_uid)
-                return (_WrappedUser(user), token)
-            except User.DoesNotExist:
+            # Try to find user in database (or in the token cache) by firebase_uid
+            user = TokenCache.get_user(firebase_uid)
+            if user is None:
                 # User authenticated via Firebase but not in database yet
                 # Return None to allow endpoint to handle user creation
                 return None
+            return (_WrappedUser(user), token)
                 
         except firebase_auth.InvalidIdTokenError as exc:
             print(f"Firebase InvalidIdTokenError: {exc}")
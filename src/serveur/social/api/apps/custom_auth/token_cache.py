@@ -0,0 +1,132 @@
+"""
+Cache of verified Firebase ID tokens and prefetching of Google's signing certificates.
+"""
+import hashlib
+import logging
+import threading
+import time
+from typing import Optional
+
+import firebase_admin
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from firebase_admin import _token_gen
+from firebase_admin import auth as firebase_auth
+from firebase_admin import credentials
+
+from db.entities.user_entity import User
+
+logger = logging.getLogger(__name__)
+
+
+def initialize_firebase() -> None:
+    """Initialize the Firebase Admin SDK if not already done."""
+    if not firebase_admin._apps:
+        cred_path = getattr(settings, 'FIREBASE_SERVICE_ACCOUNT_KEY', None)
+        if cred_path:
+            cred = credentials.Certificate(cred_path)
+            firebase_admin.initialize_app(cred)
+        else:
+            # Initialize with default credentials (for Cloud environments)
+            firebase_admin.initialize_app()
+
+
+class TokenCache:
+    """Short-lived cache of verified ID tokens and of the users they resolve to.
+
+    Claims are keyed by a hash of the token (the token itself never reaches
+    the cache) and expire after FIREBASE_TOKEN_CACHE_TTL seconds, or at the
+    token's `exp` if that comes first. User rows are keyed by Firebase UID and
+    evicted whenever the user is saved or deleted (ban, profile update).
+    """
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        return f"firebase_token:{hashlib.sha256(token.encode()).hexdigest()}"
+
+    @staticmethod
+    def _user_key(firebase_uid: str) -> str:
+        return f"firebase_user:{firebase_uid}"
+
+    @staticmethod
+    def verify(token: str) -> dict:
+        """Return the decoded claims of `token`, verifying it only on a cache miss.
+
+        Raises:
+            firebase_auth errors: If the token is invalid or expired
+        """
+        key = TokenCache._token_key(token)
+        claims = cache.get(key)
+        if claims is not None and claims.get('exp', 0) > time.time():
+            return claims
+
+        initialize_firebase()
+        claims = firebase_auth.verify_id_token(token)
+        ttl = min(settings.FIREBASE_TOKEN_CACHE_TTL, int(claims.get('exp', 0) - time.time()))
+        if ttl > 0:
+            cache.set(key, claims, ttl)
+        return claims
+
+    @staticmethod
+    def get_user(firebase_uid: str) -> Optional[User]:
+        """Return the user with this Firebase UID, from the cache when possible."""
+        key = TokenCache._user_key(firebase_uid)
+        user = cache.get(key)
+        if user is None:
+            user = User.objects.filter(firebase_uid=firebase_uid).first()
+            if user is not None:
+                cache.set(key, user, settings.FIREBASE_TOKEN_CACHE_TTL)
+        return user
+
+    @staticmethod
+    def evict_user(firebase_uid: str) -> None:
+        """Drop a cached user now and again once the current transaction commits."""
+        key = TokenCache._user_key(firebase_uid)
+        cache.delete(key)
+        # A request reading the row before the commit could cache it again
+        transaction.on_commit(lambda: cache.delete(key))
+
+
+def evict_cached_user(sender, instance: User, **kwargs) -> None:
+    """Signal receiver evicting a user whose row changed."""
+    if instance.firebase_uid:
+        TokenCache.evict_user(instance.firebase_uid)
+
+
+class CertificatePrefetcher:
+    """Keeps Google's token-signing certificates in the Firebase SDK's HTTP cache.
+
+    The certificates are downloaded once at startup, then re-downloaded every
+    FIREBASE_CERTS_REFRESH_INTERVAL seconds (below their ~6 hour max-age), so
+    `verify_id_token` always finds them fresh and no request pays the download.
+    """
+
+    _thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def start() -> None:
+        """Start the background refresh, once per process."""
+        if CertificatePrefetcher._thread is not None:
+            return
+        CertificatePrefetcher._thread = threading.Thread(
+            target=CertificatePrefetcher._run, name='firebase-certs-prefetch', daemon=True
+        )
+        CertificatePrefetcher._thread.start()
+
+    @staticmethod
+    def fetch() -> None:
+        """Download the certificates through the SDK's caching session, bypassing its cache."""
+        initialize_firebase()
+        # The SDK keeps its caching HTTP session on the auth client's token verifier
+        request = firebase_auth._get_client(firebase_admin.get_app())._token_verifier.request
+        request(_token_gen.ID_TOKEN_CERT_URI, headers={'cache-control': 'no-cache'})
+
+    @staticmethod
+    def _run() -> None:
+        while True:
+            try:
+                CertificatePrefetcher.fetch()
+            except Exception:
+                logger.warning('Could not prefetch Firebase certificates', exc_info=True)
+            time.sleep(settings.FIREBASE_CERTS_REFRESH_INTERVAL)
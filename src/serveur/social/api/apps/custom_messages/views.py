@@ -11,7 +11,7 @@ from services.apps_services.message_service import MessageService
 from common.permissions import IsAuthenticated, IsNotBanned
 from common.rate_limiters import rate_limit_message_send
 from common.exceptions import NotFoundError, ValidationError, PermissionDeniedError
-from common.utils import get_client_ip
+from common.utils import get_client_ip, set_next_cursor
 from .serializers import SendMessageSerializer, MessageSerializer, ConversationSerializer
 
 
@@ -61,7 +61,8 @@ class ConversationView(APIView):
         operation_description="Get conversation with a user",
         manual_parameters=[
             openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
-            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20)
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)')
         ],
         responses={200: MessageSerializer(many=True)}
     )
@@ -70,8 +71,9 @@ class ConversationView(APIView):
         """Get conversation."""
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
         
-        messages = MessageService.get_conversation(str(request.user.user_id), user_id, page, page_size)
+        messages = MessageService.get_conversation(str(request.user.user_id), user_id, page, page_size, cursor)
         
         data = [{
             'message_id': str(msg.message_id),
@@ -84,7 +86,7 @@ class ConversationView(APIView):
             'created_at': msg.created_at
         } for msg in messages]
         
-        return Response(data, status=status.HTTP_200_OK)
+        return set_next_cursor(Response(data, status=status.HTTP_200_OK), messages, page_size)
 
 
 class SendMessageView(APIView):
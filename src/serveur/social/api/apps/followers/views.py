@@ -11,7 +11,7 @@ from services.apps_services.follower_service import FollowerService
 from common.permissions import IsAuthenticated, IsNotBanned
 from common.rate_limiters import rate_limit_general
 from common.exceptions import NotFoundError, ValidationError, ConflictError
-from common.utils import get_client_ip
+from common.utils import get_client_ip, set_next_cursor
 from .serializers import FollowSerializer, UserFollowSerializer
 
 
@@ -130,7 +130,8 @@ class FollowersListView(APIView):
         operation_description="Get user's followers",
         manual_parameters=[
             openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
-            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20)
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)')
         ],
         responses={200: UserFollowSerializer(many=True)}
     )
@@ -139,8 +140,9 @@ class FollowersListView(APIView):
         """Get followers."""
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
         
-        followers = FollowerService.get_followers(str(request.user.user_id), page, page_size)
+        followers = FollowerService.get_followers(str(request.user.user_id), page, page_size, cursor)
         
         data = [{
             'user_id': str(user.user_id),
@@ -149,7 +151,7 @@ class FollowersListView(APIView):
             'profile_picture_url': user.profile.profile_picture_url
         } for user in followers]
         
-        return Response(data, status=status.HTTP_200_OK)
+        return set_next_cursor(Response(data, status=status.HTTP_200_OK), followers, page_size, key=lambda user: (user.follow.created_at, user.follow.pk))
 
 
 class FollowingListView(APIView):
@@ -161,7 +163,8 @@ class FollowingListView(APIView):
         operation_description="Get users that current user follows",
         manual_parameters=[
             openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
-            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20)
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)')
         ],
         responses={200: UserFollowSerializer(many=True)}
     )
@@ -170,8 +173,9 @@ class FollowingListView(APIView):
         """Get following."""
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
         
-        following = FollowerService.get_following(str(request.user.user_id), page, page_size)
+        following = FollowerService.get_following(str(request.user.user_id), page, page_size, cursor)
         
         data = [{
             'user_id': str(user.user_id),
@@ -180,7 +184,7 @@ class FollowingListView(APIView):
             'profile_picture_url': user.profile.profile_picture_url
         } for user in following]
         
-        return Response(data, status=status.HTTP_200_OK)
+        return set_next_cursor(Response(data, status=status.HTTP_200_OK), following, page_size, key=lambda user: (user.follow.created_at, user.follow.pk))
 
 
 class PendingRequestsView(APIView):
@@ -192,7 +196,8 @@ class PendingRequestsView(APIView):
         operation_description="Get pending follow requests",
         manual_parameters=[
             openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
-            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20)
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)')
         ],
         responses={200: FollowSerializer(many=True)}
     )
@@ -201,8 +206,9 @@ class PendingRequestsView(APIView):
         """Get pending requests."""
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
 
-        requests = FollowerService.get_pending_requests(str(request.user.user_id), page, page_size)
+        requests = FollowerService.get_pending_requests(str(request.user.user_id), page, page_size, cursor)
 
         data = [{
             'follow_id': str(req.follow_id),
@@ -212,5 +218,5 @@ class PendingRequestsView(APIView):
             'created_at': req.created_at
         } for req in requests]
 
-        return Response(data, status=status.HTTP_200_OK)
+        return set_next_cursor(Response(data, status=status.HTTP_200_OK), requests, page_size)
 
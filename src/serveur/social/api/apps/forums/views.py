@@ -12,7 +12,8 @@ from common.permissions import IsAuthenticated, IsNotBanned
 from common.rate_limiters import rate_limit_general
 from common.exceptions import NotFoundError, ValidationError, ConflictError, PermissionDeniedError
 from django.db import IntegrityError
-from common.utils import get_client_ip
+from common.search import encode_rank_cursor
+from common.utils import get_client_ip, set_next_cursor
 from .serializers import ForumSerializer, CreateForumSerializer
 from db.repositories.domain_repository import SubforumRepository
 from db.repositories.message_repository import AuditLogRepository
@@ -20,7 +21,6 @@ from services.apps_services.domain_service import DomainService
 from common.validators import Validator
 from django.db import transaction
 from apps.domains.serializers import CreateSubforumSerializer, SubforumSerializer
-from db.entities.domain_entity import Subforum
 
 
 class ForumsListView(APIView):
@@ -135,11 +135,12 @@ class SearchForumsView(APIView):
     permission_classes = [IsAuthenticated, IsNotBanned]
     
     @swagger_auto_schema(
-        operation_description="Search forums by name",
+        operation_description="Search forums by name, best matches first",
         manual_parameters=[
             openapi.Parameter('query', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True),
             openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
-            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20)
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)')
         ],
         responses={200: ForumSerializer(many=True)}
     )
@@ -149,6 +150,7 @@ class SearchForumsView(APIView):
         query = request.query_params.get('query', '')
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
         
         if not query:
             return Response(
@@ -156,7 +158,7 @@ class SearchForumsView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        forums = ForumService.search_forums(query, page, page_size)
+        forums = ForumService.search_forums(query, page, page_size, cursor)
         
         data = [{
             'forum_id': str(forum.forum_id),
@@ -166,7 +168,8 @@ class SearchForumsView(APIView):
             'post_count': forum.post_count
         } for forum in forums]
         
-        return Response(data, status=status.HTTP_200_OK)
+        return set_next_cursor(Response(data, status=status.HTTP_200_OK), forums, page_size,
+                               key=lambda forum: (forum.rank, forum.pk), encoder=encode_rank_cursor)
 
 
 class JoinForumView(APIView):
@@ -328,35 +331,7 @@ class ForumTreeView(APIView):
         except ValueError:
             return Response({'error': {'code': 'VALIDATION_ERROR', 'message': 'Invalid depth parameter'}}, status=status.HTTP_400_BAD_REQUEST)
 
-        # fetch top-level subforums for this forum (parent_forum_id == forum_id)
-        roots = Subforum.objects.filter(parent_forum_id=forum_id).order_by('created_at')
-
-        def build_node(s: Subforum, current_depth: int):
-            node = {
-                'subforum_id': str(s.subforum_id),
-                'name': s.name,
-                'description': s.description,
-                'post_count': s.post_count,
-                'created_at': s.created_at,
-                'children': []
-            }
-
-            # stop if reached max depth
-            if max_depth is not None and current_depth >= max_depth:
-                return node
-
-            # gather children by treating a subforum's forum as the parent forum
-            # of nested subforums. When a subforum S has its own `forum_id` (a
-            # Forum record created for the subforum), nested subforums created
-            # under S will have `parent_forum_id == S.forum_id`. Therefore we
-            # find those subforums and treat them as children here.
-            children = Subforum.objects.filter(parent_forum_id=s.forum_id).order_by('created_at')
-
-            node['children'] = [build_node(child, current_depth + 1) for child in children]
-
-            return node
-
-        tree = [build_node(r, 1) for r in roots]
+        tree = ForumService.get_subforum_tree(forum_id, max_depth)
 
         return Response(tree, status=status.HTTP_200_OK)
 
@@ -5,7 +5,7 @@ from django.urls import path
 from .views import (
     CreatePostView, PostDetailView, DeletePostView,
     LikePostView, UnlikePostView, PostLikesView,
-    MyPostsView, FeedView, DiscoverView
+    MyPostsView, FeedView, DiscoverView, PostSearchView
 )
 
 app_name = 'posts'
@@ -16,6 +16,7 @@ urlpatterns = [
     path('me/', MyPostsView.as_view(), name='my-posts'),
     path('feed/', FeedView.as_view(), name='feed'),
     path('discover/', DiscoverView.as_view(), name='discover'),
+    path('search/', PostSearchView.as_view(), name='search-posts'),
     
     # Specific post
     path('<str:post_id>/', PostDetailView.as_view(), name='post-detail'),
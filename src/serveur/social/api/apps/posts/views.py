@@ -9,9 +9,10 @@ from drf_yasg import openapi
 
 from services.apps_services.post_service import PostService
 from common.permissions import IsAuthenticated, IsNotBanned
-from common.rate_limiters import rate_limit_post_create, rate_limit_general
+from common.rate_limiters import rate_limit_post_create, rate_limit_general, rate_limit_search
 from common.exceptions import NotFoundError, ValidationError, PermissionDeniedError
-from common.utils import get_client_ip
+from common.search import encode_rank_cursor
+from common.utils import get_client_ip, set_next_cursor
 from .serializers import CreatePostSerializer, PostSerializer, LikeSerializer
 
 
@@ -189,7 +190,8 @@ class PostLikesView(APIView):
         operation_description="Get users who liked the post",
         manual_parameters=[
             openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
-            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20)
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)')
         ],
         responses={200: LikeSerializer(many=True)}
     )
@@ -198,8 +200,9 @@ class PostLikesView(APIView):
         """Get post likes."""
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
 
-        likes = PostService.get_post_likes(post_id, page, page_size)
+        likes = PostService.get_post_likes(post_id, page, page_size, cursor)
 
         data = [{
             'like_id': str(like.like_id),
@@ -209,7 +212,7 @@ class PostLikesView(APIView):
             'created_at': like.created_at
         } for like in likes]
 
-        return Response(data, status=status.HTTP_200_OK)
+        return set_next_cursor(Response(data, status=status.HTTP_200_OK), likes, page_size)
 
 
 class MyPostsView(APIView):
@@ -221,7 +224,8 @@ class MyPostsView(APIView):
         operation_description="Get posts created by the authenticated user",
         manual_parameters=[
             openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
-            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20)
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)')
         ],
         responses={200: PostSerializer(many=True)}
     )
@@ -230,9 +234,10 @@ class MyPostsView(APIView):
         """Get posts authored by the current user."""
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
 
         try:
-            posts = PostService.get_user_posts(str(request.user.user_id), page, page_size)
+            posts = PostService.get_user_posts(str(request.user.user_id), page, page_size, cursor)
 
             data = [{
                 'post_id': str(post.post_id),
@@ -246,7 +251,7 @@ class MyPostsView(APIView):
                 'created_at': post.created_at
             } for post in posts]
 
-            return Response(data, status=status.HTTP_200_OK)
+            return set_next_cursor(Response(data, status=status.HTTP_200_OK), posts, page_size)
         except Exception as exc:  # pragma: no cover - defensive guard
             return Response(
                 {'error': {'code': 'ERROR', 'message': str(exc)}},
@@ -263,7 +268,8 @@ class FeedView(APIView):
         operation_description="Get personalized feed from followed users",
         manual_parameters=[
             openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
-            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20)
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)')
         ],
         responses={200: PostSerializer(many=True)}
     )
@@ -272,8 +278,9 @@ class FeedView(APIView):
         """Get feed."""
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
 
-        posts = PostService.get_feed(str(request.user.user_id), page, page_size)
+        posts = PostService.get_feed(str(request.user.user_id), page, page_size, cursor)
 
         data = [{
             'post_id': str(post.post_id),
@@ -287,7 +294,54 @@ class FeedView(APIView):
             'created_at': post.created_at
         } for post in posts]
 
-        return Response(data, status=status.HTTP_200_OK)
+        return set_next_cursor(Response(data, status=status.HTTP_200_OK), posts, page_size)
+
+
+class PostSearchView(APIView):
+    """Search posts."""
+
+    permission_classes = [IsAuthenticated, IsNotBanned]
+
+    @swagger_auto_schema(
+        operation_description="Search visible posts by title and content, best matches first",
+        manual_parameters=[
+            openapi.Parameter('query', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)')
+        ],
+        responses={200: PostSerializer(many=True)}
+    )
+    @rate_limit_search
+    def get(self, request):
+        """Search posts."""
+        query = request.query_params.get('query', '')
+        page = int(request.query_params.get('page', 1))
+        page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
+
+        if not query:
+            return Response(
+                {'error': {'code': 'VALIDATION_ERROR', 'message': 'Query parameter is required'}},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        posts = PostService.search_posts(query, str(request.user.user_id), page, page_size, cursor)
+
+        data = [{
+            'post_id': str(post.post_id),
+            'author_id': str(post.user_id) if post.user_id else None,
+            'author_username': post.user.username if post.user else None,
+            'subforum_id': str(post.subforum_id) if post.subforum_id else None,
+            'title': post.title,
+            'content': post.content[:200] + '...' if len(post.content) > 200 else post.content,
+            'like_count': post.like_count,
+            'comment_count': post.comment_count,
+            'created_at': post.created_at
+        } for post in posts]
+
+        return set_next_cursor(Response(data, status=status.HTTP_200_OK), posts, page_size,
+                               key=lambda post: (post.rank, post.pk), encoder=encode_rank_cursor)
 
 
 class DiscoverView(APIView):
@@ -12,6 +12,7 @@ from db.repositories.post_repository import PostRepository
 from common.permissions import IsAuthenticated, IsNotBanned
 from common.rate_limiters import rate_limit_general
 from common.exceptions import NotFoundError
+from common.utils import set_next_cursor
 
 from .serializers import SubforumSerializer, PostSummarySerializer
 
@@ -97,7 +98,8 @@ class SubforumPostsView(APIView):
         operation_description="List posts in a subforum",
         manual_parameters=[
             openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
-            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20)
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)')
         ],
         responses={200: PostSummarySerializer(many=True)}
     )
@@ -106,6 +108,7 @@ class SubforumPostsView(APIView):
         """Return posts in subforum."""
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
 
         try:
             # Ensure subforum exists
@@ -116,7 +119,7 @@ class SubforumPostsView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        posts = PostRepository.get_by_subforum(subforum_id, page, page_size)
+        posts = PostRepository.get_by_subforum(subforum_id, page, page_size, cursor)
 
         data = [{
             'post_id': str(post.post_id),
@@ -127,4 +130,4 @@ class SubforumPostsView(APIView):
             'created_at': post.created_at
         } for post in posts]
 
-        return Response(data, status=status.HTTP_200_OK)
+        return set_next_cursor(Response(data, status=status.HTTP_200_OK), posts, page_size)
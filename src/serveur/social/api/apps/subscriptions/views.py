@@ -9,6 +9,7 @@ from drf_yasg.utils import swagger_auto_schema
 from services.apps_services.forum_service import ForumService
 from services.apps_services.domain_service import DomainService
 from db.repositories.domain_repository import SubforumSubscriptionRepository
+from db.repositories.post_repository import FeedRepository
 from common.permissions import IsAuthenticated, IsNotBanned
 from common.rate_limiters import rate_limit_general
 from common.exceptions import NotFoundError, ConflictError
@@ -63,6 +64,7 @@ class SubscribeSubforumView(APIView):
                 raise ConflictError("Already subscribed to this subforum")
 
             SubforumSubscriptionRepository.create(str(request.user.user_id), subforum_id)
+            FeedRepository.invalidate(str(request.user.user_id))
             return Response({'message': 'Subscribed to subforum'}, status=status.HTTP_201_CREATED)
         except (NotFoundError, ConflictError) as e:
             return Response({'error': {'code': 'ERROR', 'message': str(e)}}, status=status.HTTP_400_BAD_REQUEST)
@@ -81,6 +83,7 @@ class UnsubscribeSubforumView(APIView):
                 raise NotFoundError("Not subscribed to this subforum")
 
             SubforumSubscriptionRepository.delete(str(request.user.user_id), subforum_id)
+            FeedRepository.invalidate(str(request.user.user_id))
             return Response(status=status.HTTP_204_NO_CONTENT)
         except NotFoundError as e:
             return Response({'error': {'code': 'NOT_FOUND', 'message': str(e)}}, status=status.HTTP_404_NOT_FOUND)
@@ -12,7 +12,8 @@ from services.apps_services.user_service import UserService
 from common.permissions import IsAuthenticated, IsNotBanned
 from common.rate_limiters import rate_limit_general
 from common.exceptions import NotFoundError, ValidationError, ConflictError
-from common.utils import get_client_ip
+from common.search import encode_rank_cursor
+from common.utils import get_client_ip, set_next_cursor
 from apps.custom_auth.authentication import FirebaseAuthentication
 from .serializers import (
     UserSerializer, UserPublicSerializer, UpdateUserProfileSerializer,
@@ -299,11 +300,12 @@ class UserSearchView(APIView):
     permission_classes = [IsAuthenticated, IsNotBanned]
 
     @swagger_auto_schema(
-        operation_description="Search users by username",
+        operation_description="Search users by username, best matches first",
         manual_parameters=[
             openapi.Parameter('query', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True),
             openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=1),
-            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20)
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, default=20),
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, description='X-Next-Cursor of the previous page (overrides page)')
         ],
         responses={200: UserPublicSerializer(many=True)}
     )
@@ -313,6 +315,7 @@ class UserSearchView(APIView):
         query = request.query_params.get('query', '')
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
 
         if not query:
             return Response(
@@ -320,7 +323,7 @@ class UserSearchView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        users = UserService.search_users(query, str(request.user.user_id), page, page_size)
+        users = UserService.search_users(query, str(request.user.user_id), page, page_size, cursor)
 
         data = [{
             'user_id': str(user.user_id),
@@ -329,7 +332,8 @@ class UserSearchView(APIView):
             'profile_picture_url': user.profile.profile_picture_url
         } for user in users]
 
-        return Response(data, status=status.HTTP_200_OK)
+        return set_next_cursor(Response(data, status=status.HTTP_200_OK), users, page_size,
+                               key=lambda user: (user.rank, user.pk), encoder=encode_rank_cursor)
 
 
 class UserBulkView(APIView):
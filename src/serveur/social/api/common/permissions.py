@@ -84,12 +84,7 @@ class IsNotBlocked(rf_permissions.BasePermission):
         current_user_id = str(request.user.user_id)
         
         # Check if either user has blocked the other
-        if BlockRepository.is_blocked(current_user_id, target_user_id):
-            return False
-        if BlockRepository.is_blocked(target_user_id, current_user_id):
-            return False
-        
-        return True
+        return not BlockRepository.is_blocked_either_way(current_user_id, target_user_id)
 
 
 class CanViewProfile(rf_permissions.BasePermission):
@@ -114,9 +109,7 @@ class CanViewProfile(rf_permissions.BasePermission):
             # For private profiles, check if requester is a follower
             if hasattr(obj, 'profile') and not obj.profile.privacy:
                 from db.repositories.user_repository import FollowRepository
-                followers = FollowRepository.get_followers(str(obj.user_id), status='accepted')
-                follower_ids = [str(f.follower_id) for f in followers]
-                return str(request.user.user_id) in follower_ids
+                return FollowRepository.is_following(str(request.user.user_id), str(obj.user_id))
         
         return False
 
@@ -149,9 +142,7 @@ class CanViewPost(rf_permissions.BasePermission):
             # For private profiles, check if requester is a follower
             if hasattr(author, 'profile') and not author.profile.privacy:
                 from db.repositories.user_repository import FollowRepository
-                followers = FollowRepository.get_followers(str(author.user_id), status='accepted')
-                follower_ids = [str(f.follower_id) for f in followers]
-                return str(request.user.user_id) in follower_ids
+                return FollowRepository.is_following(str(request.user.user_id), str(author.user_id))
         
         return False
 
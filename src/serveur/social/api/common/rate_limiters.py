@@ -1,16 +1,159 @@
 """
 Rate limiting decorators and utilities.
 """
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from functools import wraps
-from django.core.cache import cache
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
 from django.conf import settings
 from rest_framework.response import Response
 from rest_framework import status
 
 
+# Sliding window counter in one round-trip: the previous window's count is
+# weighted by the share of it still inside the sliding window. A request is
+# granted `cost` slots when they fit, a single slot otherwise, and rejected
+# requests are not counted.
+# KEYS: current window, previous window
+# ARGV: limit, period, previous window weight, cost
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local used = previous * tonumber(ARGV[3]) + current
+local limit = tonumber(ARGV[1])
+local granted = tonumber(ARGV[4])
+if used + granted > limit then
+    granted = 1
+end
+if used + granted > limit then
+    return {0, tostring(used)}
+end
+if redis.call('INCRBY', KEYS[1], granted) == granted then
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]) * 2)
+end
+return {granted, tostring(used)}
+"""
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a rate limit check, as exposed in X-RateLimit-* headers."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int
+
+
+class _LocalBucket:
+    """Slots leased from the shared counter and spent without a round-trip."""
+
+    __slots__ = ('window', 'tokens', 'used')
+
+    def __init__(self, window: int, tokens: int, used: float):
+        self.window = window
+        self.tokens = tokens
+        self.used = used
+
+
+class RateLimiter:
+    """
+    Sliding window rate limiter shared by all workers through the cache.
+
+    Each check is a single Redis script call (atomic, no overshoot under
+    bursts). Callers well under their limit lease a small batch of slots
+    (RATE_LIMIT_LOCAL_SHARE of the limit) and spend them from a local token
+    bucket, so most of their requests skip Redis entirely. Leased slots are
+    counted immediately, so local spending never exceeds the limit.
+    Other cache backends (tests, local development) use the same algorithm
+    through the cache API.
+    """
+
+    MAX_LOCAL_BUCKETS = 10000
+
+    _buckets: 'OrderedDict[str, _LocalBucket]' = OrderedDict()
+    _lock = threading.Lock()
+    _scripts = {}
+
+    @staticmethod
+    def hit(key: str, limit: int, period: int) -> RateLimitResult:
+        """Count a request against `key` and return whether it is allowed."""
+        now = time.time()
+        window = int(now // period)
+        reset = max(1, math.ceil((window + 1) * period - now))
+
+        with RateLimiter._lock:
+            bucket = RateLimiter._buckets.get(key)
+            if bucket is not None and bucket.window == window and bucket.tokens > 0:
+                bucket.tokens -= 1
+                bucket.used += 1
+                RateLimiter._buckets.move_to_end(key)
+                return RateLimitResult(True, limit, max(0, int(limit - bucket.used)), reset)
+
+        # Only callers obviously under the limit get a batch of slots
+        cost = 1
+        if bucket is None or bucket.window != window or bucket.used * 2 < limit:
+            cost = max(1, int(limit * getattr(settings, 'RATE_LIMIT_LOCAL_SHARE', 0.01)))
+        weight = 1 - (now % period) / period
+        granted, used = RateLimiter._take(key, window, limit, period, weight, cost)
+
+        if not granted:
+            return RateLimitResult(False, limit, 0, reset)
+
+        with RateLimiter._lock:
+            RateLimiter._buckets[key] = _LocalBucket(window, granted - 1, used + 1)
+            RateLimiter._buckets.move_to_end(key)
+            if len(RateLimiter._buckets) > RateLimiter.MAX_LOCAL_BUCKETS:
+                RateLimiter._buckets.popitem(last=False)
+        return RateLimitResult(True, limit, max(0, int(limit - used - 1)), reset)
+
+    @staticmethod
+    def reset_local() -> None:
+        """Forget leased slots (tests)."""
+        with RateLimiter._lock:
+            RateLimiter._buckets.clear()
+
+    @staticmethod
+    def _take(key: str, window: int, limit: int, period: int, weight: float, cost: int):
+        """Atomically grant up to `cost` slots; return (granted, used before this request)."""
+        current_key = f"{key}:{window}"
+        previous_key = f"{key}:{window - 1}"
+
+        # django.core.cache.cache is a proxy: the backend itself tells whether Redis is in use
+        cache = caches['default']
+        if isinstance(cache, RedisCache):
+            current_key = cache.make_and_validate_key(current_key)
+            previous_key = cache.make_and_validate_key(previous_key)
+            client = cache._cache.get_client(current_key, write=True)
+            script = RateLimiter._scripts.get(id(client.connection_pool))
+            if script is None:
+                script = client.register_script(SLIDING_WINDOW_SCRIPT)
+                RateLimiter._scripts[id(client.connection_pool)] = script
+            granted, used = script(keys=[current_key, previous_key],
+                                   args=[limit, period, weight, cost], client=client)
+            return int(granted), float(used)
+
+        # Non-Redis backends: add/incr are atomic per key in a single process
+        values = cache.get_many([current_key, previous_key])
+        used = values.get(previous_key, 0) * weight + values.get(current_key, 0)
+        granted = cost if used + cost <= limit else 1
+        if used + granted > limit:
+            return 0, used
+        if not cache.add(current_key, granted, period * 2):
+            cache.incr(current_key, granted)
+        return granted, used
+
+
 def rate_limit(key_prefix: str, limit: int, period: int):
     """
     Rate limiting decorator.
+
+    Allowed and rejected responses carry X-RateLimit-Limit, X-RateLimit-Remaining
+    and X-RateLimit-Reset (seconds until the current window ends) headers.
     
     Args:
         key_prefix: Prefix for the cache key
@@ -34,26 +177,28 @@ def rate_limit(key_prefix: str, limit: int, period: int):
             # Create cache key
             cache_key = f"rate_limit:{key_prefix}:{user_id}"
             
-            # Get current count
-            current_count = cache.get(cache_key, 0)
+            result = RateLimiter.hit(cache_key, limit, period)
             
             # Check if limit exceeded
-            if current_count >= limit:
-                return Response(
+            if not result.allowed:
+                response = Response(
                     {
                         'error': {
                             'code': 'RATE_LIMIT_EXCEEDED',
-                            'message': f'Rate limit exceeded. Try again in {period} seconds.',
+                            'message': f'Rate limit exceeded. Try again in {result.reset} seconds.',
                         }
                     },
                     status=status.HTTP_429_TOO_MANY_REQUESTS
                 )
+                response['Retry-After'] = str(result.reset)
+            else:
+                # Call the original function
+                response = func(self, request, *args, **kwargs)
             
-            # Increment counter
-            cache.set(cache_key, current_count + 1, period)
-            
-            # Call the original function
-            return func(self, request, *args, **kwargs)
+            response['X-RateLimit-Limit'] = str(result.limit)
+            response['X-RateLimit-Remaining'] = str(result.remaining)
+            response['X-RateLimit-Reset'] = str(result.reset)
+            return response
         
         return wrapper
     return decorator
@@ -0,0 +1,162 @@
+"""
+Ranked search helpers shared by the user, forum and post repositories.
+
+On PostgreSQL, names are matched through pg_trgm (GIN trigram indexes serve both
+substring and fuzzy matches, ranked by similarity) and posts through a generated
+`search_vector` tsvector column with a GIN index, ranked by ts_rank. Other
+databases (SQLite in tests) fall back to case-insensitive substring matching
+with a coarse exact > prefix > substring rank.
+
+Results are ordered by (rank desc, pk) and paginated by offset or by a cursor
+holding the (rank, pk) of the last item of the previous page. similarity() and
+ts_rank() return real; ranks are cast to double precision so that the rank
+round-tripped through the cursor (a Python float) compares exactly.
+"""
+import base64
+import binascii
+import math
+import uuid
+from typing import Tuple
+from django.db import connection
+from django.db.models import BooleanField, Case, FloatField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from common.exceptions import ValidationError
+
+# Text search configuration of the posts.search_vector column (see migration 0009)
+TEXT_SEARCH_CONFIG = 'french'
+
+
+def is_postgres() -> bool:
+    """Return whether the default database supports pg_trgm and tsvector search."""
+    return connection.vendor == 'postgresql'
+
+
+def escape_like(query: str) -> str:
+    """
+    Escape LIKE wildcards so the query matches literally.
+
+    Args:
+        query: User search query
+
+    Returns:
+        Escaped query
+    """
+    return query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def name_search(queryset, column: str, query: str):
+    """
+    Filter a queryset on a name column containing (or resembling) the query, annotated with `rank`.
+
+    Args:
+        queryset: Queryset of the model owning the column
+        column: Column name (also the model field name)
+        query: User search query
+
+    Returns:
+        Filtered and annotated queryset
+    """
+    if is_postgres():
+        table = queryset.model._meta.db_table
+        matches = RawSQL(
+            f'("{table}"."{column}" ILIKE %s OR "{table}"."{column}" %% %s)',
+            (f'%{escape_like(query)}%', query),
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(f'similarity("{table}"."{column}", %s)::float8', (query,), output_field=FloatField())
+        return queryset.filter(matches).annotate(rank=rank)
+
+    rank = Case(
+        When(**{f'{column}__iexact': query}, then=Value(3.0)),
+        When(**{f'{column}__istartswith': query}, then=Value(2.0)),
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+    return queryset.filter(**{f'{column}__icontains': query}).annotate(rank=rank)
+
+
+def post_search(queryset, query: str):
+    """
+    Filter posts whose title or content match the query, annotated with `rank`.
+
+    Title matches rank above content matches.
+
+    Args:
+        queryset: Post queryset
+        query: User search query (web search syntax on PostgreSQL)
+
+    Returns:
+        Filtered and annotated queryset
+    """
+    if is_postgres():
+        tsquery = f"websearch_to_tsquery('{TEXT_SEARCH_CONFIG}', %s)"
+        matches = RawSQL(f'"posts"."search_vector" @@ {tsquery}', (query,), output_field=BooleanField())
+        rank = RawSQL(f'ts_rank("posts"."search_vector", {tsquery})::float8', (query,), output_field=FloatField())
+        return queryset.filter(matches).annotate(rank=rank)
+
+    rank = Case(
+        When(title__icontains=query, then=Value(2.0)),
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+    return queryset.filter(Q(title__icontains=query) | Q(content__icontains=query)).annotate(rank=rank)
+
+
+def encode_rank_cursor(rank: float, pk) -> str:
+    """
+    Build an opaque pagination cursor from a (rank, pk) position.
+
+    Args:
+        rank: Rank of the last item of the page
+        pk: Primary key of the last item of the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{float(rank)!r}|{pk}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, str]:
+    """
+    Decode a cursor built by encode_rank_cursor.
+
+    Args:
+        cursor: Cursor string
+
+    Returns:
+        Tuple of (rank, pk)
+
+    Raises:
+        ValidationError: If the cursor is malformed or its pk is not a UUID
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        rank, pk = raw.split('|', 1)
+        rank = float(rank)
+        if not math.isfinite(rank):
+            raise ValueError(rank)
+        return rank, str(uuid.UUID(pk))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError("Invalid cursor")
+
+
+def rank_paginate(queryset, page: int = 1, page_size: int = 20, cursor: str = None):
+    """
+    Return a page of a rank-annotated queryset, best matches first, by offset page or after `cursor`.
+
+    Args:
+        queryset: Queryset annotated with `rank`
+        page: Page number (ignored when a cursor is given)
+        page_size: Number of items per page
+        cursor: Cursor of the last item of the previous page
+
+    Returns:
+        Sliced queryset
+    """
+    queryset = queryset.order_by('-rank', 'pk')
+    if cursor:
+        rank, pk = decode_rank_cursor(cursor)
+        return queryset.filter(Q(rank__lt=rank) | Q(rank=rank, pk__gt=pk))[:page_size]
+    offset = (page - 1) * page_size
+    return queryset[offset:offset + page_size]
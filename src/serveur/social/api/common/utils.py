@@ -1,11 +1,17 @@
 """
 Common utility functions.
 """
+import base64
+import binascii
 import hashlib
 import hmac
 import secrets
-from typing import Optional
+import uuid
+from datetime import datetime
+from typing import Callable, Optional, Tuple
 from django.conf import settings
+from django.db.models import Q
+from common.exceptions import ValidationError
 
 
 def generate_content_signature(content: str) -> str:
@@ -132,3 +138,107 @@ def build_pagination_response(items: list, pagination_info: dict, item_serialize
         'pagination': pagination_info,
     }
 
+
+def encode_cursor(created_at: datetime, pk) -> str:
+    """
+    Build an opaque pagination cursor from a (created_at, pk) position.
+    
+    Args:
+        created_at: Timestamp of the last item of the page
+        pk: Primary key of the last item of the page
+        
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{created_at.isoformat()}|{pk}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor built by encode_cursor.
+    
+    Args:
+        cursor: Cursor string
+        
+    Returns:
+        Tuple of (created_at, pk)
+        
+    Raises:
+        ValidationError: If the cursor is malformed (including a pk that is not a UUID)
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        created_at, pk = raw.split('|', 1)
+        return datetime.fromisoformat(created_at), str(uuid.UUID(pk))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValidationError("Invalid cursor")
+
+
+def keyset_paginate(queryset, cursor: str, page_size: int = 20, field: str = 'created_at',
+                    pk_field: str = 'pk', descending: bool = True):
+    """
+    Return the page following `cursor`, ordered by (field, pk_field).
+    
+    Unlike offset slicing, the database seeks directly to the cursor position
+    through the (field) index, and rows inserted meanwhile do not shift pages.
+    
+    Args:
+        queryset: Django queryset
+        cursor: Cursor of the last item of the previous page
+        page_size: Number of items per page
+        field: Timestamp field used for ordering
+        pk_field: Unique tie-breaker field
+        descending: Newest first when True
+        
+    Returns:
+        Sliced queryset
+    """
+    created_at, pk = decode_cursor(cursor)
+    op = 'lt' if descending else 'gt'
+    prefix = '-' if descending else ''
+    return queryset.filter(
+        Q(**{f'{field}__{op}': created_at}) | Q(**{field: created_at, f'{pk_field}__{op}': pk})
+    ).order_by(f'{prefix}{field}', f'{prefix}{pk_field}')[:page_size]
+
+
+def get_next_cursor(items: list, page_size: int, key: Optional[Callable] = None,
+                    encoder: Callable = encode_cursor) -> Optional[str]:
+    """
+    Get the cursor of the next page, or None when the page is not full.
+    
+    Args:
+        items: Items of the current page
+        page_size: Requested page size
+        key: Function returning (created_at, pk) for an item
+        encoder: Function building the cursor from the key (encode_cursor by default)
+        
+    Returns:
+        Cursor string or None
+    """
+    if not items or len(items) < page_size:
+        return None
+    last = items[-1]
+    position, pk = key(last) if key else (last.created_at, last.pk)
+    return encoder(position, pk)
+
+
+def set_next_cursor(response, items: list, page_size: int, key: Optional[Callable] = None,
+                    encoder: Callable = encode_cursor):
+    """
+    Expose the next page cursor in the X-Next-Cursor response header.
+    
+    Args:
+        response: DRF response
+        items: Items of the current page
+        page_size: Requested page size
+        key: Function returning (created_at, pk) for an item
+        encoder: Function building the cursor from the key (encode_cursor by default)
+        
+    Returns:
+        The response
+    """
+    next_cursor = get_next_cursor(list(items), page_size, key, encoder)
+    if next_cursor:
+        response['X-Next-Cursor'] = next_cursor
+    return response
@@ -15,3 +15,8 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'django.settings')
 
 application = get_wsgi_application()
 
+# Download Google's token-signing certificates before the first request needs them
+from apps.custom_auth.token_cache import CertificatePrefetcher  # noqa: E402
+
+CertificatePrefetcher.start()
+
@@ -2,6 +2,7 @@
 Database app configuration.
 """
 from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
 
 
 class DbConfig(AppConfig):
@@ -9,3 +10,11 @@ class DbConfig(AppConfig):
     name = 'db'
     verbose_name = 'Database Layer'
 
+    def ready(self):
+        from db.entities.user_entity import Block, Follow
+        from db.repositories.user_repository import evict_relationships
+
+        # Blocks and follows are cached per user for visibility checks
+        for model in (Block, Follow):
+            post_save.connect(evict_relationships, sender=model, dispatch_uid=f'relationships_{model.__name__}_saved')
+            post_delete.connect(evict_relationships, sender=model, dispatch_uid=f'relationships_{model.__name__}_deleted')
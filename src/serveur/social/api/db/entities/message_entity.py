@@ -26,6 +26,8 @@ class Message(models.Model):
             models.Index(fields=['sender']),
             models.Index(fields=['receiver']),
             models.Index(fields=['-created_at']),
+            models.Index(fields=['sender', '-created_at']),
+            models.Index(fields=['receiver', '-created_at']),
         ]
         constraints = [
             models.CheckConstraint(
@@ -3,6 +3,7 @@ Post entity models for database layer.
 """
 import uuid
 from django.db import models
+from django.utils import timezone
 from django.core.validators import RegexValidator
 from db.entities.user_entity import User
 from db.entities.domain_entity import Subforum
@@ -33,6 +34,8 @@ class Post(models.Model):
     content_signature = models.CharField(max_length=512, null=True, blank=True)
     like_count = models.IntegerField(default=0)
     comment_count = models.IntegerField(default=0)
+    # Discover ranking, see db.repositories.post_repository.hot_score
+    hot_score = models.FloatField(default=0.0)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -43,15 +46,63 @@ class Post(models.Model):
             models.Index(fields=['subforum']),
             models.Index(fields=['-created_at']),
             models.Index(fields=['subforum', '-created_at']),
+            models.Index(fields=['-hot_score', '-post_id'], name='posts_hot_score_idx'),
         ]
     
     def __str__(self):
         return self.title
 
 
+class FeedState(models.Model):
+    """Marks a user whose feed is materialised in FeedEntry."""
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='feed_state')
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'feed_states'
+
+    def __str__(self):
+        return f"Feed of {self.user.username} built at {self.built_at}"
+
+
+class FeedEntry(models.Model):
+    """Materialised feed: one row per (reader, post), written on post creation."""
+
+    feed_entry_id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='feed_entries')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='feed_entries')
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'feed_entries'
+        unique_together = [['user', 'post']]
+        indexes = [
+            models.Index(fields=['user', '-created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.post.title} in feed of {self.user.username}"
+
+
+def comment_path_segment(created_at, comment_id) -> str:
+    """
+    Path segment of a comment: hex milliseconds since the epoch, then the start of its id.
+
+    Segments have a fixed length, so sorting paths as strings lists a thread
+    depth-first with siblings oldest first.
+    """
+    return f"{int(created_at.timestamp() * 1000):012x}{comment_id.hex[:8]}"
+
+
 class Comment(models.Model):
     """Comments on posts."""
     
+    # Characters added to the path at each nesting level (see comment_path_segment)
+    PATH_SEGMENT_LENGTH = 20
+    # Deepest reply level (the root comment is at depth 0)
+    MAX_DEPTH = 49
+    
     comment_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='comments')
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='comments')
@@ -62,8 +113,20 @@ class Comment(models.Model):
         blank=True,
         related_name='replies'
     )
+    # Thread placement, set by save(): top-level comment of the thread (itself for
+    # top-level comments), parent's path followed by this comment's segment, and depth
+    root = models.ForeignKey(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='thread'
+    )
+    path = models.CharField(max_length=(MAX_DEPTH + 1) * PATH_SEGMENT_LENGTH, default='')
+    depth = models.PositiveSmallIntegerField(default=0)
     content = models.TextField(max_length=2000)
-    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Not auto_now_add: save() needs the creation time before the insert to build the path
+    created_at = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
@@ -74,8 +137,27 @@ class Comment(models.Model):
             models.Index(fields=['parent_comment']),
             models.Index(fields=['-created_at']),
             models.Index(fields=['post', '-created_at']),
+            models.Index(fields=['root', 'path'], name='comments_root_path_idx'),
         ]
     
+    def save(self, *args, **kwargs):
+        """Place a new comment in its thread (root, path and depth) from its parent."""
+        if not self.path:
+            parent = self.parent_comment
+            if self.created_at is None:
+                self.created_at = timezone.now()
+            # Same source as the stored created_at, so paths order siblings oldest first
+            segment = comment_path_segment(self.created_at, self.comment_id)
+            if parent is None:
+                self.root_id = self.comment_id
+                self.path = segment
+                self.depth = 0
+            else:
+                self.root_id = parent.root_id
+                self.path = parent.path + segment
+                self.depth = parent.depth + 1
+        super().save(*args, **kwargs)
+    
     def __str__(self):
         return f"Comment by {self.user.username if self.user else 'Unknown'} on {self.post.title}"
 
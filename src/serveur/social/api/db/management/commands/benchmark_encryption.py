@@ -0,0 +1,64 @@
+"""
+Django management command to compare message encryption throughput: CBC and GCM
+envelopes, and per-message decryption against decrypt_many.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from services.apps_services.encryption_service import EncryptionService
+
+
+class Command(BaseCommand):
+    help = 'Benchmark message encryption and decryption throughput (CBC vs GCM, per message vs batch)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=50, help='Messages per conversation page')
+        parser.add_argument('--size', type=int, default=280, help='Message length in characters')
+        parser.add_argument('--rounds', type=int, default=5, help='Measured rounds per case')
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        count, rounds = options['messages'], options['rounds']
+        content = 'x' * options['size']
+        private_key, public_key = EncryptionService.generate_rsa_keypair()
+        _, other_public_key = EncryptionService.generate_rsa_keypair()
+
+        self.stdout.write(f"{count} messages of {options['size']} characters, {rounds} rounds")
+        self.stdout.write(f"{'':<34}{'msg/s':>10}")
+        for envelope in ('cbc', 'gcm'):
+            EncryptionService.clear_key_cache()
+            pages = []
+
+            def encrypt():
+                pages.append([
+                    EncryptionService.encrypt_message(content, public_key, other_public_key, envelope=envelope)
+                    for _ in range(count)
+                ])
+
+            self._report(f'encrypt {envelope}', self._measure(encrypt, rounds), count)
+            page = [(data['encrypted_content'], data['encryption_key_sender']) for data in pages[-1]]
+
+            def decrypt_each():
+                for encrypted_content, encrypted_key in page:
+                    # Parses the private key for every message
+                    EncryptionService.decrypt_message(encrypted_content, encrypted_key, private_key)
+
+            def decrypt_batch():
+                EncryptionService.decrypt_many(page, private_key)
+
+            self._report(f'decrypt {envelope} (key parsed per msg)', self._measure(decrypt_each, rounds), count)
+            self._report(f'decrypt {envelope} (decrypt_many)', self._measure(decrypt_batch, rounds), count)
+        EncryptionService.clear_key_cache()
+
+    @staticmethod
+    def _measure(func, rounds: int) -> float:
+        """Best wall-clock time of `rounds` runs, in seconds."""
+        best = float('inf')
+        for _ in range(rounds):
+            start = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    def _report(self, label: str, seconds: float, count: int) -> None:
+        self.stdout.write(f"{label:<34}{count / seconds:>10.0f}")
@@ -0,0 +1,36 @@
+"""
+Django management command to rebuild materialised feeds (FeedEntry).
+"""
+from django.core.management.base import BaseCommand
+from db.entities.post_entity import FeedState
+from db.entities.user_entity import User
+from db.repositories.post_repository import FeedRepository
+
+
+class Command(BaseCommand):
+    help = 'Rebuild materialised feeds from follows and subforum subscriptions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', default=[], help='User ID to rebuild (repeatable)')
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Rebuild every user, not only those with an existing feed'
+        )
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        if options['user']:
+            user_ids = options['user']
+        elif options['all']:
+            user_ids = User.objects.values_list('user_id', flat=True)
+        else:
+            user_ids = FeedState.objects.values_list('user_id', flat=True)
+
+        users = 0
+        entries = 0
+        for user_id in user_ids:
+            entries += FeedRepository.rebuild(str(user_id))
+            users += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Feeds rebuilt: {users} ({entries} entries)'))
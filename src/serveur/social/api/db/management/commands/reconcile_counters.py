@@ -0,0 +1,49 @@
+"""
+Django management command to recompute denormalised counters from their source tables.
+
+Deltas still buffered by CounterBuffer are flushed first, otherwise they would be
+applied on top of the recomputed counts. Only a shared buffer can be flushed from
+this process, so the command requires COUNTER_SINK 'redis' (or 'sync'). Counter
+updates committed while the counts are being recomputed may still be counted
+twice: run it when traffic is low.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from db.entities.domain_entity import Forum, Membership, Subforum
+from db.entities.post_entity import Comment, Like, Post
+from db.repositories.counter_buffer import CounterBuffer
+from db.repositories.post_repository import PostRepository
+
+
+def _count_of(model, fk: str):
+    """Correlated subquery counting the `model` rows pointing at the outer row."""
+    counts = model.objects.filter(**{fk: OuterRef('pk')}).order_by().values(fk).annotate(n=Count('*')).values('n')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class Command(BaseCommand):
+    help = 'Recompute like, comment, member and post counts from Like, Comment, Membership and Post'
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        if getattr(settings, 'COUNTER_SINK', 'redis') == 'memory':
+            raise CommandError(
+                "COUNTER_SINK is 'memory': the deltas pending in each worker cannot be flushed from this "
+                "process and would be counted twice. Reconcile with COUNTER_SINK set to 'redis' or 'sync'."
+            )
+        # Pending deltas would be counted twice once the counts are recomputed
+        CounterBuffer.flush()
+
+        posts = Post.objects.update(
+            like_count=_count_of(Like, 'post'),
+            comment_count=_count_of(Comment, 'post'),
+        )
+        forums = Forum.objects.update(member_count=_count_of(Membership, 'forum'))
+        subforums = Subforum.objects.update(post_count=_count_of(Post, 'subforum'))
+        rescored = PostRepository.rescore_hot()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Counters reconciled: {posts} posts ({rescored} rescored), {forums} forums, {subforums} subforums'
+        ))
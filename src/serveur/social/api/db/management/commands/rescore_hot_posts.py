@@ -0,0 +1,27 @@
+"""
+Django management command to recompute discover hot scores (nightly job).
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from db.repositories.post_repository import PostRepository
+
+
+class Command(BaseCommand):
+    help = 'Recompute hot scores of recent posts from their like and comment counts'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=settings.HOT_RESCORE_DAYS,
+            help='Rescore posts created in the last N days (default: HOT_RESCORE_DAYS)'
+        )
+        parser.add_argument('--all', action='store_true', help='Rescore every post')
+
+    def handle(self, *args, **options):
+        """Execute the command."""
+        since = None if options['all'] else timezone.now() - timedelta(days=options['days'])
+        rescored = PostRepository.rescore_hot(since)
+        self.stdout.write(self.style.SUCCESS(f'Hot scores updated: {rescored}'))
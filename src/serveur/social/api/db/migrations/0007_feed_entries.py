@@ -0,0 +1,40 @@
+"""Add the materialised feed tables (FeedState, FeedEntry).
+
+Feeds are built lazily on first read, or in bulk with `manage.py rebuild_feeds`.
+"""
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0006_make_forum_id_not_null"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedState",
+            fields=[
+                ("user", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="feed_state", serialize=False, to="db.user")),
+                ("built_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "feed_states",
+            },
+        ),
+        migrations.CreateModel(
+            name="FeedEntry",
+            fields=[
+                ("feed_entry_id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField()),
+                ("post", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="feed_entries", to="db.post")),
+                ("user", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="feed_entries", to="db.user")),
+            ],
+            options={
+                "db_table": "feed_entries",
+                "indexes": [models.Index(fields=["user", "-created_at"], name="feed_entrie_user_id_b52e6c_idx")],
+                "unique_together": {("user", "post")},
+            },
+        ),
+    ]
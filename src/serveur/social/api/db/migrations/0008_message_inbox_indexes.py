@@ -0,0 +1,20 @@
+"""Add (sender, -created_at) and (receiver, -created_at) indexes for the conversation inbox."""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0007_feed_entries"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(fields=["sender", "-created_at"], name="messages_sender__7375e3_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(fields=["receiver", "-created_at"], name="messages_receive_c09c1d_idx"),
+        ),
+    ]
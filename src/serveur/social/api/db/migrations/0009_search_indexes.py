@@ -0,0 +1,55 @@
+"""Search indexes (PostgreSQL only, see common.search).
+
+- pg_trgm GIN indexes on users.username and forums.forum_name (substring and fuzzy matches).
+- posts.search_vector: generated tsvector of title (weight A) and content (weight B), with a GIN index.
+  The column is not declared on the Post model; it is only read by search queries.
+
+Other databases (SQLite in tests) search without indexes, so this migration is a noop there.
+"""
+from django.db import migrations
+
+FORWARD_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS users_username_trgm_idx ON users USING gin (username gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS forums_forum_name_trgm_idx ON forums USING gin (forum_name gin_trgm_ops)",
+    """
+    ALTER TABLE posts ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('french', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('french', coalesce(content, '')), 'B')
+        ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS posts_search_vector_idx ON posts USING gin (search_vector)",
+]
+
+BACKWARD_SQL = [
+    "DROP INDEX IF EXISTS posts_search_vector_idx",
+    "ALTER TABLE posts DROP COLUMN IF EXISTS search_vector",
+    "DROP INDEX IF EXISTS forums_forum_name_trgm_idx",
+    "DROP INDEX IF EXISTS users_username_trgm_idx",
+]
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in FORWARD_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for sql in BACKWARD_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0008_message_inbox_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,45 @@
+"""Add Post.hot_score (discover ranking) with its index, and score existing posts."""
+import math
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def hot_score(like_count, comment_count, created_at):
+    # Frozen copy of db.repositories.post_repository.hot_score at the time of this migration
+    engagement = max(1 + like_count + 2 * comment_count, 1)
+    age_term = (created_at.timestamp() - 1704067200) / getattr(settings, 'HOT_SCORE_TIME_SCALE', 45000)
+    return math.log10(engagement) + age_term
+
+
+def score_posts(apps, schema_editor):
+    Post = apps.get_model('db', 'Post')
+    batch = []
+    for post in Post.objects.only('post_id', 'like_count', 'comment_count', 'created_at').iterator(chunk_size=1000):
+        post.hot_score = hot_score(post.like_count, post.comment_count, post.created_at)
+        batch.append(post)
+        if len(batch) >= 1000:
+            Post.objects.bulk_update(batch, ['hot_score'])
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, ['hot_score'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0009_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="hot_score",
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunPython(score_posts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(fields=["-hot_score", "-post_id"], name="posts_hot_score_idx"),
+        ),
+    ]
@@ -0,0 +1,75 @@
+"""Add Comment.root, path and depth (materialised thread paths) with their index, and place existing comments."""
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def comment_path_segment(created_at, comment_id):
+    # Frozen copy of db.entities.post_entity.comment_path_segment at the time of this migration
+    return f"{int(created_at.timestamp() * 1000):012x}{comment_id.hex[:8]}"
+
+
+def place_comments(apps, schema_editor):
+    Comment = apps.get_model('db', 'Comment')
+    # Walk the threads one level at a time: parents are placed before their replies
+    level = Comment.objects.filter(parent_comment__isnull=True)
+    depth = 0
+    while True:
+        batch, placed = [], 0
+        rows = level.values(
+            'comment_id', 'created_at', 'parent_comment__root_id', 'parent_comment__path'
+        ).iterator(chunk_size=1000)
+        for row in rows:
+            segment = comment_path_segment(row['created_at'], row['comment_id'])
+            batch.append(Comment(
+                comment_id=row['comment_id'],
+                root_id=row['parent_comment__root_id'] or row['comment_id'],
+                path=(row['parent_comment__path'] or '') + segment,
+                depth=depth,
+            ))
+            if len(batch) >= 1000:
+                Comment.objects.bulk_update(batch, ['root', 'path', 'depth'])
+                placed += len(batch)
+                batch = []
+        if batch:
+            Comment.objects.bulk_update(batch, ['root', 'path', 'depth'])
+            placed += len(batch)
+        if not placed:
+            return
+        level = Comment.objects.filter(parent_comment__depth=depth).exclude(parent_comment__path='')
+        depth += 1
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0010_post_hot_score"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="root",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="thread",
+                to="db.comment",
+            ),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="path",
+            field=models.CharField(default="", max_length=1000),
+        ),
+        migrations.AddField(
+            model_name="comment",
+            name="depth",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.RunPython(place_comments, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["root", "path"], name="comments_root_path_idx"),
+        ),
+    ]
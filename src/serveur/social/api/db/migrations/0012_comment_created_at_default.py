@@ -0,0 +1,18 @@
+"""Set Comment.created_at from a default instead of auto_now_add, so save() can build the path from it."""
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("db", "0011_comment_thread_path"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="comment",
+            name="created_at",
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False),
+        ),
+    ]
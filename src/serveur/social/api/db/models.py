@@ -3,7 +3,7 @@ Expose all database models for Django migrations.
 """
 from db.entities.user_entity import User, UserProfile, UserSettings, Block, Follow
 from db.entities.domain_entity import Domain, Forum, Subforum, Membership
-from db.entities.post_entity import Post, Comment, Like, Tag, PostTag, ForumTag
+from db.entities.post_entity import Post, FeedState, FeedEntry, Comment, Like, Tag, PostTag, ForumTag
 from db.entities.message_entity import Message, Report, AuditLog
 
 __all__ = [
@@ -17,6 +17,8 @@ __all__ = [
     'Subforum',
     'Membership',
     'Post',
+    'FeedState',
+    'FeedEntry',
     'Comment',
     'Like',
     'Tag',
@@ -0,0 +1,140 @@
+"""
+Write-behind sink for audit log entries.
+"""
+import json
+import logging
+import threading
+import uuid
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from db.entities.message_entity import AuditLog
+from db.repositories.write_behind import WriteBehind, redis_client
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryAuditBuffer:
+    """Per-process buffer: entries not yet flushed are lost if the process dies."""
+
+    def __init__(self):
+        self._rows: List[dict] = []
+        self._lock = threading.Lock()
+
+    def push(self, rows: List[dict]) -> int:
+        """Append rows and return the buffer size."""
+        with self._lock:
+            self._rows.extend(rows)
+            return len(self._rows)
+
+    def pop(self, limit: int) -> List[dict]:
+        """Remove and return up to `limit` rows, oldest first."""
+        with self._lock:
+            rows, self._rows = self._rows[:limit], self._rows[limit:]
+            return rows
+
+    def requeue(self, rows: List[dict]) -> None:
+        """Put back rows whose write failed, ahead of newer ones."""
+        with self._lock:
+            self._rows[:0] = rows
+
+
+class RedisAuditBuffer:
+    """Buffer shared by all workers in a Redis list: entries survive a worker restart."""
+
+    KEY = 'audit_log:buffer'
+
+    def __init__(self):
+        self._client = redis_client()
+
+    def push(self, rows: List[dict]) -> int:
+        """Append rows and return the buffer size."""
+        return self._client.rpush(self.KEY, *[json.dumps(row) for row in rows])
+
+    def pop(self, limit: int) -> List[dict]:
+        """Remove and return up to `limit` rows, oldest first."""
+        return [json.loads(raw) for raw in self._client.lpop(self.KEY, limit) or []]
+
+    def requeue(self, rows: List[dict]) -> None:
+        """Put back rows whose write failed, ahead of newer ones."""
+        if rows:
+            self._client.lpush(self.KEY, *[json.dumps(row) for row in reversed(rows)])
+
+
+class AuditLogSink:
+    """
+    Buffers audit entries and writes them with `bulk_create`, off the request's transaction.
+
+    An entry recorded inside a transaction reaches the buffer only when that
+    transaction commits, so a rolled-back action still leaves no audit entry.
+    The buffer is flushed as soon as it holds AUDIT_LOG_BATCH_SIZE entries,
+    otherwise by a background timer every AUDIT_LOG_FLUSH_INTERVAL seconds
+    and at interpreter exit. `created_at` is set when an entry is flushed.
+
+    AUDIT_LOG_SINK selects the buffer: 'memory' (per process), 'redis'
+    (shared) or 'sync' (every entry written immediately).
+    """
+
+    write_behind = WriteBehind(
+        'audit-log', 'AUDIT_LOG_SINK', 'AUDIT_LOG_FLUSH_INTERVAL',
+        {'memory': MemoryAuditBuffer, 'redis': RedisAuditBuffer},
+        lambda: AuditLogSink.flush(),
+    )
+
+    @staticmethod
+    def is_buffered() -> bool:
+        """Return whether entries are written behind rather than immediately."""
+        return AuditLogSink.write_behind.is_buffered()
+
+    @staticmethod
+    def record(row: dict) -> None:
+        """Hand an entry to the buffer once the current transaction commits."""
+        transaction.on_commit(lambda: AuditLogSink._enqueue([row]))
+
+    @staticmethod
+    def build_row(user_id: Optional[str], action_type: str, resource_type: str,
+                  resource_id: Optional[str] = None, details=None,
+                  ip_address: Optional[str] = None) -> dict:
+        """Return the column values of an audit entry, as stored by the model."""
+        return {
+            'log_id': str(uuid.uuid4()),
+            'user_id': str(user_id) if user_id is not None else None,
+            'action_type': action_type,
+            'resource_type': resource_type,
+            'resource_id': str(resource_id) if resource_id is not None else None,
+            'details': details if details is None or isinstance(details, str) else str(details),
+            'ip_address': ip_address,
+        }
+
+    @staticmethod
+    def flush() -> int:
+        """Write every buffered entry and return how many were written."""
+        buffer = AuditLogSink.write_behind.get_buffer()
+        batch_size = settings.AUDIT_LOG_BATCH_SIZE
+        written = 0
+        while True:
+            rows = buffer.pop(batch_size)
+            if not rows:
+                return written
+            try:
+                AuditLog.objects.bulk_create([AuditLog(**row) for row in rows])
+            except Exception:
+                buffer.requeue(rows)
+                logger.exception('Could not flush %d audit log entries', len(rows))
+                return written
+            written += len(rows)
+
+    @staticmethod
+    def _enqueue(rows: List[dict]) -> None:
+        try:
+            size = AuditLogSink.write_behind.get_buffer().push(rows)
+        except Exception:
+            # Buffer unavailable (Redis down): write through rather than lose the entries
+            logger.exception('Audit log buffer unavailable, writing entries directly')
+            AuditLog.objects.bulk_create([AuditLog(**row) for row in rows])
+            return
+        if size >= settings.AUDIT_LOG_BATCH_SIZE:
+            AuditLogSink.flush()
+        else:
+            AuditLogSink.write_behind.ensure_timer()
@@ -0,0 +1,233 @@
+"""
+Write-coalescing buffer for denormalised counters (likes, comments, members, posts).
+"""
+import logging
+import threading
+from collections import defaultdict
+from functools import wraps
+from typing import Dict, Iterable, List, Tuple
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F
+from db.repositories.write_behind import WriteBehind, redis_client
+
+logger = logging.getLogger(__name__)
+
+# Pending deltas of one row: {field: delta}
+Deltas = Dict[str, int]
+
+
+class MemoryCounterBuffer:
+    """Per-process buffer: deltas not yet flushed are lost if the process dies."""
+
+    def __init__(self):
+        self._deltas: Dict[Tuple[str, str], Deltas] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    def add(self, kind: str, pk: str, field: str, delta: int) -> None:
+        """Accumulate a delta."""
+        with self._lock:
+            self._deltas[(kind, pk)][field] += delta
+
+    def pending(self, kind: str, pks: List[str]) -> Dict[str, Deltas]:
+        """Return the pending deltas of rows, by primary key."""
+        with self._lock:
+            return {pk: dict(self._deltas[(kind, pk)]) for pk in pks if (kind, pk) in self._deltas}
+
+    def pop(self, limit: int) -> List[Tuple[str, str, Deltas]]:
+        """Remove and return the deltas of up to `limit` rows."""
+        with self._lock:
+            keys = list(self._deltas)[:limit]
+            return [(kind, pk, dict(self._deltas.pop((kind, pk)))) for kind, pk in keys]
+
+    def requeue(self, rows: List[Tuple[str, str, Deltas]]) -> None:
+        """Put back deltas whose write failed."""
+        for kind, pk, deltas in rows:
+            for field, delta in deltas.items():
+                self.add(kind, pk, field, delta)
+
+
+class RedisCounterBuffer:
+    """
+    Buffer shared by all workers: one hash of deltas per row plus a set of dirty rows.
+    Each delta is a single HINCRBY, so concurrent increments never contend.
+    """
+
+    DIRTY_KEY = 'counters:dirty'
+
+    def __init__(self):
+        self._client = redis_client(decode_responses=True)
+
+    @staticmethod
+    def _key(kind: str, pk: str) -> str:
+        return f"counters:{kind}:{pk}"
+
+    def add(self, kind: str, pk: str, field: str, delta: int) -> None:
+        """Accumulate a delta."""
+        pipe = self._client.pipeline(transaction=False)
+        pipe.hincrby(self._key(kind, pk), field, delta)
+        pipe.sadd(self.DIRTY_KEY, f"{kind}:{pk}")
+        pipe.execute()
+
+    def pending(self, kind: str, pks: List[str]) -> Dict[str, Deltas]:
+        """Return the pending deltas of rows, by primary key."""
+        pipe = self._client.pipeline(transaction=False)
+        for pk in pks:
+            pipe.hgetall(self._key(kind, pk))
+        return {
+            pk: {field: int(delta) for field, delta in deltas.items()}
+            for pk, deltas in zip(pks, pipe.execute()) if deltas
+        }
+
+    def pop(self, limit: int) -> List[Tuple[str, str, Deltas]]:
+        """Remove and return the deltas of up to `limit` rows."""
+        rows = []
+        for member in self._client.spop(self.DIRTY_KEY, limit) or []:
+            kind, pk = member.split(':', 1)
+            # Read and reset atomically: increments arriving meanwhile land in a new hash
+            pipe = self._client.pipeline(transaction=True)
+            pipe.hgetall(self._key(kind, pk))
+            pipe.delete(self._key(kind, pk))
+            deltas, _ = pipe.execute()
+            if deltas:
+                rows.append((kind, pk, {field: int(delta) for field, delta in deltas.items()}))
+        return rows
+
+    def requeue(self, rows: List[Tuple[str, str, Deltas]]) -> None:
+        """Put back deltas whose write failed."""
+        for kind, pk, deltas in rows:
+            for field, delta in deltas.items():
+                self.add(kind, pk, field, delta)
+
+
+class CounterBuffer:
+    """
+    Accumulates counter deltas and writes them in batches, one UPDATE per row.
+
+    Instead of an `UPDATE ... SET like_count = like_count + 1` holding the row lock
+    until the request's transaction ends, a delta is added to the buffer once that
+    transaction commits (a rolled-back like is never counted). A background timer
+    flushes the buffer every COUNTER_FLUSH_INTERVAL seconds (and at interpreter
+    exit), merging all the deltas of a row into a single short UPDATE.
+
+    Persisted counts lag by up to one flush interval; `merge` adds pending deltas
+    to loaded rows so responses show current counts. `reconcile_counters`
+    recomputes every count from the source tables ('redis' or 'sync' sink only:
+    the deltas pending in the memory of other processes cannot be flushed).
+
+    COUNTER_SINK selects the buffer: 'redis' (shared by all workers, the default),
+    'sync' (every delta written immediately, as before) or 'memory' (per process,
+    for tests and local development: each worker only merges its own deltas).
+    """
+
+    # kind -> (model name, primary key field)
+    MODELS = {
+        'post': ('Post', 'post_id'),
+        'forum': ('Forum', 'forum_id'),
+        'subforum': ('Subforum', 'subforum_id'),
+    }
+
+    BATCH_SIZE = 500
+
+    write_behind = WriteBehind(
+        'counter', 'COUNTER_SINK', 'COUNTER_FLUSH_INTERVAL',
+        {'memory': MemoryCounterBuffer, 'redis': RedisCounterBuffer},
+        lambda: CounterBuffer.flush(),
+    )
+
+    @staticmethod
+    def is_buffered() -> bool:
+        """Return whether deltas are written behind rather than immediately."""
+        return CounterBuffer.write_behind.is_buffered()
+
+    @staticmethod
+    def add(kind: str, pk, field: str, delta: int) -> None:
+        """Count `delta` on a row's counter."""
+        pk = str(pk)
+        if not CounterBuffer.is_buffered():
+            CounterBuffer.apply(kind, pk, {field: delta})
+            return
+        transaction.on_commit(lambda: CounterBuffer._enqueue(kind, pk, field, delta))
+
+    @staticmethod
+    def merge(kind: str, objects: Iterable) -> list:
+        """Add pending deltas to the counters of loaded rows and return them as a list."""
+        objects = list(objects)
+        if not objects or not CounterBuffer.is_buffered():
+            return objects
+        pk_field = CounterBuffer.MODELS[kind][1]
+        try:
+            pending = CounterBuffer.write_behind.get_buffer().pending(
+                kind, [str(getattr(obj, pk_field)) for obj in objects]
+            )
+        except Exception:
+            logger.warning('Counter buffer unavailable, showing persisted counts', exc_info=True)
+            return objects
+        for obj in objects:
+            for field, delta in pending.get(str(getattr(obj, pk_field)), {}).items():
+                setattr(obj, field, getattr(obj, field) + delta)
+        return objects
+
+    @staticmethod
+    def apply(kind: str, pk: str, deltas: Deltas) -> None:
+        """Write the deltas of one row in a single UPDATE."""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        if kind == 'post':
+            # Likes and comments also move the hot score
+            from db.repositories.post_repository import _engagement_update
+
+            updates = _engagement_update(deltas.get('like_count', 0), deltas.get('comment_count', 0))
+        else:
+            updates = {field: F(field) + delta for field, delta in deltas.items()}
+        model_name, pk_field = CounterBuffer.MODELS[kind]
+        apps.get_model('db', model_name).objects.filter(**{pk_field: pk}).update(**updates)
+
+    @staticmethod
+    def flush() -> int:
+        """Write every pending delta and return how many rows were updated."""
+        buffer = CounterBuffer.write_behind.get_buffer()
+        written = 0
+        while True:
+            rows = buffer.pop(CounterBuffer.BATCH_SIZE)
+            if not rows:
+                return written
+            for index, (kind, pk, deltas) in enumerate(rows):
+                try:
+                    CounterBuffer.apply(kind, pk, deltas)
+                except Exception:
+                    buffer.requeue(rows[index:])
+                    logger.exception('Could not flush counters of %d rows', len(rows) - index)
+                    return written
+                written += 1
+
+    @staticmethod
+    def _enqueue(kind: str, pk: str, field: str, delta: int) -> None:
+        try:
+            CounterBuffer.write_behind.get_buffer().add(kind, pk, field, delta)
+        except Exception:
+            # Buffer unavailable (Redis down): write through rather than lose the delta
+            logger.exception('Counter buffer unavailable, writing delta directly')
+            CounterBuffer.apply(kind, pk, {field: delta})
+            return
+        CounterBuffer.write_behind.ensure_timer()
+
+
+def with_pending_counts(kind: str):
+    """
+    Decorator for repository reads returning a row, a list of rows or None:
+    the returned rows include their pending counter deltas (lists are evaluated).
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            if result is None:
+                return None
+            if isinstance(result, apps.get_model('db', CounterBuffer.MODELS[kind][0])):
+                return CounterBuffer.merge(kind, [result])[0]
+            return CounterBuffer.merge(kind, result)
+        return wrapper
+    return decorator
@@ -1,10 +1,14 @@
 """
 Domain and Forum repository for data access.
 """
+import time
 from typing import Optional, List
+from django.core.cache import cache
 from django.db.models import F
-from django.db import IntegrityError
+from django.db import IntegrityError, connection, transaction
 from common.exceptions import ConflictError
+from common.search import name_search, rank_paginate
+from db.repositories.counter_buffer import CounterBuffer, with_pending_counts
 from db.entities.domain_entity import Domain, Forum, Subforum, Membership
 import uuid
 
@@ -60,6 +64,9 @@ class DomainRepository:
     def delete(domain_id: str) -> bool:
         """Delete a domain by id. Returns True if a row was removed."""
         deleted, _ = Domain.objects.filter(domain_id=domain_id).delete()
+        if deleted > 0:
+            # Cascade removed the domain's subforums
+            SubforumRepository.invalidate_trees()
         return deleted > 0
     
     @staticmethod
@@ -89,6 +96,7 @@ class ForumRepository:
         )
     
     @staticmethod
+    @with_pending_counts('forum')
     def get_by_id(forum_id: str) -> Optional[Forum]:
         """Get forum by ID."""
         try:
@@ -97,36 +105,43 @@ class ForumRepository:
             return None
     
     @staticmethod
+    @with_pending_counts('forum')
     def get_all(page: int = 1, page_size: int = 20) -> List[Forum]:
         """Get all forums."""
         offset = (page - 1) * page_size
         return Forum.objects.select_related('creator').order_by('-created_at')[offset:offset + page_size]
     
     @staticmethod
-    def search(query: str, page: int = 1, page_size: int = 20) -> List[Forum]:
-        """Search forums by name."""
-        offset = (page - 1) * page_size
-        return Forum.objects.filter(forum_name__icontains=query).select_related('creator')[offset:offset + page_size]
+    @with_pending_counts('forum')
+    def search(query: str, page: int = 1, page_size: int = 20, cursor: Optional[str] = None) -> List[Forum]:
+        """
+        Search forums by name (case-insensitive, fuzzy on PostgreSQL), best matches first,
+        by page or after `cursor`. Each forum carries its match score as `forum.rank`.
+        """
+        forums = Forum.objects.select_related('creator')
+        return rank_paginate(name_search(forums, 'forum_name', query), page, page_size, cursor)
     
     @staticmethod
     def increment_member_count(forum_id: str) -> None:
-        """Increment member count."""
-        Forum.objects.filter(forum_id=forum_id).update(member_count=F('member_count') + 1)
+        """Increment member count, written behind by CounterBuffer."""
+        CounterBuffer.add('forum', forum_id, 'member_count', 1)
     
     @staticmethod
     def decrement_member_count(forum_id: str) -> None:
-        """Decrement member count."""
-        Forum.objects.filter(forum_id=forum_id).update(member_count=F('member_count') - 1)
+        """Decrement member count, written behind by CounterBuffer."""
+        CounterBuffer.add('forum', forum_id, 'member_count', -1)
     
     @staticmethod
     def increment_post_count(forum_id: str) -> None:
-        """Increment post count."""
-        Forum.objects.filter(forum_id=forum_id).update(post_count=F('post_count') + 1)
+        """Increment post count, written behind by CounterBuffer."""
+        CounterBuffer.add('forum', forum_id, 'post_count', 1)
 
 
 class SubforumRepository:
     """Repository for Subforum entity operations."""
     
+    TREE_GENERATION_KEY = 'forum_tree:generation'
+    
     @staticmethod
     def create(creator_id: str, subforum_name: str, forum_id: Optional[str] = None, description: Optional[str] = None,
                parent_domain_id: Optional[str] = None, parent_forum_id: Optional[str] = None) -> Subforum:
@@ -160,7 +175,7 @@ class SubforumRepository:
             # parent_forum to satisfy DB constraint.
             if not pdid and not pfid:
                 pfid = fid
-            return Subforum.objects.create(
+            subforum = Subforum.objects.create(
                 creator_id=creator_id,
                 forum_id_id=fid,
                 subforum_name=subforum_name,
@@ -168,6 +183,8 @@ class SubforumRepository:
                 parent_domain_id=pdid,
                 parent_forum_id=pfid
             )
+            SubforumRepository.invalidate_trees()
+            return subforum
 
         # Create a new forum record for this subforum (its own forum context)
         try:
@@ -197,7 +214,7 @@ class SubforumRepository:
         if not pdid and not pfid:
             effective_parent_forum_id = new_forum.forum_id
 
-        return Subforum.objects.create(
+        subforum = Subforum.objects.create(
             creator_id=creator_id,
             forum_id=new_forum,
             subforum_name=subforum_name,
@@ -205,8 +222,56 @@ class SubforumRepository:
             parent_domain_id=pdid,
             parent_forum_id=effective_parent_forum_id
         )
+        SubforumRepository.invalidate_trees()
+        return subforum
+    
+    @staticmethod
+    def get_forum_tree(forum_id: str) -> List[Subforum]:
+        """
+        Get every subforum nested under a forum, at any depth, in one query.
+        
+        A subforum's children are the subforums whose parent_forum is the subforum's
+        own forum. The recursive CTE collects the reachable forum ids (UNION stops on
+        cycles), then selects the subforums attached to them.
+        """
+        table = Subforum._meta.db_table
+        forum_pk = Forum._meta.pk
+        try:
+            fid = uuid.UUID(forum_id) if not isinstance(forum_id, uuid.UUID) else forum_id
+        except Exception:
+            return []
+        return list(Subforum.objects.raw(
+            f"""
+            WITH RECURSIVE reachable(forum_id) AS (
+                SELECT forum_id FROM {Forum._meta.db_table} WHERE forum_id = %s
+                UNION
+                SELECT s.forum_id_id FROM {table} s JOIN reachable r ON s.parent_forum_id = r.forum_id
+            )
+            SELECT * FROM {table}
+            WHERE parent_forum_id IN (SELECT forum_id FROM reachable)
+            ORDER BY created_at
+            """,
+            [forum_pk.get_db_prep_value(fid, connection)]
+        ))
+    
+    @staticmethod
+    def get_tree_generation() -> int:
+        """Version of the cached forum trees, renewed on every subforum creation or deletion."""
+        return cache.get_or_set(SubforumRepository.TREE_GENERATION_KEY, 0, None)
+    
+    @staticmethod
+    def invalidate_trees() -> None:
+        """Invalidate all cached forum trees now and again once the current transaction commits."""
+        SubforumRepository._renew_tree_generation()
+        # A concurrent tree read before the commit could cache the old tree under the new generation
+        transaction.on_commit(SubforumRepository._renew_tree_generation)
+    
+    @staticmethod
+    def _renew_tree_generation() -> None:
+        cache.set(SubforumRepository.TREE_GENERATION_KEY, time.time_ns(), None)
     
     @staticmethod
+    @with_pending_counts('subforum')
     def get_by_id(subforum_id: str) -> Optional[Subforum]:
         """Get subforum by ID."""
         try:
@@ -228,12 +293,13 @@ class SubforumRepository:
     
     @staticmethod
     def increment_post_count(subforum_id: str) -> None:
-        """Increment post count."""
-        Subforum.objects.filter(subforum_id=subforum_id).update(post_count=F('post_count') + 1)
+        """Increment post count, written behind by CounterBuffer."""
+        CounterBuffer.add('subforum', subforum_id, 'post_count', 1)
 
     @staticmethod
     def decrement_post_count(subforum_id: str) -> None:
-        Subforum.objects.filter(subforum_id=subforum_id).update(post_count=F('post_count') - 1)
+        """Decrement post count, written behind by CounterBuffer."""
+        CounterBuffer.add('subforum', subforum_id, 'post_count', -1)
 
 
 class MembershipRepository:
@@ -2,8 +2,11 @@
 Message and Report repository for data access.
 """
 from typing import Optional, List, Tuple
-from django.db.models import Q
+from django.db.models import Case, F, Q, Sum, UUIDField, When, Window
+from django.db.models.functions import RowNumber
+from common.utils import keyset_paginate
 from db.entities.message_entity import Message, Report, AuditLog
+from db.repositories.audit_log_sink import AuditLogSink
 
 
 class MessageRepository:
@@ -22,54 +25,56 @@ class MessageRepository:
         )
     
     @staticmethod
-    def get_conversation(user1_id: str, user2_id: str, page: int = 1, page_size: int = 20) -> List[Message]:
-        """Get messages between two users (excluding deleted ones)."""
-        offset = (page - 1) * page_size
-        return Message.objects.filter(
+    def get_conversation(user1_id: str, user2_id: str, page: int = 1, page_size: int = 20,
+                         cursor: Optional[str] = None) -> List[Message]:
+        """Get messages between two users (excluding deleted ones), by page or after `cursor`."""
+        messages = Message.objects.filter(
             Q(sender_id=user1_id, receiver_id=user2_id, deleted_by_sender=False) |
             Q(sender_id=user2_id, receiver_id=user1_id, deleted_by_receiver=False)
-        ).select_related('sender', 'receiver').order_by('-created_at')[offset:offset + page_size]
+        ).select_related('sender', 'receiver')
+        if cursor:
+            return keyset_paginate(messages, cursor, page_size)
+        offset = (page - 1) * page_size
+        return messages.order_by('-created_at', '-pk')[offset:offset + page_size]
     
     @staticmethod
     def get_conversations(user_id: str, page: int = 1, page_size: int = 20) -> List[dict]:
-        """Get list of conversations for user (excluding deleted ones)."""
-        # Get unique conversation partners (excluding fully deleted conversations)
-        sent = Message.objects.filter(
-            sender_id=user_id,
-            deleted_by_sender=False
-        ).values_list('receiver_id', flat=True).distinct()
-        
-        received = Message.objects.filter(
-            receiver_id=user_id,
-            deleted_by_receiver=False
-        ).values_list('sender_id', flat=True).distinct()
-        
-        partner_ids = set(list(sent) + list(received))
+        """
+        Get list of conversations for user (excluding deleted ones), most recent first.
         
-        conversations = []
-        for partner_id in partner_ids:
-            last_message = Message.objects.filter(
-                Q(sender_id=user_id, receiver_id=partner_id, deleted_by_sender=False) |
-                Q(sender_id=partner_id, receiver_id=user_id, deleted_by_receiver=False)
-            ).select_related('sender', 'receiver').order_by('-created_at').first()
-            
-            if not last_message:
-                continue
-            
-            unread_count = Message.objects.filter(
-                sender_id=partner_id,
-                receiver_id=user_id,
-                is_read=False,
-                deleted_by_receiver=False
-            ).count()
-            
-            conversations.append({
-                'partner_id': partner_id,
-                'last_message': last_message,
-                'unread_count': unread_count
-            })
+        One query: messages visible to the user are partitioned by partner; a window
+        keeps the latest message of each partition and sums its unread messages.
+        """
+        partner = Case(
+            When(sender_id=user_id, then=F('receiver_id')),
+            default=F('sender_id'),
+            output_field=UUIDField()
+        )
+        latest = Message.objects.filter(
+            Q(sender_id=user_id, deleted_by_sender=False) |
+            Q(receiver_id=user_id, deleted_by_receiver=False)
+        ).annotate(
+            partner_id=partner,
+            position=Window(
+                RowNumber(),
+                partition_by=[partner],
+                order_by=[F('created_at').desc(), F('pk').desc()]
+            ),
+            unread_count=Window(
+                Sum(Case(When(receiver_id=user_id, is_read=False, then=1), default=0)),
+                partition_by=[partner]
+            )
+        ).filter(position=1).select_related('sender', 'receiver').order_by('-created_at', '-pk')
         
-        return sorted(conversations, key=lambda x: x['last_message'].created_at, reverse=True)
+        offset = (page - 1) * page_size
+        return [
+            {
+                'partner_id': message.partner_id,
+                'last_message': message,
+                'unread_count': message.unread_count
+            }
+            for message in latest[offset:offset + page_size]
+        ]
     
     @staticmethod
     def mark_as_read(sender_id: str, receiver_id: str) -> None:
@@ -189,38 +194,37 @@ class AuditLogRepository:
     @staticmethod
     def create(user_id: Optional[str], action_type: str, resource_type: str,
                resource_id: Optional[str] = None, details: Optional[str] = None,
-               ip_address: Optional[str] = None) -> AuditLog:
-        """Create a new audit log entry."""
-        # Ensure resource_id is stored as a string for consistent comparisons
-        stored_resource_id = str(resource_id) if resource_id is not None else None
-        print('DEBUG: AuditLogRepository.create called with resource_id=', repr(resource_id), 'stored=', repr(stored_resource_id))
-        audit = AuditLog.objects.create(
-            user_id=user_id,
-            action_type=action_type,
-            resource_type=resource_type,
-            resource_id=stored_resource_id,
-            details=details,
-            ip_address=ip_address
-        )
-        # Force-update DB row in case of type mismatches and re-fetch
-        try:
-            AuditLog.objects.filter(log_id=audit.log_id).update(resource_id=stored_resource_id)
-            refreshed = AuditLog.objects.get(log_id=audit.log_id)
-            print('DEBUG: created audit resource_id repr after create:', repr(getattr(refreshed, '__dict__', {}).get('resource_id')))
-            return refreshed
-        except Exception as e:
-            print('DEBUG: audit create/refresh exception', e)
-            return audit
+               ip_address: Optional[str] = None, durable: bool = False) -> AuditLog:
+        """Record an audit log entry.
+
+        The entry is written behind by `AuditLogSink` once the current
+        transaction commits; the returned instance is then not saved yet.
+        Pass `durable=True` for entries that must be stored immediately,
+        within the caller's transaction (admin actions).
+        """
+        row = AuditLogSink.build_row(user_id, action_type, resource_type,
+                                     resource_id, details, ip_address)
+        if durable or not AuditLogSink.is_buffered():
+            return AuditLog.objects.create(**row)
+        AuditLogSink.record(row)
+        return AuditLog(**row)
     
     @staticmethod
-    def get_by_user(user_id: str, page: int = 1, page_size: int = 20) -> List[AuditLog]:
-        """Get audit logs for a user."""
+    def get_by_user(user_id: str, page: int = 1, page_size: int = 20,
+                    cursor: Optional[str] = None) -> List[AuditLog]:
+        """Get audit logs for a user, by page or after `cursor`."""
+        logs = AuditLog.objects.filter(user_id=user_id)
+        if cursor:
+            return keyset_paginate(logs, cursor, page_size)
         offset = (page - 1) * page_size
-        return AuditLog.objects.filter(user_id=user_id).order_by('-created_at')[offset:offset + page_size]
+        return logs.order_by('-created_at', '-pk')[offset:offset + page_size]
     
     @staticmethod
-    def get_all(page: int = 1, page_size: int = 20) -> List[AuditLog]:
-        """Get all audit logs."""
+    def get_all(page: int = 1, page_size: int = 20, cursor: Optional[str] = None) -> List[AuditLog]:
+        """Get all audit logs, by page or after `cursor`."""
+        logs = AuditLog.objects.select_related('user')
+        if cursor:
+            return keyset_paginate(logs, cursor, page_size)
         offset = (page - 1) * page_size
-        return AuditLog.objects.select_related('user').order_by('-created_at')[offset:offset + page_size]
+        return logs.order_by('-created_at', '-pk')[offset:offset + page_size]
 
@@ -1,9 +1,58 @@
 """
 Post repository for data access.
 """
+import math
+from datetime import datetime
 from typing import Optional, List
-from django.db.models import F
-from db.entities.post_entity import Post, Comment, Like, Tag, PostTag
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q, Value, Window
+from django.db.models.functions import Greatest, Log, RowNumber
+from django.utils import timezone
+from common.exceptions import ValidationError
+from common.search import post_search, rank_paginate
+from common.utils import keyset_paginate
+from db.repositories.counter_buffer import CounterBuffer, with_pending_counts
+from db.entities.post_entity import Post, FeedState, FeedEntry, Comment, Like, Tag, PostTag
+
+
+# Hot ranking: a comment weighs as much as this many likes
+HOT_COMMENT_WEIGHT = 2
+# Origin of the age term of hot scores (2024-01-01 UTC)
+HOT_SCORE_EPOCH = 1704067200
+
+
+def hot_score(like_count: int, comment_count: int, created_at: datetime) -> float:
+    """
+    Time-decayed popularity of a post.
+
+    The score is log10(1 + engagement) plus the post's creation time in units of
+    HOT_SCORE_TIME_SCALE seconds. A post created one time scale later than another
+    outranks it unless the older one has 10x its engagement, so older posts decay
+    relative to newer ones without their score ever changing with time: it only
+    changes with likes and comments, and ordering by it needs no recomputation.
+    """
+    engagement = max(1 + like_count + HOT_COMMENT_WEIGHT * comment_count, 1)
+    age_term = (created_at.timestamp() - HOT_SCORE_EPOCH) / settings.HOT_SCORE_TIME_SCALE
+    return math.log10(engagement) + age_term
+
+
+def _engagement_update(likes: int = 0, comments: int = 0) -> dict:
+    """
+    UPDATE values changing a post's counters and moving its hot score accordingly,
+    computed from the current row so concurrent updates cannot be lost.
+    """
+    def engagement(like_delta, comment_delta):
+        return Greatest(
+            1 + F('like_count') + like_delta + HOT_COMMENT_WEIGHT * (F('comment_count') + comment_delta),
+            Value(1),
+        )
+
+    return {
+        'like_count': F('like_count') + likes,
+        'comment_count': F('comment_count') + comments,
+        'hot_score': F('hot_score') + Log(Value(10), engagement(likes, comments)) - Log(Value(10), engagement(0, 0)),
+    }
 
 
 class PostRepository:
@@ -18,10 +67,12 @@ class PostRepository:
             title=title,
             content=content,
             subforum_id=subforum_id,
-            content_signature=content_signature
+            content_signature=content_signature,
+            hot_score=hot_score(0, 0, timezone.now())
         )
     
     @staticmethod
+    @with_pending_counts('post')
     def get_by_id(post_id: str) -> Optional[Post]:
         """Get post by ID."""
         try:
@@ -29,6 +80,11 @@ class PostRepository:
         except Post.DoesNotExist:
             return None
     
+    @staticmethod
+    def has_posted_in(user_id: str, subforum_id: str) -> bool:
+        """Check if user has a post in the subforum."""
+        return Post.objects.filter(user_id=user_id, subforum_id=subforum_id).exists()
+    
     @staticmethod
     def delete(post_id: str) -> bool:
         """Delete a post."""
@@ -36,9 +92,40 @@ class PostRepository:
         return deleted > 0
     
     @staticmethod
-    def get_feed(user_id: str, page: int = 1, page_size: int = 20) -> List[Post]:
-        """Get personalized feed for user - posts from followed users and subscribed subforums."""
-        from django.db.models import Q
+    @with_pending_counts('post')
+    def get_feed(user_id: str, page: int = 1, page_size: int = 20, cursor: Optional[str] = None) -> List[Post]:
+        """
+        Get personalized feed for user - posts from followed users and subscribed subforums.
+
+        Reads the materialised feed (FeedEntry), building it on first access. Pages past
+        FEED_MAX_ENTRIES are served by the live query.
+        """
+        offset = (page - 1) * page_size
+        live_feed = PostRepository.get_live_feed_queryset(user_id).select_related(
+            'user', 'user__profile', 'subforum'
+        )
+        if not cursor and offset + page_size > settings.FEED_MAX_ENTRIES:
+            return live_feed[offset:offset + page_size]
+
+        if not FeedRepository.is_built(user_id):
+            FeedRepository.rebuild(user_id)
+
+        entries = FeedEntry.objects.filter(user_id=user_id).select_related(
+            'post', 'post__user', 'post__user__profile', 'post__subforum'
+        )
+        if not cursor:
+            entries = entries.order_by('-created_at', '-post_id')[offset:offset + page_size]
+            return [entry.post for entry in entries]
+
+        posts = [entry.post for entry in keyset_paginate(entries, cursor, page_size, pk_field='post_id')]
+        if len(posts) < page_size:
+            # Past the materialised window: continue with the live query
+            posts = list(keyset_paginate(live_feed, cursor, page_size))
+        return posts
+
+    @staticmethod
+    def get_live_feed_queryset(user_id: str):
+        """Feed computed from follows and subforums, ordered by created_at DESC."""
         from db.entities.user_entity import Follow
         from db.entities.domain_entity import SubforumSubscription
 
@@ -61,48 +148,190 @@ class PostRepository:
         effective_subforum_ids = set(list(subscribed_subforum_ids) + list(user_subforum_ids))
 
         # Get posts from followed users, the user themself, OR subscribed subforums
-        offset = (page - 1) * page_size
         return Post.objects.filter(
             Q(user_id__in=following_ids) | Q(user_id=user_id) | Q(subforum_id__in=list(effective_subforum_ids))
-        ).select_related('user', 'user__profile', 'subforum').order_by('-created_at')[offset:offset + page_size]
+        ).order_by('-created_at', '-pk')
     
     @staticmethod
-    def get_discover(page: int = 1, page_size: int = 20) -> List[Post]:
-        """Get popular posts for discovery."""
+    @with_pending_counts('post')
+    def get_discover(page: int = 1, page_size: int = 20, viewer_id: Optional[str] = None) -> List[Post]:
+        """
+        Get hot posts for discovery, read in (-hot_score) index order.
+        Authors blocking or blocked by `viewer_id` are excluded.
+        """
+        from db.entities.user_entity import Block
+
         offset = (page - 1) * page_size
-        return Post.objects.select_related('user', 'user__profile', 'subforum').order_by('-like_count', '-created_at')[offset:offset + page_size]
+        posts = Post.objects.select_related('user', 'user__profile', 'subforum')
+        if viewer_id:
+            posts = posts.exclude(
+                user_id__in=Block.objects.filter(blocker_id=viewer_id).values('blocked_id')
+            ).exclude(
+                user_id__in=Block.objects.filter(blocked_id=viewer_id).values('blocker_id')
+            )
+        return posts.order_by('-hot_score', '-pk')[offset:offset + page_size]
     
     @staticmethod
-    def get_by_subforum(subforum_id: str, page: int = 1, page_size: int = 20) -> List[Post]:
-        """Get posts in a subforum."""
+    def rescore_hot(since: Optional[datetime] = None, batch_size: int = 1000) -> int:
+        """
+        Recompute hot scores from the counters (posts created after `since`, or all).
+
+        Incremental updates keep scores current; this corrects drift (counters fixed
+        directly, HOT_SCORE_TIME_SCALE changed). Returns the number of posts rescored.
+        """
+        posts = Post.objects.only('post_id', 'like_count', 'comment_count', 'created_at', 'hot_score')
+        if since is not None:
+            posts = posts.filter(created_at__gte=since)
+        batch = []
+        rescored = 0
+        for post in posts.iterator(chunk_size=batch_size):
+            score = hot_score(post.like_count, post.comment_count, post.created_at)
+            if not math.isclose(post.hot_score, score):
+                post.hot_score = score
+                batch.append(post)
+            if len(batch) >= batch_size:
+                rescored += Post.objects.bulk_update(batch, ['hot_score'])
+                batch = []
+        if batch:
+            rescored += Post.objects.bulk_update(batch, ['hot_score'])
+        return rescored
+    
+    @staticmethod
+    @with_pending_counts('post')
+    def get_by_subforum(subforum_id: str, page: int = 1, page_size: int = 20,
+                        cursor: Optional[str] = None) -> List[Post]:
+        """Get posts in a subforum, by page or after `cursor`."""
+        posts = Post.objects.filter(subforum_id=subforum_id).select_related('user', 'user__profile')
+        if cursor:
+            return keyset_paginate(posts, cursor, page_size)
         offset = (page - 1) * page_size
-        return Post.objects.filter(subforum_id=subforum_id).select_related('user', 'user__profile').order_by('-created_at')[offset:offset + page_size]
+        return posts.order_by('-created_at', '-pk')[offset:offset + page_size]
     
     @staticmethod
-    def get_by_user(user_id: str, page: int = 1, page_size: int = 20) -> List[Post]:
-        """Get posts by user."""
+    @with_pending_counts('post')
+    def get_by_user(user_id: str, page: int = 1, page_size: int = 20, cursor: Optional[str] = None) -> List[Post]:
+        """Get posts by user, by page or after `cursor`."""
+        posts = Post.objects.filter(user_id=user_id).select_related('subforum')
+        if cursor:
+            return keyset_paginate(posts, cursor, page_size)
         offset = (page - 1) * page_size
-        return Post.objects.filter(user_id=user_id).select_related('subforum').order_by('-created_at')[offset:offset + page_size]
+        return posts.order_by('-created_at', '-pk')[offset:offset + page_size]
+    
+    @staticmethod
+    @with_pending_counts('post')
+    def search(query: str, viewer_id: str, page: int = 1, page_size: int = 20,
+               cursor: Optional[str] = None) -> List[Post]:
+        """
+        Search posts by title and content, best matches first, by page or after `cursor`.
+
+        Only posts `viewer_id` may see are returned: authors are not banned, not blocked
+        either way, and public, followed (accepted) or the viewer. Each post carries its
+        match score as `post.rank` (cursor position).
+        """
+        from db.entities.user_entity import Block, Follow
+
+        visible = (
+            Q(user__isnull=True)
+            | Q(user__profile__privacy=True)
+            | Q(user_id=viewer_id)
+            | Q(user_id__in=Follow.objects.filter(
+                follower_id=viewer_id, status='accepted'
+            ).values('following_id'))
+        )
+        posts = Post.objects.filter(visible).exclude(
+            user__is_banned=True
+        ).exclude(
+            user_id__in=Block.objects.filter(blocker_id=viewer_id).values('blocked_id')
+        ).exclude(
+            user_id__in=Block.objects.filter(blocked_id=viewer_id).values('blocker_id')
+        ).select_related('user', 'subforum')
+        return rank_paginate(post_search(posts, query), page, page_size, cursor)
     
     @staticmethod
     def increment_like_count(post_id: str) -> None:
-        """Increment like count."""
-        Post.objects.filter(post_id=post_id).update(like_count=F('like_count') + 1)
+        """Increment like count (and hot score), written behind by CounterBuffer."""
+        CounterBuffer.add('post', post_id, 'like_count', 1)
     
     @staticmethod
     def decrement_like_count(post_id: str) -> None:
-        """Decrement like count."""
-        Post.objects.filter(post_id=post_id).update(like_count=F('like_count') - 1)
+        """Decrement like count (and hot score), written behind by CounterBuffer."""
+        CounterBuffer.add('post', post_id, 'like_count', -1)
     
     @staticmethod
     def increment_comment_count(post_id: str) -> None:
-        """Increment comment count."""
-        Post.objects.filter(post_id=post_id).update(comment_count=F('comment_count') + 1)
+        """Increment comment count (and hot score), written behind by CounterBuffer."""
+        CounterBuffer.add('post', post_id, 'comment_count', 1)
     
     @staticmethod
-    def decrement_comment_count(post_id: str) -> None:
-        """Decrement comment count."""
-        Post.objects.filter(post_id=post_id).update(comment_count=F('comment_count') - 1)
+    def decrement_comment_count(post_id: str, count: int = 1) -> None:
+        """Decrement comment count (and hot score), written behind by CounterBuffer."""
+        CounterBuffer.add('post', post_id, 'comment_count', -count)
+
+
+class FeedRepository:
+    """
+    Repository for the materialised feed.
+
+    A user's feed is materialised once FeedState exists for them: new posts are then
+    fanned out to their FeedEntry rows on creation. Follow or subscription changes
+    invalidate the feed, which is rebuilt on the next read.
+    """
+
+    @staticmethod
+    def is_built(user_id: str) -> bool:
+        """Check if the user's feed is materialised."""
+        return FeedState.objects.filter(user_id=user_id).exists()
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild(user_id: str) -> int:
+        """Rebuild the user's feed from the live query (most recent FEED_MAX_ENTRIES posts)."""
+        FeedEntry.objects.filter(user_id=user_id).delete()
+        rows = PostRepository.get_live_feed_queryset(user_id).values_list(
+            'post_id', 'created_at'
+        )[:settings.FEED_MAX_ENTRIES]
+        entries = [
+            FeedEntry(user_id=user_id, post_id=post_id, created_at=created_at)
+            for post_id, created_at in rows
+        ]
+        FeedEntry.objects.bulk_create(entries, batch_size=1000)
+        FeedState.objects.update_or_create(user_id=user_id)
+        return len(entries)
+
+    @staticmethod
+    def invalidate(user_id: str) -> None:
+        """Drop the user's materialised feed; it is rebuilt on the next read."""
+        FeedState.objects.filter(user_id=user_id).delete()
+        FeedEntry.objects.filter(user_id=user_id).delete()
+
+    @staticmethod
+    def fan_out(post: Post) -> int:
+        """
+        Add a new post to the materialised feeds of its readers: the author, their
+        accepted followers, the subforum subscribers and the users who posted in it.
+        """
+        from db.entities.user_entity import Follow
+        from db.entities.domain_entity import SubforumSubscription
+
+        readers = Q(user_id=post.user_id) | Q(
+            user_id__in=Follow.objects.filter(
+                following_id=post.user_id, status='accepted'
+            ).values('follower_id')
+        )
+        if post.subforum_id:
+            readers |= Q(
+                user_id__in=SubforumSubscription.objects.filter(subforum_id=post.subforum_id).values('user_id')
+            ) | Q(
+                user_id__in=Post.objects.filter(subforum_id=post.subforum_id).values('user_id')
+            )
+
+        reader_ids = FeedState.objects.filter(readers).values_list('user_id', flat=True)
+        entries = [
+            FeedEntry(user_id=reader_id, post_id=post.post_id, created_at=post.created_at)
+            for reader_id in reader_ids
+        ]
+        FeedEntry.objects.bulk_create(entries, batch_size=1000, ignore_conflicts=True)
+        return len(entries)
 
 
 class CommentRepository:
@@ -110,7 +339,7 @@ class CommentRepository:
     
     @staticmethod
     def create(user_id: str, post_id: str, content: str, parent_comment_id: Optional[str] = None) -> Comment:
-        """Create a new comment."""
+        """Create a new comment (Comment.save places it in its parent's thread)."""
         comment = Comment.objects.create(
             user_id=user_id,
             post_id=post_id,
@@ -129,38 +358,126 @@ class CommentRepository:
         except Comment.DoesNotExist:
             return None
     
+    @staticmethod
+    def subtree(comment: Comment):
+        """
+        Queryset of a comment and all its nested replies.
+
+        The subtree is the range of paths starting with the comment's path within its
+        thread, so the (root, path) index serves it; paths are hexadecimal, and 'g'
+        sorts after every hex digit.
+        """
+        return Comment.objects.filter(root_id=comment.root_id, path__gte=comment.path, path__lt=comment.path + 'g')
+
     @staticmethod
     def delete(comment_id: str) -> bool:
-        """Delete a comment and all its replies (cascade)."""
-        # Get the comment to retrieve post_id before deletion
-        comment = Comment.objects.filter(comment_id=comment_id).first()
-        if comment:
-            post_id = comment.post_id
-            # Django's CASCADE will delete all replies, but deleted count includes them
-            deleted, _ = Comment.objects.filter(comment_id=comment_id).delete()
-            if deleted > 0:
-                # Decrement comment count by the number of comments deleted (parent + all replies)
-                for _ in range(deleted):
-                    PostRepository.decrement_comment_count(post_id)
-                return True
-        return False
-    
-    @staticmethod
-    def get_by_post(post_id: str, page: int = 1, page_size: int = 20, sort_by: str = "created_at") -> List[Comment]:
-        """Get comments for a post."""
-        offset = (page - 1) * page_size
-        return Comment.objects.filter(
+        """Delete a comment and all its replies."""
+        comment = Comment.objects.filter(comment_id=comment_id).only('post_id', 'root_id', 'path').first()
+        if not comment:
+            return False
+        _, deleted = CommentRepository.subtree(comment).delete()
+        # One counter update for the comment and all its replies
+        PostRepository.decrement_comment_count(comment.post_id, deleted.get(Comment._meta.label, 0))
+        return True
+    
+    @staticmethod
+    def get_by_post(post_id: str, page: int = 1, page_size: int = 20, sort_by: str = "created_at",
+                    cursor: Optional[str] = None) -> List[Comment]:
+        """Get comments for a post, by page or after `cursor`."""
+        comments = Comment.objects.filter(
             post_id=post_id,
             parent_comment_id__isnull=True
-        ).select_related('user', 'user__profile').order_by('-created_at')[offset:offset + page_size]
+        ).select_related('user', 'user__profile')
+        if cursor:
+            return keyset_paginate(comments, cursor, page_size)
+        offset = (page - 1) * page_size
+        return comments.order_by('-created_at', '-pk')[offset:offset + page_size]
     
     @staticmethod
-    def get_replies(comment_id: str, page: int = 1, page_size: int = 20) -> List[Comment]:
-        """Get replies to a comment."""
-        offset = (page - 1) * page_size
-        return Comment.objects.filter(
+    def get_replies(comment_id: str, page: int = 1, page_size: int = 20,
+                    cursor: Optional[str] = None) -> List[Comment]:
+        """Get replies to a comment (oldest first), by page or after `cursor`."""
+        replies = Comment.objects.filter(
             parent_comment_id=comment_id
-        ).select_related('user', 'user__profile').order_by('created_at')[offset:offset + page_size]
+        ).select_related('user', 'user__profile')
+        if cursor:
+            return keyset_paginate(replies, cursor, page_size, descending=False)
+        offset = (page - 1) * page_size
+        return replies.order_by('created_at', 'pk')[offset:offset + page_size]
+
+    @staticmethod
+    def get_threads(post_id: str, page: int = 1, page_size: int = 20, cursor: Optional[str] = None,
+                    replies_per_thread: int = 20, max_depth: Optional[int] = None) -> List[Comment]:
+        """
+        Get a page of top-level comments of a post with their nested replies.
+
+        Top-level comments are paginated as in get_by_post; the replies of all of them
+        are then loaded in a single query, in path order (depth first, siblings oldest
+        first), at most `replies_per_thread` per thread. Each returned comment carries
+        `thread_replies` (its replies in path order) and `has_more_replies`; the rest
+        of a thread is loaded with get_subtree.
+
+        Args:
+            post_id: Post ID
+            page: Page number of top-level comments
+            page_size: Number of top-level comments per page
+            cursor: Cursor of the previous page of top-level comments (overrides page)
+            replies_per_thread: Maximum number of replies loaded per thread
+            max_depth: Deepest reply level loaded (all levels when None)
+
+        Returns:
+            List of top-level comments
+        """
+        roots = list(CommentRepository.get_by_post(post_id, page, page_size, cursor=cursor))
+        threads = {comment.comment_id: comment for comment in roots}
+        for comment in roots:
+            comment.thread_replies = []
+            comment.has_more_replies = False
+        if not roots or replies_per_thread <= 0:
+            return roots
+
+        replies = Comment.objects.filter(root_id__in=list(threads), depth__gt=0)
+        if max_depth is not None:
+            replies = replies.filter(depth__lte=max_depth)
+        # One extra reply per thread tells whether the thread has more
+        replies = replies.annotate(
+            position=Window(RowNumber(), partition_by=[F('root_id')], order_by=F('path').asc())
+        ).filter(position__lte=replies_per_thread + 1).select_related('user', 'user__profile')
+
+        for reply in replies.order_by('root_id', 'path'):
+            root = threads[reply.root_id]
+            if reply.position > replies_per_thread:
+                root.has_more_replies = True
+            else:
+                root.thread_replies.append(reply)
+        return roots
+
+    @staticmethod
+    def get_subtree(comment: Comment, page_size: int = 20, cursor: Optional[str] = None,
+                    max_depth: Optional[int] = None) -> List[Comment]:
+        """
+        Get the nested replies of a comment in path order, after `cursor`.
+
+        Args:
+            comment: Comment whose replies are loaded
+            page_size: Number of replies per page
+            cursor: Path of the last reply of the previous page
+            max_depth: Deepest reply level loaded, relative to the comment (all levels when None)
+
+        Returns:
+            List of replies
+
+        Raises:
+            ValidationError: If the cursor is not a reply path of the comment
+        """
+        replies = CommentRepository.subtree(comment).filter(path__gt=comment.path)
+        if max_depth is not None:
+            replies = replies.filter(depth__lte=comment.depth + max_depth)
+        if cursor:
+            if not cursor.startswith(comment.path) or len(cursor) % Comment.PATH_SEGMENT_LENGTH:
+                raise ValidationError("Invalid cursor")
+            replies = replies.filter(path__gt=cursor)
+        return replies.select_related('user', 'user__profile').order_by('path')[:page_size]
 
 
 class LikeRepository:
@@ -183,8 +500,11 @@ class LikeRepository:
         return Like.objects.filter(user_id=user_id, post_id=post_id).exists()
     
     @staticmethod
-    def get_by_post(post_id: str, page: int = 1, page_size: int = 20) -> List[Like]:
-        """Get likes for a post."""
+    def get_by_post(post_id: str, page: int = 1, page_size: int = 20, cursor: Optional[str] = None) -> List[Like]:
+        """Get likes for a post, by page or after `cursor`."""
+        likes = Like.objects.filter(post_id=post_id).select_related('user', 'user__profile')
+        if cursor:
+            return keyset_paginate(likes, cursor, page_size)
         offset = (page - 1) * page_size
-        return Like.objects.filter(post_id=post_id).select_related('user', 'user__profile').order_by('-created_at')[offset:offset + page_size]
+        return likes.order_by('-created_at', '-pk')[offset:offset + page_size]
 
@@ -3,7 +3,12 @@ User repository for data access.
 """
 
 from typing import Optional, List
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Q
+from common.search import name_search, rank_paginate
+from common.utils import keyset_paginate
 from db.entities.user_entity import User, UserProfile, UserSettings, Block, Follow
 
 
@@ -75,13 +80,21 @@ class UserRepository:
         return user
     
     @staticmethod
-    def search_by_username(query: str, page: int = 1, page_size: int = 20) -> List[User]:
-        """Search users by username (case-insensitive)."""
-        offset = (page - 1) * page_size
-        return User.objects.filter(
-            username__icontains=query,
-            is_banned=False
-        ).select_related('profile')[offset:offset + page_size]
+    def search_by_username(query: str, page: int = 1, page_size: int = 20, cursor: Optional[str] = None,
+                           viewer_id: Optional[str] = None) -> List[User]:
+        """
+        Search users by username (case-insensitive, fuzzy on PostgreSQL), best matches first,
+        by page or after `cursor`. Users blocking or blocked by `viewer_id` are excluded.
+        Each user carries its match score as `user.rank` (cursor position).
+        """
+        users = User.objects.filter(is_banned=False).select_related('profile')
+        if viewer_id:
+            users = users.exclude(
+                user_id__in=Block.objects.filter(blocker_id=viewer_id).values('blocked_id')
+            ).exclude(
+                user_id__in=Block.objects.filter(blocked_id=viewer_id).values('blocker_id')
+            )
+        return rank_paginate(name_search(users, 'username', query), page, page_size, cursor)
     
     @staticmethod
     def get_bulk(user_ids: List[str]) -> List[User]:
@@ -92,6 +105,64 @@ class UserRepository:
         ).select_related('profile')
 
 
+class RelationshipCache:
+    """
+    Per-user cache of the block and follow relationships used by visibility checks.
+
+    A user's entry holds the ids they block, the ids blocking them and the ids
+    they follow with an accepted follow. Saving or deleting a Block or Follow
+    evicts the entries of the users involved (see `evict_relationships`);
+    RELATIONSHIP_CACHE_TIMEOUT bounds how long any other change can go unseen.
+    """
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f"relationships:{user_id}"
+
+    @staticmethod
+    def get(user_id: str) -> dict:
+        """Return {'blocking', 'blocked_by', 'following'} id sets for a user."""
+        user_id = str(user_id)
+        key = RelationshipCache._key(user_id)
+        entry = cache.get(key)
+        if entry is None:
+            blocking, blocked_by = set(), set()
+            blocks = Block.objects.filter(
+                Q(blocker_id=user_id) | Q(blocked_id=user_id)
+            ).values_list('blocker_id', 'blocked_id')
+            for blocker_id, blocked_id in blocks:
+                if str(blocker_id) == user_id:
+                    blocking.add(str(blocked_id))
+                else:
+                    blocked_by.add(str(blocker_id))
+            following = Follow.objects.filter(
+                follower_id=user_id, status='accepted'
+            ).values_list('following_id', flat=True)
+            entry = {
+                'blocking': frozenset(blocking),
+                'blocked_by': frozenset(blocked_by),
+                'following': frozenset(str(following_id) for following_id in following),
+            }
+            cache.set(key, entry, settings.RELATIONSHIP_CACHE_TIMEOUT)
+        return entry
+
+    @staticmethod
+    def evict(*user_ids: str) -> None:
+        """Drop users' entries now and again once the current transaction commits."""
+        keys = [RelationshipCache._key(str(user_id)) for user_id in user_ids]
+        cache.delete_many(keys)
+        # A concurrent request reading before the commit could cache the old relationships
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def evict_relationships(sender, instance, **kwargs) -> None:
+    """Signal receiver evicting both users of a saved or deleted Block or Follow."""
+    if isinstance(instance, Block):
+        RelationshipCache.evict(instance.blocker_id, instance.blocked_id)
+    else:
+        RelationshipCache.evict(instance.follower_id, instance.following_id)
+
+
 class BlockRepository:
     """Repository for Block entity operations."""
     
@@ -109,7 +180,14 @@ class BlockRepository:
     @staticmethod
     def is_blocked(blocker_id: str, blocked_id: str) -> bool:
         """Check if user is blocked."""
-        return Block.objects.filter(blocker_id=blocker_id, blocked_id=blocked_id).exists()
+        return str(blocked_id) in RelationshipCache.get(blocker_id)['blocking']
+    
+    @staticmethod
+    def is_blocked_either_way(user_id: str, other_user_id: str) -> bool:
+        """Check if either user has blocked the other."""
+        relationships = RelationshipCache.get(user_id)
+        other_user_id = str(other_user_id)
+        return other_user_id in relationships['blocking'] or other_user_id in relationships['blocked_by']
     
     @staticmethod
     def get_blocked_users(blocker_id: str, page: int = 1, page_size: int = 20) -> List[User]:
@@ -149,24 +227,38 @@ class FollowRepository:
             return None
     
     @staticmethod
-    def get_followers(user_id: str, status: str = 'accepted', page: int = 1, page_size: int = 20) -> List[User]:
-        """Get user's followers (returns User objects)."""
-        offset = (page - 1) * page_size
+    def get_followers(user_id: str, status: str = 'accepted', page: int = 1, page_size: int = 20,
+                      cursor: Optional[str] = None) -> List[User]:
+        """
+        Get user's followers (returns User objects), by page or after `cursor`.
+        Each user carries its Follow as `user.follow` (cursor position).
+        """
         follows = Follow.objects.filter(
             following_id=user_id,
             status=status
-        ).select_related('follower', 'follower__profile')[offset:offset + page_size]
-        return [follow.follower for follow in follows]
+        ).select_related('follower', 'follower__profile')
+        users = []
+        for follow in FollowRepository._paginate(follows, page, page_size, cursor):
+            follow.follower.follow = follow
+            users.append(follow.follower)
+        return users
 
     @staticmethod
-    def get_following(user_id: str, status: str = 'accepted', page: int = 1, page_size: int = 20) -> List[User]:
-        """Get users that user is following (returns User objects)."""
-        offset = (page - 1) * page_size
+    def get_following(user_id: str, status: str = 'accepted', page: int = 1, page_size: int = 20,
+                      cursor: Optional[str] = None) -> List[User]:
+        """
+        Get users that user is following (returns User objects), by page or after `cursor`.
+        Each user carries its Follow as `user.follow` (cursor position).
+        """
         follows = Follow.objects.filter(
             follower_id=user_id,
             status=status
-        ).select_related('following', 'following__profile')[offset:offset + page_size]
-        return [follow.following for follow in follows]
+        ).select_related('following', 'following__profile')
+        users = []
+        for follow in FollowRepository._paginate(follows, page, page_size, cursor):
+            follow.following.follow = follow
+            users.append(follow.following)
+        return users
 
     @staticmethod
     def get_follow(viewer_id:str,followed_id:str):
@@ -179,11 +271,25 @@ class FollowRepository:
         return follw[0]
 
     @staticmethod
-    def get_pending_requests(user_id: str, page: int = 1, page_size: int = 20) -> List[Follow]:
-        """Get pending follow requests for user."""
-        offset = (page - 1) * page_size
-        return Follow.objects.filter(
+    def is_following(follower_id: str, following_id: str) -> bool:
+        """Check if a user follows another with an accepted follow."""
+        return str(following_id) in RelationshipCache.get(follower_id)['following']
+
+    @staticmethod
+    def get_pending_requests(user_id: str, page: int = 1, page_size: int = 20,
+                             cursor: Optional[str] = None) -> List[Follow]:
+        """Get pending follow requests for user, by page or after `cursor`."""
+        follows = Follow.objects.filter(
             following_id=user_id,
             status='pending'
-        ).select_related('follower', 'follower__profile')[offset:offset + page_size]
+        ).select_related('follower', 'follower__profile')
+        return FollowRepository._paginate(follows, page, page_size, cursor)
+
+    @staticmethod
+    def _paginate(follows, page: int, page_size: int, cursor: Optional[str]):
+        """Newest follows first, by offset page or after `cursor`."""
+        if cursor:
+            return keyset_paginate(follows, cursor, page_size)
+        offset = (page - 1) * page_size
+        return follows.order_by('-created_at', '-pk')[offset:offset + page_size]
 
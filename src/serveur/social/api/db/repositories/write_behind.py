@@ -0,0 +1,109 @@
+"""
+Write-behind plumbing shared by the audit log sink and the counter buffer.
+"""
+import atexit
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+def redis_client(**options):
+    """Return a Redis client on the REDIS_* settings (shared buffers)."""
+    import redis
+
+    return redis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=settings.REDIS_DB,
+        password=settings.REDIS_PASSWORD or None,
+        **options,
+    )
+
+
+class WriteBehind:
+    """
+    Buffer of pending writes, flushed by a background timer and at interpreter exit.
+
+    The `sink_setting` setting selects the buffer: 'memory' (per process, lost if
+    the process dies), 'redis' (shared by all workers) or 'sync' (nothing is
+    buffered, the owner writes immediately). The timer starts with the first
+    buffered write and calls `flush` every `interval_setting` seconds.
+    """
+
+    _instances: List['WriteBehind'] = []
+
+    def __init__(self, name: str, sink_setting: str, interval_setting: str,
+                 buffers: Dict[str, Callable], flush: Callable[[], int]):
+        """
+        Args:
+            name: Name used in thread names and log messages
+            sink_setting: Name of the setting selecting the sink
+            interval_setting: Name of the setting holding the flush interval (seconds)
+            buffers: Buffer class of the 'memory' and 'redis' sinks
+            flush: Writes every buffered item and returns how many were written
+        """
+        self.name = name
+        self.sink_setting = sink_setting
+        self.interval_setting = interval_setting
+        self.buffers = buffers
+        self.flush = flush
+        self.buffer = None
+        self.buffer_kind: Optional[str] = None
+        self.timer: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+        WriteBehind._instances.append(self)
+
+    def sink(self) -> str:
+        """Return the configured sink."""
+        return getattr(settings, self.sink_setting, 'memory')
+
+    def is_buffered(self) -> bool:
+        """Return whether writes are buffered rather than immediate."""
+        return self.sink() != 'sync'
+
+    def buffer_kind_of_sink(self) -> str:
+        """Return the kind of buffer the configured sink uses."""
+        return 'redis' if self.sink() == 'redis' else 'memory'
+
+    def get_buffer(self):
+        """Return the buffer of the configured sink, created on first use."""
+        kind = self.buffer_kind_of_sink()
+        with self.lock:
+            if self.buffer is None or self.buffer_kind != kind:
+                self.buffer = self.buffers[kind]()
+                self.buffer_kind = kind
+            return self.buffer
+
+    def ensure_timer(self) -> None:
+        """Start the flush timer unless it is running."""
+        with self.lock:
+            if self.timer is not None and self.timer.is_alive():
+                return
+            self.timer = threading.Thread(target=self._run_timer, name=f'{self.name}-flush', daemon=True)
+            self.timer.start()
+
+    def _run_timer(self) -> None:
+        while True:
+            time.sleep(getattr(settings, self.interval_setting))
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('%s flush failed', self.name)
+
+
+@atexit.register
+def _flush_on_exit():
+    for write_behind in WriteBehind._instances:
+        # Only flush the buffer in use: the sink may have been switched since (tests)
+        if write_behind.buffer is not None and write_behind.buffer_kind == write_behind.buffer_kind_of_sink():
+            try:
+                write_behind.flush()
+            except Exception:
+                logger.exception('Could not flush %s at exit', write_behind.name)
@@ -235,6 +235,11 @@ CORS_ALLOW_HEADERS = [
 FIREBASE_SERVICE_ACCOUNT_KEY = os.getenv('FIREBASE_SERVICE_ACCOUNT_KEY', None)
 # If FIREBASE_SERVICE_ACCOUNT_KEY is None, Firebase will use Application Default Credentials
 # This is useful when running on Google Cloud Platform
+# Verified tokens (and the users they resolve to) are cached for this many seconds,
+# never past the token's expiry
+FIREBASE_TOKEN_CACHE_TTL = int(os.getenv('FIREBASE_TOKEN_CACHE_TTL', '300'))
+# Interval (seconds) between background downloads of Google's token-signing certificates
+FIREBASE_CERTS_REFRESH_INTERVAL = int(os.getenv('FIREBASE_CERTS_REFRESH_INTERVAL', '3600'))
 
 # Security Settings
 SECURE_SSL_REDIRECT = os.getenv('SECURE_SSL_REDIRECT', 'False') == 'True'
@@ -246,6 +251,40 @@ X_FRAME_OPTIONS = 'DENY'
 
 # Rate Limiting
 RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'True') == 'True'
+# Share of a limit leased at once to a worker's local token bucket
+RATE_LIMIT_LOCAL_SHARE = float(os.getenv('RATE_LIMIT_LOCAL_SHARE', '0.01'))
+
+# Materialised feed: number of posts kept per user when a feed is (re)built
+FEED_MAX_ENTRIES = int(os.getenv('FEED_MAX_ENTRIES', '1000'))
+
+# Discover hot ranking: seconds of post age worth a 10x engagement difference,
+# and how far back (days) the nightly rescore_hot_posts job recomputes scores
+HOT_SCORE_TIME_SCALE = int(os.getenv('HOT_SCORE_TIME_SCALE', '45000'))
+HOT_RESCORE_DAYS = int(os.getenv('HOT_RESCORE_DAYS', '7'))
+
+# Cached subforum trees (seconds); trees are also invalidated on subforum creation/deletion
+FORUM_TREE_CACHE_TIMEOUT = int(os.getenv('FORUM_TREE_CACHE_TIMEOUT', '60'))
+
+# Cached block/follow relationships of a user (seconds); also invalidated when they change
+RELATIONSHIP_CACHE_TIMEOUT = int(os.getenv('RELATIONSHIP_CACHE_TIMEOUT', '300'))
+
+# Audit log sink: 'memory' or 'redis' buffer entries and write them in batches,
+# 'sync' writes each entry immediately
+AUDIT_LOG_SINK = os.getenv('AUDIT_LOG_SINK', 'memory')
+AUDIT_LOG_BATCH_SIZE = int(os.getenv('AUDIT_LOG_BATCH_SIZE', '500'))
+AUDIT_LOG_FLUSH_INTERVAL = float(os.getenv('AUDIT_LOG_FLUSH_INTERVAL', '2'))
+
+# Counters (likes, comments, members, posts): 'redis' buffers deltas shared by all workers,
+# flushed every COUNTER_FLUSH_INTERVAL seconds; 'sync' updates each row immediately and
+# 'memory' buffers per process (tests and local development only: each worker then shows
+# its own pending counts, and reconcile_counters refuses to run)
+COUNTER_SINK = os.getenv('COUNTER_SINK', 'redis')
+COUNTER_FLUSH_INTERVAL = float(os.getenv('COUNTER_FLUSH_INTERVAL', '1'))
+
+# Message encryption: envelope of new messages ('gcm' authenticated, or legacy 'cbc';
+# both are decrypted) and number of parsed RSA public keys kept per process
+MESSAGE_ENVELOPE = os.getenv('MESSAGE_ENVELOPE', 'gcm')
+ENCRYPTION_KEY_CACHE_SIZE = int(os.getenv('ENCRYPTION_KEY_CACHE_SIZE', '256'))
 
 # Logging Configuration
 LOGGING = {
@@ -49,8 +49,7 @@ class CommentService:
             raise PermissionDeniedError("Cannot comment post from a user that blocked you")
 
         if post.user.profile.privacy is False:
-            follow = FollowRepository.get_follow(user_id, str(post.user.user_id))
-            if not follow or follow.status != 'accepted':
+            if not FollowRepository.is_following(user_id, str(post.user.user_id)):
                 raise PermissionDeniedError("Cannot view private user's post")
         # Check parent comment if provided
         if parent_comment_id:
@@ -61,6 +60,8 @@ class CommentService:
                 raise ValidationError("Parent comment does not belong to this post")
             if BlockRepository.is_blocked(parent_comment.user.user_id,user_id):
                 raise PermissionDeniedError("Cannot reply to comment from a user that blocked you")
+            if parent_comment.depth >= Comment.MAX_DEPTH:
+                raise ValidationError("Maximum reply depth reached")
 
         # Create comment (repository will handle post comment count increment)
         comment = CommentRepository.create(
@@ -109,9 +110,7 @@ class CommentService:
         if comment.user.user_id != user_id and not user.is_admin:
             raise PermissionDeniedError("Not authorized to delete this comment")
         
-        post_id = str(comment.post.post_id)
-        nb_post_replies = len(CommentRepository.get_replies(comment_id, page=1, page_size=20))
-        # Delete comment (repository will decrement post comment count for deleted rows)
+        # Delete comment and replies (repository will decrement post comment count for deleted rows)
         CommentRepository.delete(comment_id)
         # Audit log
         AuditLogRepository.create(
@@ -127,7 +126,8 @@ class CommentService:
         post_id: str,
         page: int = 1,
         page_size: int = 20,
-        sort_by: str = 'created_at'
+        sort_by: str = 'created_at',
+        cursor: Optional[str] = None
     ) -> List[Comment]:
         """
         Get comments for a post.
@@ -137,6 +137,7 @@ class CommentService:
             page: Page number
             page_size: Page size
             sort_by: Sort field (created_at or like_count)
+            cursor: Cursor of the previous page (overrides page)
             
         Returns:
             List of comments (top-level only, no replies)
@@ -146,13 +147,50 @@ class CommentService:
         if not post:
             raise NotFoundError(f"Post {post_id} not found")
         
-        return CommentRepository.get_by_post(post_id, page, page_size, sort_by)
+        return CommentRepository.get_by_post(post_id, page, page_size, sort_by, cursor)
     
     @staticmethod
-    def get_comment_replies(comment_id: str, page: int = 1, page_size: int = 20) -> List[Comment]:
+    def get_comment_replies(comment_id: str, page: int = 1, page_size: int = 20,
+                            cursor: Optional[str] = None) -> List[Comment]:
         """Get replies to a comment."""
         # Check comment exists
         comment = CommentService.get_comment_by_id(comment_id)
         
-        return CommentRepository.get_replies(comment_id, page, page_size)
-
+        return CommentRepository.get_replies(comment_id, page, page_size, cursor)
+    
+    @staticmethod
+    def get_post_threads(
+        post_id: str,
+        page: int = 1,
+        page_size: int = 20,
+        cursor: Optional[str] = None,
+        replies_per_thread: int = 20,
+        max_depth: Optional[int] = None
+    ) -> List[Comment]:
+        """
+        Get top-level comments of a post with their nested replies.
+        
+        Args:
+            post_id: Post ID
+            page: Page number of top-level comments
+            page_size: Number of top-level comments per page
+            cursor: Cursor of the previous page (overrides page)
+            replies_per_thread: Maximum number of replies loaded per thread
+            max_depth: Deepest reply level loaded (all levels when None)
+            
+        Returns:
+            List of top-level comments, with `thread_replies` and `has_more_replies`
+        """
+        post = PostRepository.get_by_id(post_id)
+        if not post:
+            raise NotFoundError(f"Post {post_id} not found")
+        
+        return CommentRepository.get_threads(post_id, page, page_size, cursor, replies_per_thread, max_depth)
+    
+    @staticmethod
+    def get_comment_thread(comment_id: str, page_size: int = 20, cursor: Optional[str] = None,
+                           max_depth: Optional[int] = None) -> List[Comment]:
+        """Get the nested replies of a comment in thread order."""
+        comment = CommentService.get_comment_by_id(comment_id)
+        
+        return CommentRepository.get_subtree(comment, page_size, cursor, max_depth)
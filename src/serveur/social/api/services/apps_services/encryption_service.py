@@ -1,13 +1,80 @@
 """
 Encryption service for E2E encrypted messaging.
 Uses AES-256 for content encryption and RSA-2048 for key encryption.
+
+Two content envelopes are supported:
+- 'cbc' (legacy): base64(iv || AES-256-CBC ciphertext), PKCS#7 padded, not authenticated.
+- 'gcm': 'gcm1:' + base64(nonce || AES-256-GCM ciphertext || tag), authenticated.
+Decryption recognises the envelope from the prefix, so both coexist in the messages table.
 """
 import base64
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+from django.conf import settings
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 from cryptography.hazmat.backends import default_backend
-import os
+
+# Prefix of AES-GCM envelopes (CBC envelopes are plain base64, which never contains ':')
+GCM_PREFIX = 'gcm1:'
+GCM_NONCE_SIZE = 12
+
+OAEP_PADDING = padding.OAEP(
+    mgf=padding.MGF1(algorithm=hashes.SHA256()),
+    algorithm=hashes.SHA256(),
+    label=None
+)
+
+
+class KeyCache:
+    """
+    Thread-safe LRU of parsed RSA public keys, keyed by the SHA-256 fingerprint of their PEM.
+    
+    The same public keys are sent with every message of a conversation. The cache
+    holds at most ENCRYPTION_KEY_CACHE_SIZE keys per process (0 disables it).
+    Private keys are never cached: they must not outlive the request that sent them.
+    """
+    
+    def __init__(self):
+        self._keys: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def fingerprint(pem: str) -> str:
+        """Return the fingerprint of a PEM key."""
+        return hashlib.sha256(pem.strip().encode('utf-8')).hexdigest()
+    
+    def get(self, pem: str, loader):
+        """Return the parsed key of `pem`, parsing it with `loader` on a miss."""
+        size = getattr(settings, 'ENCRYPTION_KEY_CACHE_SIZE', 256)
+        fingerprint = KeyCache.fingerprint(pem)
+        with self._lock:
+            key = self._keys.get(fingerprint)
+            if key is not None:
+                self._keys.move_to_end(fingerprint)
+                return key
+        # Parse outside the lock; invalid keys raise and are not cached
+        key = loader(pem.encode('utf-8'))
+        if size > 0:
+            with self._lock:
+                self._keys[fingerprint] = key
+                self._keys.move_to_end(fingerprint)
+                while len(self._keys) > size:
+                    self._keys.popitem(last=False)
+        return key
+    
+    def clear(self) -> None:
+        """Forget every parsed key."""
+        with self._lock:
+            self._keys.clear()
+
+
+_public_keys = KeyCache()
 
 
 class EncryptionService:
@@ -42,7 +109,28 @@ class EncryptionService:
         return private_pem.decode('utf-8'), public_pem.decode('utf-8')
     
     @staticmethod
-    def encrypt_message(content: str, sender_public_key: str, receiver_public_key: str) -> dict:
+    def load_public_key(public_key: str):
+        """Parse an RSA public key (PEM format), through the key cache."""
+        return _public_keys.get(
+            public_key,
+            lambda pem: serialization.load_pem_public_key(pem, backend=default_backend())
+        )
+    
+    @staticmethod
+    def load_private_key(private_key: str):
+        """Parse an RSA private key (PEM format); private keys are not cached."""
+        return serialization.load_pem_private_key(
+            private_key.encode('utf-8'), password=None, backend=default_backend()
+        )
+    
+    @staticmethod
+    def clear_key_cache() -> None:
+        """Forget every parsed public key (e.g. after a key rotation)."""
+        _public_keys.clear()
+    
+    @staticmethod
+    def encrypt_message(content: str, sender_public_key: str, receiver_public_key: str,
+                        envelope: str = None) -> dict:
         """
         Encrypt a message with E2E encryption.
         
@@ -50,60 +138,47 @@ class EncryptionService:
             content: Message content to encrypt
             sender_public_key: Sender's RSA public key (PEM format)
             receiver_public_key: Receiver's RSA public key (PEM format)
-            
+            envelope: 'gcm' or 'cbc' (MESSAGE_ENVELOPE setting by default)
+        
         Returns:
             Dictionary with encrypted_content, encryption_key_sender, encryption_key_receiver
         """
+        envelope = envelope or getattr(settings, 'MESSAGE_ENVELOPE', 'gcm')
+        if envelope not in ('gcm', 'cbc'):
+            raise ValueError(f"Unknown envelope {envelope}")
+        
         # Generate random AES-256 key
         aes_key = os.urandom(32)  # 256 bits
-        iv = os.urandom(16)  # 128 bits
-        
-        # Encrypt content with AES-256
-        cipher = Cipher(
-            algorithms.AES(aes_key),
-            modes.CBC(iv),
-            backend=default_backend()
-        )
-        encryptor = cipher.encryptor()
-        
-        # Pad content to AES block size (16 bytes)
         content_bytes = content.encode('utf-8')
-        padding_length = 16 - (len(content_bytes) % 16)
-        padded_content = content_bytes + bytes([padding_length] * padding_length)
         
-        encrypted_content = encryptor.update(padded_content) + encryptor.finalize()
-        
-        # Combine IV and encrypted content
-        encrypted_data = iv + encrypted_content
-        encrypted_content_b64 = base64.b64encode(encrypted_data).decode('utf-8')
-        
-        # Encrypt AES key with sender's public key
-        sender_pub_key = serialization.load_pem_public_key(
-            sender_public_key.encode('utf-8'),
-            backend=default_backend()
-        )
-        encrypted_key_sender = sender_pub_key.encrypt(
-            aes_key,
-            padding.OAEP(
-                mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                algorithm=hashes.SHA256(),
-                label=None
+        if envelope == 'gcm':
+            nonce = os.urandom(GCM_NONCE_SIZE)
+            encrypted_data = nonce + AESGCM(aes_key).encrypt(nonce, content_bytes, None)
+            encrypted_content_b64 = GCM_PREFIX + base64.b64encode(encrypted_data).decode('utf-8')
+        else:
+            iv = os.urandom(16)  # 128 bits
+            
+            # Encrypt content with AES-256
+            cipher = Cipher(
+                algorithms.AES(aes_key),
+                modes.CBC(iv),
+                backend=default_backend()
             )
-        )
+            encryptor = cipher.encryptor()
+            
+            # Pad content to AES block size (16 bytes)
+            padding_length = 16 - (len(content_bytes) % 16)
+            padded_content = content_bytes + bytes([padding_length] * padding_length)
+            
+            encrypted_content = encryptor.update(padded_content) + encryptor.finalize()
+            
+            # Combine IV and encrypted content
+            encrypted_data = iv + encrypted_content
+            encrypted_content_b64 = base64.b64encode(encrypted_data).decode('utf-8')
         
-        # Encrypt AES key with receiver's public key
-        receiver_pub_key = serialization.load_pem_public_key(
-            receiver_public_key.encode('utf-8'),
-            backend=default_backend()
-        )
-        encrypted_key_receiver = receiver_pub_key.encrypt(
-            aes_key,
-            padding.OAEP(
-                mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                algorithm=hashes.SHA256(),
-                label=None
-            )
-        )
+        # Encrypt AES key with sender's and receiver's public keys
+        encrypted_key_sender = EncryptionService.load_public_key(sender_public_key).encrypt(aes_key, OAEP_PADDING)
+        encrypted_key_receiver = EncryptionService.load_public_key(receiver_public_key).encrypt(aes_key, OAEP_PADDING)
         
         return {
             'encrypted_content': encrypted_content_b64,
@@ -117,30 +192,52 @@ class EncryptionService:
         Decrypt a message.
         
         Args:
-            encrypted_content: Base64-encoded encrypted content
+            encrypted_content: Encrypted content (CBC or GCM envelope)
             encrypted_key: Base64-encoded encrypted AES key
             private_key: User's RSA private key (PEM format)
-            
+        
         Returns:
             Decrypted message content
+        
+        Raises:
+            cryptography.exceptions.InvalidTag: If a GCM envelope was tampered with
         """
-        # Load private key
-        priv_key = serialization.load_pem_private_key(
-            private_key.encode('utf-8'),
-            password=None,
-            backend=default_backend()
-        )
+        return EncryptionService.decrypt_many([(encrypted_content, encrypted_key)], private_key)[0]
+    
+    @staticmethod
+    def decrypt_many(messages: List[Tuple[str, str]], private_key: str) -> List[str]:
+        """
+        Decrypt several messages with the same private key.
         
-        # Decrypt AES key
-        encrypted_key_bytes = base64.b64decode(encrypted_key)
-        aes_key = priv_key.decrypt(
-            encrypted_key_bytes,
-            padding.OAEP(
-                mgf=padding.MGF1(algorithm=hashes.SHA256()),
-                algorithm=hashes.SHA256(),
-                label=None
-            )
-        )
+        The private key is parsed once and each distinct encrypted AES key is
+        unwrapped (RSA-OAEP) once, however many messages share it.
+        
+        Args:
+            messages: List of (encrypted_content, encrypted_key) pairs
+            private_key: User's RSA private key (PEM format)
+        
+        Returns:
+            Decrypted contents, in the order of `messages`
+        """
+        if not messages:
+            return []
+        priv_key = EncryptionService.load_private_key(private_key)
+        aes_keys: Dict[str, bytes] = {}
+        contents = []
+        for encrypted_content, encrypted_key in messages:
+            aes_key = aes_keys.get(encrypted_key)
+            if aes_key is None:
+                aes_key = priv_key.decrypt(base64.b64decode(encrypted_key), OAEP_PADDING)
+                aes_keys[encrypted_key] = aes_key
+            contents.append(EncryptionService._decrypt_content(encrypted_content, aes_key))
+        return contents
+    
+    @staticmethod
+    def _decrypt_content(encrypted_content: str, aes_key: bytes) -> str:
+        if encrypted_content.startswith(GCM_PREFIX):
+            encrypted_data = base64.b64decode(encrypted_content[len(GCM_PREFIX):])
+            nonce = encrypted_data[:GCM_NONCE_SIZE]
+            return AESGCM(aes_key).decrypt(nonce, encrypted_data[GCM_NONCE_SIZE:], None).decode('utf-8')
         
         # Decrypt content
         encrypted_data = base64.b64decode(encrypted_content)
@@ -161,4 +258,3 @@ class EncryptionService:
         content = padded_content[:-padding_length]
         
         return content.decode('utf-8')
-
@@ -4,6 +4,7 @@ Follower service for follow/unfollow operations.
 from typing import List, Optional
 from django.db import transaction
 from db.repositories.user_repository import UserRepository, FollowRepository
+from db.repositories.post_repository import FeedRepository
 from db.repositories.message_repository import AuditLogRepository
 from db.entities.user_entity import Follow, User
 from common.exceptions import NotFoundError, ValidationError, ConflictError, PermissionDeniedError
@@ -52,6 +53,8 @@ class FollowerService:
         
         # Create follow
         follow = FollowRepository.create(follower_id, followed_id, status)
+        if status == 'accepted':
+            FeedRepository.invalidate(follower_id)
         
         # Audit log
         AuditLogRepository.create(
@@ -78,6 +81,8 @@ class FollowerService:
         
         # Delete follow
         FollowRepository.delete(follower_id, followed_id)
+        if follow.status == 'accepted':
+            FeedRepository.invalidate(follower_id)
         
         # Audit log
         AuditLogRepository.create(
@@ -105,6 +110,7 @@ class FollowerService:
         
         # Update status
         follow = FollowRepository.update_status(follower_id, followed_id, 'accepted')
+        FeedRepository.invalidate(follower_id)
         
         # Audit log
         AuditLogRepository.create(
@@ -145,18 +151,21 @@ class FollowerService:
         )
     
     @staticmethod
-    def get_followers(user_id: str, page: int = 1, page_size: int = 20) -> List[User]:
+    def get_followers(user_id: str, page: int = 1, page_size: int = 20, cursor: Optional[str] = None) -> List[User]:
         """Get list of followers."""
         # Default to accepted followers unless caller specifies otherwise
-        return FollowRepository.get_followers(user_id=user_id, status='accepted', page=page, page_size=page_size)
+        return FollowRepository.get_followers(user_id=user_id, status='accepted', page=page, page_size=page_size,
+                                              cursor=cursor)
     
     @staticmethod
-    def get_following(user_id: str, page: int = 1, page_size: int = 20) -> List[User]:
+    def get_following(user_id: str, page: int = 1, page_size: int = 20, cursor: Optional[str] = None) -> List[User]:
         """Get list of users being followed."""
-        return FollowRepository.get_following(user_id=user_id, status='accepted', page=page, page_size=page_size)
+        return FollowRepository.get_following(user_id=user_id, status='accepted', page=page, page_size=page_size,
+                                              cursor=cursor)
     
     @staticmethod
-    def get_pending_requests(user_id: str, page: int = 1, page_size: int = 20) -> List[Follow]:
+    def get_pending_requests(user_id: str, page: int = 1, page_size: int = 20,
+                             cursor: Optional[str] = None) -> List[Follow]:
         """Get pending follow requests."""
-        return FollowRepository.get_pending_requests(user_id, page, page_size)
+        return FollowRepository.get_pending_requests(user_id, page, page_size, cursor)
 
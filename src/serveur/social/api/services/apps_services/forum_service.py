@@ -2,6 +2,8 @@
 Forum service for forum management operations.
 """
 from typing import List, Optional
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.db import IntegrityError
 from db.repositories.domain_repository import ForumRepository, SubforumRepository, MembershipRepository
@@ -78,9 +80,71 @@ class ForumService:
         return ForumRepository.get_all(page, page_size)
     
     @staticmethod
-    def search_forums(query: str, page: int = 1, page_size: int = 20) -> List[Forum]:
-        """Search forums by name."""
-        return ForumRepository.search(query, page, page_size)
+    def search_forums(query: str, page: int = 1, page_size: int = 20, cursor: Optional[str] = None) -> List[Forum]:
+        """Search forums by name, best matches first."""
+        return ForumRepository.search(query, page, page_size, cursor)
+    
+    @staticmethod
+    def get_subforum_tree(forum_id: str, max_depth: Optional[int] = None) -> List[dict]:
+        """
+        Get the tree of subforums under a forum.
+        
+        The full tree is loaded in one query and cached until a subforum is created
+        or deleted (or FORUM_TREE_CACHE_TIMEOUT expires, which bounds post_count lag).
+        
+        Args:
+            forum_id: Forum ID
+            max_depth: Maximum depth to return (root subforums are depth 1), None for all
+            
+        Returns:
+            List of root nodes, each with nested `children`
+        """
+        key = f"forum_tree:{SubforumRepository.get_tree_generation()}:{forum_id}"
+        tree = cache.get(key)
+        if tree is None:
+            tree = ForumService._build_subforum_tree(forum_id, SubforumRepository.get_forum_tree(forum_id))
+            cache.set(key, tree, settings.FORUM_TREE_CACHE_TIMEOUT)
+        
+        if max_depth is None:
+            return tree
+        return ForumService._prune_tree(tree, max_depth)
+    
+    @staticmethod
+    def _build_subforum_tree(forum_id: str, subforums: list) -> List[dict]:
+        """Assemble nodes in memory: children of S are the subforums whose parent_forum is S's forum."""
+        children_by_forum = {}
+        for subforum in subforums:
+            children_by_forum.setdefault(str(subforum.parent_forum_id), []).append(subforum)
+        
+        def build_node(subforum, ancestors: frozenset) -> dict:
+            node = {
+                'subforum_id': str(subforum.subforum_id),
+                'name': subforum.name,
+                'description': subforum.description,
+                'post_count': subforum.post_count,
+                'created_at': subforum.created_at,
+                'children': []
+            }
+            # Legacy subforums attached to their parent forum have no forum of their own
+            if subforum.forum_id_id == subforum.parent_forum_id:
+                return node
+            ancestors = ancestors | {subforum.subforum_id}
+            node['children'] = [
+                build_node(child, ancestors)
+                for child in children_by_forum.get(str(subforum.forum_id_id), [])
+                if child.subforum_id not in ancestors
+            ]
+            return node
+        
+        return [build_node(root, frozenset()) for root in children_by_forum.get(str(forum_id), [])]
+    
+    @staticmethod
+    def _prune_tree(nodes: List[dict], max_depth: int) -> List[dict]:
+        """Copy of the tree cut below `max_depth`."""
+        return [
+            {**node, 'children': ForumService._prune_tree(node['children'], max_depth - 1) if max_depth > 1 else []}
+            for node in nodes
+        ]
     
     @staticmethod
     @transaction.atomic
@@ -115,7 +115,8 @@ class MessageService:
         user_id: str,
         other_user_id: str,
         page: int = 1,
-        page_size: int = 50
+        page_size: int = 50,
+        cursor: Optional[str] = None
     ) -> List[Message]:
         """
         Get conversation between two users.
@@ -125,6 +126,7 @@ class MessageService:
             other_user_id: Other user ID
             page: Page number
             page_size: Page size
+            cursor: Cursor of the previous page (overrides page)
             
         Returns:
             List of messages
@@ -135,7 +137,7 @@ class MessageService:
             raise NotFoundError(f"User {other_user_id} not found")
         
         # Get conversation
-        messages = MessageRepository.get_conversation(user_id, other_user_id, page, page_size)
+        messages = MessageRepository.get_conversation(user_id, other_user_id, page, page_size, cursor)
         
         # Mark messages as read (messages sent by other_user TO user_id)
         MessageRepository.mark_as_read(other_user_id, user_id)
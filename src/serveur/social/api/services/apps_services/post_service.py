@@ -3,7 +3,7 @@ Post service for post management operations.
 """
 from typing import Optional, List
 from django.db import transaction
-from db.repositories.post_repository import PostRepository, CommentRepository, LikeRepository
+from db.repositories.post_repository import PostRepository, CommentRepository, LikeRepository, FeedRepository
 from db.repositories.user_repository import UserRepository, BlockRepository, FollowRepository
 from db.repositories.domain_repository import SubforumRepository
 from db.repositories.message_repository import AuditLogRepository
@@ -50,6 +50,9 @@ class PostService:
         # Generate content signature
         signature = generate_content_signature(content)
         
+        # A first post in a subforum adds that subforum to the author's feed
+        first_in_subforum = not PostRepository.has_posted_in(user_id, subforum_id)
+        
         # Create post
         post = PostRepository.create(
             user_id=user_id,
@@ -62,6 +65,11 @@ class PostService:
         # Increment subforum post count
         SubforumRepository.increment_post_count(subforum_id)
         
+        # Fan out to materialised feeds
+        if first_in_subforum:
+            FeedRepository.invalidate(user_id)
+        FeedRepository.fan_out(post)
+        
         # Audit log
         AuditLogRepository.create(
             user_id=user_id,
@@ -96,8 +104,7 @@ class PostService:
         # Check if viewer can view post
         if viewer_id:
             # Check if blocked
-            if BlockRepository.is_blocked(viewer_id, str(post.user_id)) or \
-               BlockRepository.is_blocked(str(post.user_id), viewer_id):
+            if BlockRepository.is_blocked_either_way(viewer_id, str(post.user_id)):
                 raise PermissionDeniedError("Cannot view post from blocked user")
 
             # Check privacy: support both boolean and string representations
@@ -116,8 +123,7 @@ class PostService:
 
             if is_private:
                 # Check if following
-                follow = FollowRepository.get_follow(viewer_id, str(post.user_id))
-                if not follow or getattr(follow, 'status', None) != 'accepted':
+                if not FollowRepository.is_following(viewer_id, str(post.user_id)):
                     raise PermissionDeniedError("Cannot view private user's post")
         
         return post
@@ -207,39 +213,58 @@ class PostService:
         )
 
     @staticmethod
-    def get_post_likes(post_id: str, page: int = 1, page_size: int = 20) -> List[Like]:
+    def get_post_likes(post_id: str, page: int = 1, page_size: int = 20, cursor: Optional[str] = None) -> List[Like]:
         """Get users who liked a post."""
         post = PostRepository.get_by_id(post_id)
         if not post:
             raise NotFoundError(f"Post {post_id} not found")
 
-        return LikeRepository.get_by_post(post_id, page, page_size)
+        return LikeRepository.get_by_post(post_id, page, page_size, cursor)
 
     @staticmethod
-    def get_feed(user_id: str, page: int = 1, page_size: int = 20) -> List[Post]:
+    def get_feed(user_id: str, page: int = 1, page_size: int = 20, cursor: Optional[str] = None) -> List[Post]:
         """
         Get personalized feed for user.
 
         Returns posts from:
         - Users the current user follows
-        - Ordered by created_at DESC
+        - Subforums the user subscribed to or posted in
+        - Ordered by created_at DESC, read from the materialised feed
         """
-        return PostRepository.get_feed(user_id, page, page_size)
+        return PostRepository.get_feed(user_id, page, page_size, cursor)
 
     @staticmethod
     def get_discover(user_id: Optional[str] = None, page: int = 1, page_size: int = 20) -> List[Post]:
         """
-        Get discover feed (popular posts).
+        Get discover feed (hot posts).
 
         Returns:
         - Public posts
-        - Ordered by popularity (likes + comments)
+        - Ordered by hot score (likes and comments, decayed with age)
         - Excludes blocked users
         """
-        return PostRepository.get_discover(page, page_size)
+        return PostRepository.get_discover(page, page_size, viewer_id=user_id)
+
+    @staticmethod
+    def search_posts(query: str, viewer_id: str, page: int = 1, page_size: int = 20,
+                     cursor: Optional[str] = None) -> List[Post]:
+        """
+        Search posts visible to the viewer by title and content, best matches first.
+        
+        Args:
+            query: Search query
+            viewer_id: Current user ID (privacy and block filtering)
+            page: Page number
+            page_size: Page size
+            cursor: Cursor of the previous page (overrides page)
+            
+        Returns:
+            List of posts
+        """
+        return PostRepository.search(query, viewer_id, page, page_size, cursor)
 
     @staticmethod
-    def get_user_posts(user_id: str, page: int = 1, page_size: int = 20) -> List[Post]:
+    def get_user_posts(user_id: str, page: int = 1, page_size: int = 20, cursor: Optional[str] = None) -> List[Post]:
         """Get posts authored by a specific user (for their own profile)."""
-        return PostRepository.get_by_user(user_id, page, page_size)
+        return PostRepository.get_by_user(user_id, page, page_size, cursor)
 
@@ -151,7 +151,8 @@ class ReportService:
             resource_type='report',
             resource_id=report_id,
             details={'status': status, 'action': action_details or {}},
-            ip_address=ip_address
+            ip_address=ip_address,
+            durable=True
         )
         
         return report
@@ -195,7 +196,8 @@ class ReportService:
             action_type='user_banned',
             resource_type='user',
             resource_id=user_id,
-            ip_address=ip_address
+            ip_address=ip_address,
+            durable=True
         )
 
     @staticmethod
@@ -233,6 +235,7 @@ class ReportService:
             action_type='user_unbanned',
             resource_type='user',
             resource_id=user_id,
-            ip_address=ip_address
+            ip_address=ip_address,
+            durable=True
         )
 
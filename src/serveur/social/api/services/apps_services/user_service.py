@@ -233,30 +233,22 @@ class UserService:
         return user.settings
     
     @staticmethod
-    def search_users(query: str, current_user_id: Optional[str] = None, page: int = 1, page_size: int = 20) -> List[User]:
+    def search_users(query: str, current_user_id: Optional[str] = None, page: int = 1, page_size: int = 20,
+                     cursor: Optional[str] = None) -> List[User]:
         """
-        Search users by username.
+        Search users by username, best matches first.
         
         Args:
             query: Search query
             current_user_id: Current user ID (to exclude blocked users)
             page: Page number
             page_size: Page size
+            cursor: Cursor of the previous page (overrides page)
             
         Returns:
             List of users
         """
-        users = UserRepository.search_by_username(query, page, page_size)
-        
-        # Exclude blocked users
-        if current_user_id:
-            users = [
-                user for user in users
-                if not BlockRepository.is_blocked(current_user_id, str(user.user_id))
-                and not BlockRepository.is_blocked(str(user.user_id), current_user_id)
-            ]
-        
-        return users
+        return UserRepository.search_by_username(query, page, page_size, cursor, viewer_id=current_user_id)
     
     @staticmethod
     @transaction.atomic
@@ -343,10 +335,9 @@ class UserService:
             return True
 
         # Check if blocked
-        if BlockRepository.is_blocked(viewer_id, target_user_id) or BlockRepository.is_blocked(target_user_id, viewer_id):
+        if BlockRepository.is_blocked_either_way(viewer_id, target_user_id):
             return False
 
         # Private profiles require accepted follow
-        follow = FollowRepository.get_follow(viewer_id, target_user_id)
-        return follow is not None and follow.status == 'accepted'
+        return FollowRepository.is_following(viewer_id, target_user_id)
 
@@ -68,6 +68,32 @@ def domains(db):
     return [Domain.objects.create(**data) for data in domains_data]
 
 
+@pytest.fixture(autouse=True)
+def synchronous_write_behind(settings):
+    """Write audit entries and counters immediately: on-commit hooks never run inside the per-test transaction."""
+    settings.AUDIT_LOG_SINK = 'sync'
+    settings.COUNTER_SINK = 'sync'
+
+
+@pytest.fixture
+def buffered(settings, monkeypatch):
+    """
+    Return a function switching a WriteBehind to its memory buffer, without flush timer.
+    Buffers are emptied after the test.
+    """
+    enabled = []
+
+    def enable(write_behind):
+        setattr(settings, write_behind.sink_setting, 'memory')
+        monkeypatch.setattr(write_behind, 'buffer', None)
+        monkeypatch.setattr(write_behind, 'ensure_timer', lambda: None)
+        enabled.append(write_behind)
+
+    yield enable
+    for write_behind in enabled:
+        write_behind.get_buffer().pop(1000)
+
+
 @pytest.fixture(autouse=True)
 def enable_db_access_for_all_tests(db):
     """Enable database access for all tests."""
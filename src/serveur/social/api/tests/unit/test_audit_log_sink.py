@@ -0,0 +1,62 @@
+import pytest
+from django.db import transaction
+
+from db.entities.message_entity import AuditLog
+from db.entities.user_entity import User
+from db.repositories.audit_log_sink import AuditLogSink
+from db.repositories.message_repository import AuditLogRepository
+
+
+@pytest.fixture
+def buffered_audit(settings, buffered):
+    buffered(AuditLogSink.write_behind)
+    settings.AUDIT_LOG_BATCH_SIZE = 3
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create(firebase_uid='audit-uid', email='audit@example.com', username='audituser')
+
+
+@pytest.mark.django_db
+def test_buffered_entry_is_written_after_commit_and_flush(buffered_audit, user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        entry = AuditLogRepository.create(
+            user_id=user.user_id, action_type='post_liked', resource_type='post', resource_id=42
+        )
+        assert not AuditLog.objects.exists()
+
+    assert not AuditLog.objects.exists()
+    assert AuditLogSink.flush() == 1
+
+    stored = AuditLog.objects.get(log_id=entry.log_id)
+    assert stored.user_id == user.user_id
+    assert stored.resource_id == '42'
+
+
+@pytest.mark.django_db
+def test_rolled_back_entry_is_dropped(buffered_audit, user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                AuditLogRepository.create(user_id=user.user_id, action_type='post_liked', resource_type='post')
+                raise RuntimeError()
+
+    assert callbacks == []
+    assert AuditLogSink.flush() == 0
+
+
+@pytest.mark.django_db
+def test_full_batch_is_flushed_on_commit(buffered_audit, user, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        for _ in range(3):
+            AuditLogRepository.create(user_id=user.user_id, action_type='post_liked', resource_type='post')
+
+    assert AuditLog.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_durable_entry_is_written_immediately(buffered_audit, user):
+    AuditLogRepository.create(user_id=user.user_id, action_type='user_banned', resource_type='user', durable=True)
+
+    assert AuditLog.objects.filter(action_type='user_banned').count() == 1
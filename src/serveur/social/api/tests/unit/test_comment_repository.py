@@ -21,7 +21,7 @@ from datetime import datetime
 import uuid
 from django.db import models
 from django.core.validators import RegexValidator
-from db.entities.post_entity import Post, Like, Comment
+from db.entities.post_entity import Post, Like, Comment, comment_path_segment
 from db.entities.user_entity import User
 
 from db.repositories.user_repository import UserRepository
@@ -141,4 +141,85 @@ class TestCommentRepository:
 
       def test_get_replies_from_non_comment(self):
           replies = CommentRepository.get_replies(str(uuid.uuid4()))
-          assert replies is None or len(replies) == 0
\ No newline at end of file
+          assert replies is None or len(replies) == 0
+
+
+@pytest.mark.django_db
+class TestCommentThreads:
+    """Tests for materialised comment paths."""
+
+    def _reply(self, user, post, parent, content='reply'):
+        return CommentRepository.create(user.user_id, post.post_id, content, parent_comment_id=parent.comment_id)
+
+    def test_thread_placement(self, test_user, test_post, test_comment):
+        """Test replies extend their parent's path within the same thread."""
+        reply = self._reply(test_user, test_post, test_comment)
+        nested = self._reply(test_user, test_post, reply)
+
+        assert test_comment.root_id == test_comment.comment_id and test_comment.depth == 0
+        assert (reply.root_id, reply.depth) == (test_comment.comment_id, 1)
+        assert (nested.root_id, nested.depth) == (test_comment.comment_id, 2)
+        assert nested.path.startswith(reply.path) and reply.path.startswith(test_comment.path)
+
+    def test_get_threads_depth_first(self, test_user, test_post, test_comment):
+        """Test a thread loads depth first, siblings oldest first, in one query."""
+        first = self._reply(test_user, test_post, test_comment, 'first')
+        self._reply(test_user, test_post, test_comment, 'second')
+        self._reply(test_user, test_post, first, 'nested')
+        other = CommentRepository.create(test_user.user_id, test_post.post_id, 'other root')
+
+        roots = CommentRepository.get_threads(test_post.post_id)
+
+        assert [root.comment_id for root in roots] == [other.comment_id, test_comment.comment_id]
+        assert roots[0].thread_replies == []
+        assert [reply.content for reply in roots[1].thread_replies] == ['first', 'nested', 'second']
+        assert roots[1].has_more_replies is False
+
+    def test_path_follows_created_at(self, test_user, test_post, test_comment):
+        """Test the path segment is built from the stored created_at."""
+        reply = self._reply(test_user, test_post, test_comment)
+
+        assert reply.path == test_comment.path + comment_path_segment(reply.created_at, reply.comment_id)
+        reply.refresh_from_db()
+        assert reply.path.endswith(comment_path_segment(reply.created_at, reply.comment_id))
+
+    def test_get_threads_limits_replies(self, test_user, test_post, test_comment):
+        """Test replies_per_thread and max_depth bound the loaded replies."""
+        first = self._reply(test_user, test_post, test_comment, 'first')
+        self._reply(test_user, test_post, first, 'nested')
+        self._reply(test_user, test_post, test_comment, 'second')
+
+        limited = CommentRepository.get_threads(test_post.post_id, replies_per_thread=2)[0]
+        shallow = CommentRepository.get_threads(test_post.post_id, max_depth=1)[0]
+
+        assert [reply.content for reply in limited.thread_replies] == ['first', 'nested']
+        assert limited.has_more_replies is True
+        assert [reply.content for reply in shallow.thread_replies] == ['first', 'second']
+
+    def test_get_subtree_cursor(self, test_user, test_post, test_comment):
+        """Test subtree pages follow each other by path."""
+        first = self._reply(test_user, test_post, test_comment, 'first')
+        self._reply(test_user, test_post, first, 'nested')
+        self._reply(test_user, test_post, test_comment, 'second')
+
+        page = list(CommentRepository.get_subtree(test_comment, page_size=2))
+        rest = list(CommentRepository.get_subtree(test_comment, page_size=2, cursor=page[-1].path))
+
+        assert [reply.content for reply in page + rest] == ['first', 'nested', 'second']
+        with pytest.raises(ValidationError):
+            CommentRepository.get_subtree(test_comment, cursor='not-a-path')
+
+    def test_delete_subtree_counts_once(self, test_user, test_post, test_comment):
+        """Test deleting a reply removes its subtree only and adjusts the count by its size."""
+        first = self._reply(test_user, test_post, test_comment, 'first')
+        self._reply(test_user, test_post, first, 'nested')
+        second = self._reply(test_user, test_post, test_comment, 'second')
+        count = PostRepository.get_by_id(test_post.post_id).comment_count
+
+        assert CommentRepository.delete(first.comment_id) is True
+
+        assert list(Comment.objects.filter(post=test_post).values_list('content', flat=True).order_by('path')) == [
+            'Hello world', 'second'
+        ]
+        assert PostRepository.get_by_id(test_post.post_id).comment_count == count - 2
+        assert CommentRepository.get_by_id(second.comment_id) is not None
\ No newline at end of file
@@ -0,0 +1,77 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from db.entities.domain_entity import Forum
+from db.entities.post_entity import Like, Post
+from db.repositories.counter_buffer import CounterBuffer
+from db.repositories.domain_repository import ForumRepository
+from db.repositories.post_repository import PostRepository, hot_score
+from db.repositories.user_repository import UserRepository
+
+
+@pytest.fixture
+def buffered_counters(buffered):
+    buffered(CounterBuffer.write_behind)
+
+
+@pytest.fixture
+def post(db):
+    user = UserRepository.create(email='counter@example.com', username='counteruser', firebase_uid='counter-uid')
+    return PostRepository.create(str(user.user_id), 'Counted', 'content')
+
+
+@pytest.mark.django_db
+def test_deltas_are_coalesced_into_one_update(buffered_counters, post, django_capture_on_commit_callbacks,
+                                              django_assert_num_queries):
+    with django_capture_on_commit_callbacks(execute=True):
+        for _ in range(5):
+            PostRepository.increment_like_count(post.post_id)
+        PostRepository.decrement_like_count(post.post_id)
+        PostRepository.increment_comment_count(post.post_id)
+
+    assert Post.objects.get(post_id=post.post_id).like_count == 0
+    with django_assert_num_queries(1):
+        assert CounterBuffer.flush() == 1
+
+    post.refresh_from_db()
+    assert (post.like_count, post.comment_count) == (4, 1)
+    assert post.hot_score == pytest.approx(hot_score(4, 1, post.created_at), abs=1e-3)
+
+
+@pytest.mark.django_db
+def test_reads_include_pending_deltas(buffered_counters, post, django_capture_on_commit_callbacks):
+    forum = Forum.objects.create(forum_name='Counted forum')
+    with django_capture_on_commit_callbacks(execute=True):
+        PostRepository.increment_like_count(post.post_id)
+        ForumRepository.increment_member_count(str(forum.forum_id))
+
+    assert PostRepository.get_by_id(str(post.post_id)).like_count == 1
+    assert PostRepository.get_discover()[0].like_count == 1
+    assert ForumRepository.get_by_id(str(forum.forum_id)).member_count == 1
+    assert Post.objects.get(post_id=post.post_id).like_count == 0
+
+
+@pytest.mark.django_db
+def test_reconcile_counters_recomputes_from_source_tables(post):
+    Like.objects.create(post=post, user=post.user)
+    Post.objects.filter(post_id=post.post_id).update(like_count=7, comment_count=3)
+
+    call_command('reconcile_counters', stdout=StringIO())
+
+    post.refresh_from_db()
+    assert (post.like_count, post.comment_count) == (1, 0)
+    assert post.hot_score == pytest.approx(hot_score(1, 0, post.created_at))
+
+
+@pytest.mark.django_db
+def test_reconcile_counters_refuses_the_memory_sink(buffered_counters, post):
+    Post.objects.filter(post_id=post.post_id).update(like_count=7)
+
+    # Deltas pending in other workers' memory would be applied on top of the recomputed counts
+    with pytest.raises(CommandError, match='COUNTER_SINK'):
+        call_command('reconcile_counters', stdout=StringIO())
+
+    assert Post.objects.get(post_id=post.post_id).like_count == 7
@@ -0,0 +1,80 @@
+"""
+Unit tests for EncryptionService envelopes, key cache and batch decryption.
+"""
+from unittest.mock import patch
+
+import pytest
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import serialization
+
+from services.apps_services.encryption_service import EncryptionService, GCM_PREFIX
+
+
+@pytest.fixture(scope='module')
+def keys():
+    return EncryptionService.generate_rsa_keypair(), EncryptionService.generate_rsa_keypair()
+
+
+@pytest.fixture(autouse=True)
+def empty_key_cache():
+    EncryptionService.clear_key_cache()
+    yield
+    EncryptionService.clear_key_cache()
+
+
+@pytest.mark.parametrize('envelope', ['gcm', 'cbc'])
+def test_round_trip_for_sender_and_receiver(keys, envelope):
+    (sender_priv, sender_pub), (receiver_priv, receiver_pub) = keys
+
+    data = EncryptionService.encrypt_message('Bonjour é', sender_pub, receiver_pub, envelope=envelope)
+
+    assert data['encrypted_content'].startswith(GCM_PREFIX) == (envelope == 'gcm')
+    assert EncryptionService.decrypt_message(
+        data['encrypted_content'], data['encryption_key_sender'], sender_priv
+    ) == 'Bonjour é'
+    assert EncryptionService.decrypt_message(
+        data['encrypted_content'], data['encryption_key_receiver'], receiver_priv
+    ) == 'Bonjour é'
+
+
+def test_tampered_gcm_envelope_is_rejected(keys):
+    (sender_priv, sender_pub), (_, receiver_pub) = keys
+    data = EncryptionService.encrypt_message('secret', sender_pub, receiver_pub, envelope='gcm')
+    content = data['encrypted_content']
+    tampered = content[:-6] + ('A' if content[-6] != 'A' else 'B') + content[-5:]
+
+    with pytest.raises(InvalidTag):
+        EncryptionService.decrypt_message(tampered, data['encryption_key_sender'], sender_priv)
+
+
+def test_decrypt_many_parses_key_once_and_unwraps_each_key_once(keys):
+    (sender_priv, sender_pub), (_, receiver_pub) = keys
+    sent = [EncryptionService.encrypt_message(f'message {i}', sender_pub, receiver_pub, envelope=envelope)
+            for i, envelope in enumerate(['gcm', 'cbc', 'gcm'])]
+    messages = [(data['encrypted_content'], data['encryption_key_sender']) for data in sent]
+    # The same message twice shares its wrapped key
+    messages.append(messages[0])
+
+    loader = 'services.apps_services.encryption_service.serialization.load_pem_private_key'
+    with patch(loader, wraps=serialization.load_pem_private_key) as load:
+        contents = EncryptionService.decrypt_many(messages, sender_priv)
+
+    assert contents == ['message 0', 'message 1', 'message 2', 'message 0']
+    assert load.call_count == 1
+
+
+def test_key_cache_evicts_least_recently_used(keys, settings):
+    settings.ENCRYPTION_KEY_CACHE_SIZE = 1
+    (_, sender_pub), (_, receiver_pub) = keys
+
+    first = EncryptionService.load_public_key(sender_pub)
+    assert EncryptionService.load_public_key(sender_pub) is first
+    EncryptionService.load_public_key(receiver_pub)
+
+    assert EncryptionService.load_public_key(sender_pub) is not first
+
+
+def test_private_keys_are_not_cached(keys):
+    (sender_priv, _), _ = keys
+
+    assert EncryptionService.load_private_key(sender_priv) is not EncryptionService.load_private_key(sender_priv)
@@ -48,3 +48,62 @@ def test_forum_tree_structure():
     child_node = root_node['children'][0]
     assert child_node['name'] == 'ChildSub'
     assert child_node.get('children') == []
+
+
+def _nested_chain(user, forum, length):
+    parent_forum_id = str(forum.forum_id)
+    for i in range(length):
+        sub = SubforumRepository.create(
+            creator_id=str(user.user_id),
+            subforum_name=f'Level{i}',
+            parent_forum_id=parent_forum_id
+        )
+        parent_forum_id = str(sub.forum_id_id)
+
+
+@pytest.mark.django_db
+def test_forum_tree_query_count_is_bounded(django_assert_max_num_queries):
+    from services.apps_services.forum_service import ForumService
+
+    user = User.objects.create(firebase_uid='t2', email='t2@example.com', username='tester2')
+    forum = ForumRepository.create(creator_id=str(user.user_id), forum_name='DeepForum', description='deep')
+    _nested_chain(user, forum, 6)
+
+    # one recursive query, whatever the depth
+    with django_assert_max_num_queries(1):
+        tree = ForumService.get_subforum_tree(str(forum.forum_id))
+
+    depth = 0
+    nodes = tree
+    while nodes:
+        depth += 1
+        nodes = nodes[0]['children']
+    assert depth == 6
+
+    pruned = ForumService.get_subforum_tree(str(forum.forum_id), max_depth=2)
+    assert pruned[0]['children'][0]['children'] == []
+
+
+@pytest.mark.django_db
+def test_forum_tree_cache_invalidated_on_create():
+    from services.apps_services.forum_service import ForumService
+
+    user = User.objects.create(firebase_uid='t3', email='t3@example.com', username='tester3')
+    forum = ForumRepository.create(creator_id=str(user.user_id), forum_name='CachedForum', description='cached')
+    assert ForumService.get_subforum_tree(str(forum.forum_id)) == []
+
+    SubforumRepository.create(creator_id=str(user.user_id), subforum_name='NewSub', parent_forum_id=str(forum.forum_id))
+
+    assert [node['name'] for node in ForumService.get_subforum_tree(str(forum.forum_id))] == ['NewSub']
+
+
+@pytest.mark.django_db
+def test_forum_tree_generation_renewed_on_commit(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks() as callbacks:
+        SubforumRepository.invalidate_trees()
+        before_commit = SubforumRepository.get_tree_generation()
+
+    # a tree read before the commit cached under this generation must not survive it
+    for callback in callbacks:
+        callback()
+    assert SubforumRepository.get_tree_generation() != before_commit
@@ -426,6 +426,40 @@ class TestMessageRepositoryGetConversations:
         conversations = MessageRepository.get_conversations(str(users['user1'].user_id))
         
         assert len(conversations) == 1
+    
+    def test_get_conversations_pagination(self, users):
+        """Test inbox is paginated by most recent conversation."""
+        for partner in ('user2', 'user3'):
+            Message.objects.create(
+                sender=users[partner],
+                receiver=users['user1'],
+                encrypted_content='hello',
+                encryption_key_sender='k',
+                encryption_key_receiver='kr'
+            )
+        
+        first = MessageRepository.get_conversations(str(users['user1'].user_id), page=1, page_size=1)
+        second = MessageRepository.get_conversations(str(users['user1'].user_id), page=2, page_size=1)
+        
+        assert str(first[0]['partner_id']) == str(users['user3'].user_id)
+        assert str(second[0]['partner_id']) == str(users['user2'].user_id)
+    
+    def test_get_conversations_single_query(self, users, django_assert_num_queries):
+        """Test inbox is loaded in one query whatever the number of partners."""
+        for partner in ('user2', 'user3'):
+            for i in range(3):
+                Message.objects.create(
+                    sender=users[partner],
+                    receiver=users['user1'],
+                    encrypted_content=f'msg{i}',
+                    encryption_key_sender='k',
+                    encryption_key_receiver='kr'
+                )
+        
+        with django_assert_num_queries(1):
+            conversations = MessageRepository.get_conversations(str(users['user1'].user_id))
+            assert [c['unread_count'] for c in conversations] == [3, 3]
+            assert conversations[0]['last_message'].sender.username == 'user3'
 
 
 @pytest.mark.django_db
@@ -242,7 +242,7 @@ class TestMessageServiceGetConversation:
         )
         
         mock_msg_repo.get_conversation.assert_called_once_with(
-            TEST_UUID_1, TEST_UUID_2, 3, 50
+            TEST_UUID_1, TEST_UUID_2, 3, 50, None
         )
     
     @patch('services.apps_services.message_service.UserRepository')
@@ -17,13 +17,15 @@ from unittest.mock import Mock, patch, MagicMock
 from django.test import TestCase
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
-from datetime import datetime
+from datetime import datetime, timedelta
+from django.utils import timezone
 import uuid
 from django.db import models
 from django.core.validators import RegexValidator
 from db.entities.post_entity import Post, Like
-from db.repositories.user_repository import UserRepository
-from db.repositories.post_repository import PostRepository
+from db.repositories.user_repository import UserRepository, BlockRepository
+from db.repositories.post_repository import PostRepository, FeedRepository, hot_score
+from common.utils import get_next_cursor, encode_cursor
 from db.entities.user_entity import User,UserProfile, UserSettings
 from common.exceptions import NotFoundError, ValidationError, PermissionDeniedError, ConflictError
 from db.repositories.domain_repository import DomainRepository, ForumRepository, SubforumRepository
@@ -149,3 +151,122 @@ class TestPostRepository:
         PostRepository.decrement_like_count(test_post.post_id)
         assert PostRepository.get_by_id(test_post.post_id).like_count == count
 
+
+@pytest.mark.django_db
+class TestFeedRepository:
+
+    def test_feed_is_built_on_first_read(self, test_user, test_post):
+        assert FeedRepository.is_built(test_user.user_id) is False
+        PostRepository.get_feed(test_user.user_id)
+        assert FeedRepository.is_built(test_user.user_id) is True
+
+    def test_fan_out_reaches_followers_and_subscribers(self, test_user, user2, test_subforum):
+        from db.entities.user_entity import Follow
+        from db.repositories.domain_repository import SubforumSubscriptionRepository
+        reader = UserRepository.create(firebase_id='reader-uid', email='reader@example.com', username='reader')
+        Follow.objects.create(follower=user2, following=test_user, status='accepted')
+        SubforumSubscriptionRepository.create(str(reader.user_id), str(test_subforum.subforum_id))
+        for user in (test_user, user2, reader):
+            FeedRepository.rebuild(user.user_id)
+
+        post = PostRepository.create(test_user.user_id, "fan out", "hello world", subforum_id=test_subforum.subforum_id)
+        assert FeedRepository.fan_out(post) == 3
+
+        for user in (test_user, user2, reader):
+            assert [p.post_id for p in PostRepository.get_feed(user.user_id)] == [post.post_id]
+
+    def test_invalidate_drops_feed(self, test_user, user2, test_post):
+        from db.entities.user_entity import Follow
+        assert len(PostRepository.get_feed(user2.user_id)) == 0
+        Follow.objects.create(follower=user2, following=test_user, status='accepted')
+        FeedRepository.invalidate(user2.user_id)
+        assert [p.post_id for p in PostRepository.get_feed(user2.user_id)] == [test_post.post_id]
+
+    def test_pages_past_materialised_window_use_live_query(self, test_user, settings):
+        settings.FEED_MAX_ENTRIES = 2
+        for i in range(3):
+            PostRepository.create(test_user.user_id, f"post {i}", "hello world")
+        FeedRepository.rebuild(test_user.user_id)
+        page2 = PostRepository.get_feed(test_user.user_id, page=2, page_size=2)
+        assert len(page2) == 1
+
+
+@pytest.mark.django_db
+class TestCursorPagination:
+
+    def test_cursor_walks_all_pages(self, test_user):
+        created = [PostRepository.create(test_user.user_id, f"post {i}", "hello world") for i in range(5)]
+        seen = []
+        page = list(PostRepository.get_by_user(test_user.user_id, page_size=2))
+        while page:
+            seen += [post.post_id for post in page]
+            cursor = get_next_cursor(page, 2)
+            if cursor is None:
+                break
+            page = list(PostRepository.get_by_user(test_user.user_id, page_size=2, cursor=cursor))
+        assert sorted(seen) == sorted(post.post_id for post in created)
+        assert len(seen) == 5
+
+    def test_new_rows_do_not_shift_cursor_pages(self, test_user):
+        for i in range(4):
+            PostRepository.create(test_user.user_id, f"post {i}", "hello world")
+        first = list(PostRepository.get_by_user(test_user.user_id, page_size=2))
+        expected = list(PostRepository.get_by_user(test_user.user_id, page=2, page_size=2))
+        PostRepository.create(test_user.user_id, "newer post", "hello world")
+        second = list(PostRepository.get_by_user(test_user.user_id, page_size=2, cursor=get_next_cursor(first, 2)))
+        assert [p.post_id for p in second] == [p.post_id for p in expected]
+
+    def test_feed_cursor(self, test_user):
+        for i in range(3):
+            PostRepository.create(test_user.user_id, f"post {i}", "hello world")
+        first = PostRepository.get_feed(test_user.user_id, page_size=2)
+        second = PostRepository.get_feed(test_user.user_id, page_size=2, cursor=get_next_cursor(first, 2))
+        assert len(second) == 1
+        assert second[0].post_id not in {p.post_id for p in first}
+
+    def test_invalid_cursor(self, test_user):
+        with pytest.raises(ValidationError):
+            list(PostRepository.get_by_user(test_user.user_id, cursor="not-a-cursor"))
+
+    def test_tampered_cursor_pk(self, test_user):
+        # Valid timestamp, pk that is not a UUID: rejected before reaching the query
+        cursor = encode_cursor(timezone.now(), "1 OR 1=1")
+        with pytest.raises(ValidationError):
+            list(PostRepository.get_by_user(test_user.user_id, cursor=cursor))
+
+
+@pytest.mark.django_db
+class TestHotRanking:
+
+    def test_counters_keep_hot_score_consistent(self, test_user, user2):
+        post = PostRepository.create(test_user.user_id, "hot post", "content")
+        PostRepository.increment_like_count(post.post_id)
+        PostRepository.increment_like_count(post.post_id)
+        PostRepository.increment_comment_count(post.post_id)
+        PostRepository.decrement_like_count(post.post_id)
+
+        post.refresh_from_db()
+        assert (post.like_count, post.comment_count) == (1, 1)
+        assert post.hot_score == pytest.approx(hot_score(1, 1, post.created_at), abs=1e-3)
+
+    def test_newer_post_outranks_older_viral_post(self, test_user, settings):
+        settings.HOT_SCORE_TIME_SCALE = 3600
+        old = PostRepository.create(test_user.user_id, "old viral", "content")
+        new = PostRepository.create(test_user.user_id, "new post", "content")
+        # 50 engagements two days ago against one now
+        Post.objects.filter(post_id=old.post_id).update(
+            like_count=50, created_at=old.created_at - timedelta(days=2)
+        )
+        Post.objects.filter(post_id=new.post_id).update(like_count=1)
+        assert PostRepository.rescore_hot() == 2
+
+        assert [post.post_id for post in PostRepository.get_discover()] == [new.post_id, old.post_id]
+
+    def test_discover_excludes_blocked_authors(self, test_user, user2):
+        PostRepository.create(test_user.user_id, "visible", "content")
+        PostRepository.create(user2.user_id, "hidden", "content")
+        BlockRepository.create(str(user2.user_id), str(test_user.user_id))
+
+        discover = PostRepository.get_discover(viewer_id=str(test_user.user_id))
+
+        assert [post.title for post in discover] == ["visible"]
@@ -0,0 +1,85 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from common.rate_limiters import RateLimiter, rate_limit
+
+
+class _View:
+    @rate_limit('test', limit=3, period=60)
+    def get(self, request):
+        return Response({'ok': True})
+
+
+@pytest.fixture(autouse=True)
+def clean_limiter():
+    cache.clear()
+    RateLimiter.reset_local()
+    yield
+    cache.clear()
+    RateLimiter.reset_local()
+
+
+def _request():
+    request = APIRequestFactory().get('/', REMOTE_ADDR='10.0.0.1')
+    request.user = None
+    return request
+
+
+@override_settings(RATE_LIMIT_ENABLED=True)
+def test_limit_exceeded_returns_429_with_headers():
+    view = _View()
+    responses = [view.get(_request()) for _ in range(4)]
+
+    assert [r.status_code for r in responses] == [200, 200, 200, 429]
+    assert [r['X-RateLimit-Remaining'] for r in responses] == ['2', '1', '0', '0']
+    assert responses[0]['X-RateLimit-Limit'] == '3'
+    assert 0 < int(responses[3]['Retry-After']) <= 60
+    assert responses[3].data['error']['code'] == 'RATE_LIMIT_EXCEEDED'
+
+
+@override_settings(RATE_LIMIT_LOCAL_SHARE=0.01)
+def test_leased_slots_are_spent_without_cache_round_trip():
+    with patch.object(RateLimiter, '_take', wraps=RateLimiter._take) as take:
+        results = [RateLimiter.hit('rate_limit:lease:user', 1000, 60) for _ in range(25)]
+
+    assert all(result.allowed for result in results)
+    # Slots are leased 10 at a time (1 % of the limit)
+    assert take.call_count == 3
+    assert results[-1].remaining == 975
+
+
+@override_settings(RATE_LIMIT_LOCAL_SHARE=0)
+def test_previous_window_is_weighted_into_sliding_window():
+    with patch('common.rate_limiters.time.time', return_value=60 * 1000 + 59):
+        for _ in range(10):
+            assert RateLimiter.hit('rate_limit:slide:user', 10, 60).allowed
+    RateLimiter.reset_local()
+
+    # A quarter into the next window, 75 % of the previous 10 hits still count
+    with patch('common.rate_limiters.time.time', return_value=60 * 1001 + 15):
+        results = [RateLimiter.hit('rate_limit:slide:user', 10, 60) for _ in range(3)]
+
+    assert [result.allowed for result in results] == [True, True, False]
+
+
+@override_settings(CACHES={'default': {
+    'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+    'LOCATION': 'redis://127.0.0.1:6379/15',
+}})
+def test_redis_backend_takes_slots_with_the_sliding_window_script():
+    script = MagicMock(return_value=[5, b'2'])
+    with patch('redis.client.Redis.register_script', return_value=script) as register, \
+            patch.dict(RateLimiter._scripts, clear=True), \
+            patch('django.core.cache.backends.redis.RedisCache.get_many') as get_many:
+        assert RateLimiter._take('rate_limit:redis:user', 100, 10, 60, 0.5, 5) == (5, 2.0)
+
+    register.assert_called_once()
+    get_many.assert_not_called()
+    keys = script.call_args.kwargs['keys']
+    assert [key.rsplit(':', 1)[1] for key in keys] == ['100', '99']
+    assert script.call_args.kwargs['args'] == [10, 60, 0.5, 5]
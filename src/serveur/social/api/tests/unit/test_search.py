@@ -0,0 +1,114 @@
+"""
+Unit tests for ranked search (SQLite fallback path of common.search).
+"""
+from unittest.mock import patch
+
+import pytest
+from common.exceptions import ValidationError
+from common.search import encode_rank_cursor, decode_rank_cursor, name_search, post_search
+from db.entities.post_entity import Post
+from db.entities.user_entity import User
+from db.repositories.user_repository import UserRepository, BlockRepository, FollowRepository
+from db.repositories.post_repository import PostRepository
+
+
+def _user(name):
+    return UserRepository.create(email=f'{name}@example.com', username=name, firebase_uid=f'{name}-uid')
+
+
+@pytest.mark.django_db
+class TestUserSearch:
+    """Tests for ranked user search."""
+
+    def test_exact_and_prefix_matches_rank_first(self):
+        """Test exact > prefix > substring ordering."""
+        _user('the_alice')
+        _user('alice2')
+        _user('alice')
+
+        results = UserRepository.search_by_username('alice')
+
+        assert [user.username for user in results] == ['alice', 'alice2', 'the_alice']
+
+    def test_cursor_pagination_covers_all_results_once(self):
+        """Test cursor pages neither skip nor repeat users with equal ranks."""
+        for i in range(7):
+            _user(f'pager{i}')
+
+        seen, cursor = [], None
+        while True:
+            page = list(UserRepository.search_by_username('pager', page_size=3, cursor=cursor))
+            seen.extend(user.username for user in page)
+            if len(page) < 3:
+                break
+            cursor = encode_rank_cursor(page[-1].rank, page[-1].pk)
+
+        assert sorted(seen) == [f'pager{i}' for i in range(7)]
+
+    def test_blocked_users_are_excluded_both_ways(self):
+        """Test users blocking or blocked by the viewer are filtered out."""
+        viewer = _user('viewer')
+        blocked = _user('finder_blocked')
+        blocker = _user('finder_blocker')
+        _user('finder_visible')
+        BlockRepository.create(str(viewer.user_id), str(blocked.user_id))
+        BlockRepository.create(str(blocker.user_id), str(viewer.user_id))
+
+        results = UserRepository.search_by_username('finder', viewer_id=str(viewer.user_id))
+
+        assert [user.username for user in results] == ['finder_visible']
+
+    def test_invalid_cursor(self):
+        """Test malformed cursors are rejected."""
+        with pytest.raises(ValidationError):
+            decode_rank_cursor('not-a-cursor')
+
+    def test_tampered_cursor_pk(self):
+        """Test cursors whose pk is not a UUID are rejected before reaching the query."""
+        with pytest.raises(ValidationError):
+            decode_rank_cursor(encode_rank_cursor(0.5, "1 OR 1=1"))
+
+
+def test_postgres_ranks_are_double_precision():
+    """Test ranks are cast to float8 so they compare exactly with the cursor rank."""
+    with patch('common.search.is_postgres', return_value=True):
+        users = str(name_search(User.objects.all(), 'username', 'alice').query)
+        posts = str(post_search(Post.objects.all(), 'election').query)
+
+    assert 'similarity("users"."username", alice)::float8' in users
+    assert "ts_rank(\"posts\".\"search_vector\", websearch_to_tsquery('french', election))::float8" in posts
+
+
+@pytest.mark.django_db
+class TestPostSearch:
+    """Tests for post search visibility and ranking."""
+
+    def test_title_matches_rank_above_content_matches(self):
+        """Test posts matching in the title come first."""
+        author = _user('author')
+        PostRepository.create(str(author.user_id), 'Daily notes', 'about the election results')
+        PostRepository.create(str(author.user_id), 'Election results', 'numbers')
+        PostRepository.create(str(author.user_id), 'Unrelated', 'nothing here')
+
+        results = PostRepository.search('election', str(author.user_id))
+
+        assert [post.title for post in results] == ['Election results', 'Daily notes']
+
+    def test_private_and_blocked_authors_are_hidden(self):
+        """Test posts are filtered by privacy, follows and blocks."""
+        viewer = _user('reader')
+        private = _user('private_author')
+        private.profile.privacy = False
+        private.profile.save()
+        followed = _user('followed_author')
+        followed.profile.privacy = False
+        followed.profile.save()
+        blocker = _user('blocking_author')
+        FollowRepository.create(str(viewer.user_id), str(followed.user_id), status='accepted')
+        BlockRepository.create(str(blocker.user_id), str(viewer.user_id))
+        for author in (private, followed, blocker, viewer):
+            PostRepository.create(str(author.user_id), f'Topic by {author.username}', 'topic')
+
+        results = PostRepository.search('topic', str(viewer.user_id))
+
+        assert sorted(post.user.username for post in results) == ['followed_author', 'reader']
@@ -0,0 +1,62 @@
+import time
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIRequestFactory
+
+from apps.custom_auth.authentication import FirebaseAuthentication
+from apps.custom_auth.token_cache import TokenCache
+from db.entities.user_entity import User
+
+
+@pytest.fixture
+def user(db):
+    cache.clear()
+    yield User.objects.create(firebase_uid='cached-uid', email='cached@example.com', username='cacheduser')
+    cache.clear()
+
+
+def _authenticate(token='token-1'):
+    request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {token}')
+    return FirebaseAuthentication().authenticate(request)
+
+
+@pytest.mark.django_db
+@patch('apps.custom_auth.token_cache.initialize_firebase')
+@patch('apps.custom_auth.token_cache.firebase_auth.verify_id_token')
+def test_token_and_user_are_cached_between_requests(mock_verify, mock_init, user, django_assert_num_queries):
+    mock_verify.return_value = {'uid': 'cached-uid', 'exp': time.time() + 3600}
+
+    first, _ = _authenticate()
+    with django_assert_num_queries(0):
+        second, _ = _authenticate()
+
+    assert mock_verify.call_count == 1
+    assert first.user_id == second.user_id == user.user_id
+
+
+@pytest.mark.django_db
+@patch('apps.custom_auth.token_cache.initialize_firebase')
+@patch('apps.custom_auth.token_cache.firebase_auth.verify_id_token')
+def test_saving_user_evicts_cached_row(mock_verify, mock_init, user):
+    mock_verify.return_value = {'uid': 'cached-uid', 'exp': time.time() + 3600}
+    _authenticate()
+
+    user.is_banned = True
+    user.save()
+
+    wrapped, _ = _authenticate()
+    assert wrapped.is_banned is True
+
+
+@pytest.mark.django_db
+@patch('apps.custom_auth.token_cache.initialize_firebase')
+@patch('apps.custom_auth.token_cache.firebase_auth.verify_id_token')
+def test_claims_are_not_cached_past_token_expiry(mock_verify, mock_init, user):
+    mock_verify.return_value = {'uid': 'cached-uid', 'exp': time.time() - 1}
+
+    TokenCache.verify('token-1')
+    TokenCache.verify('token-1')
+
+    assert mock_verify.call_count == 2
@@ -514,3 +514,40 @@ class TestFollowRepository:
                 follower_id=str(test_user.user_id),
                 following_id=str(user2.user_id)
             )
+
+
+@pytest.mark.django_db
+class TestRelationshipCache:
+    """Tests for cached block and follow lookups."""
+
+    def test_block_checks_are_served_from_cache(self, test_user, user2, django_assert_num_queries):
+        """Test both directions of a block are answered by one cached entry."""
+        BlockRepository.create(str(user2.user_id), str(test_user.user_id))
+        BlockRepository.is_blocked_either_way(str(test_user.user_id), str(user2.user_id))
+
+        with django_assert_num_queries(0):
+            assert BlockRepository.is_blocked_either_way(str(test_user.user_id), str(user2.user_id))
+            assert not BlockRepository.is_blocked(str(test_user.user_id), str(user2.user_id))
+
+    def test_block_changes_evict_both_users(self, test_user, user2):
+        """Test blocking and unblocking are seen immediately by both users."""
+        assert not BlockRepository.is_blocked(str(test_user.user_id), str(user2.user_id))
+        assert not BlockRepository.is_blocked_either_way(str(user2.user_id), str(test_user.user_id))
+
+        BlockRepository.create(str(test_user.user_id), str(user2.user_id))
+        assert BlockRepository.is_blocked(str(test_user.user_id), str(user2.user_id))
+        assert BlockRepository.is_blocked_either_way(str(user2.user_id), str(test_user.user_id))
+
+        BlockRepository.delete(str(test_user.user_id), str(user2.user_id))
+        assert not BlockRepository.is_blocked_either_way(str(user2.user_id), str(test_user.user_id))
+
+    def test_only_accepted_follows_count(self, test_user, user2):
+        """Test follow status changes are seen immediately."""
+        FollowRepository.create(str(test_user.user_id), str(user2.user_id), status='pending')
+        assert not FollowRepository.is_following(str(test_user.user_id), str(user2.user_id))
+
+        FollowRepository.update_status(str(test_user.user_id), str(user2.user_id), 'accepted')
+        assert FollowRepository.is_following(str(test_user.user_id), str(user2.user_id))
+
+        FollowRepository.delete(str(test_user.user_id), str(user2.user_id))
+        assert not FollowRepository.is_following(str(test_user.user_id), str(user2.user_id))
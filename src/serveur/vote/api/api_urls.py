@@ -2,6 +2,7 @@
 from django.urls import path
 from api.vote_controller import (
     VoteDeleteView,
+    VoteValidationJobView,
     VoteValidationView,
     VoteView,
     VotesByVoterView,
@@ -12,6 +13,7 @@ from api.vote_controller import (
 from api.publication_controller import PublicationSettingView
 from api.result_controller import ResultView
 from api.publication_controller import PublicationSettingView
+from api.metrics_controller import Neo4jPoolMetricsView
 from api.stats_controller import StatsDailyView, StatsMonthlyView, StatsChartView
 
 
@@ -25,6 +27,7 @@ urlpatterns = [
     path("votes/for-user/<str:userId>", VotesForUserView.as_view(), name="votes_for_user"),
 
     path("votes/validate/force", VoteValidationView.as_view(), name="vote_validation"),
+    path("votes/validate/jobs/<str:jobId>", VoteValidationJobView.as_view(), name="vote_validation_job"),
     
     path("results", ResultView.as_view(), name="get_results"),
 
@@ -33,4 +36,6 @@ urlpatterns = [
     path("stats/votes/daily/<str:userId>", StatsDailyView.as_view(), name="stats_daily"),
     path("stats/votes/monthly/<str:userId>", StatsMonthlyView.as_view(), name="stats_monthly"),
     path("stats/chart", StatsChartView.as_view(), name="stats_chart"),
+
+    path("metrics/neo4j-pool", Neo4jPoolMetricsView.as_view(), name="neo4j_pool_metrics"),
 ]
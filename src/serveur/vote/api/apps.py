@@ -5,3 +5,4 @@ class ApiConfig(AppConfig):
 
     def ready(self):
         import app.schema_extensions
+        import app.neo4j_checks
@@ -0,0 +1,42 @@
+from asgiref.sync import sync_to_async
+from rest_framework.views import APIView
+
+from app.neo4j_config import async_driver_scope
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView dont les handlers sont des coroutines (`async def get`).
+
+    Django détecte une vue dont tous les handlers sont async et l'exécute dans la boucle
+    d'événements sous ASGI. L'authentification, les permissions et le throttling de DRF
+    restent synchrones (vérification du token Firebase) et s'exécutent hors de la boucle ;
+    le handler, lui, attend ses lectures Neo4j sans bloquer le worker, sur le driver
+    asynchrone partagé du serveur ASGI (voir `async_driver_scope`).
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            async with async_driver_scope():
+                response = handler(request, *args, **kwargs)
+                if hasattr(response, "__await__"):
+                    response = await response
+
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
@@ -0,0 +1,115 @@
+"""
+Commande Django de mesure de la latence de `VoteRepository.save_vote` sur un graphe synthétique,
+sans puis avec les contraintes et index Neo4j.
+
+A lancer uniquement sur une base de développement : les index gérés par
+SchemaRepository sont supprimés pendant la première mesure puis recréés.
+"""
+import random
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from app.neo4j_config import get_driver
+from db.repository.schema_repository import SchemaRepository
+from db.repository.vote_repository import VoteRepository
+
+BENCH_PREFIX = "bench-"
+
+
+class Command(BaseCommand):
+    help = "Benchmark vote-save latency on a synthetic graph before and after the Neo4j schema (dev database only)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000, help="Nombre d'utilisateurs synthétiques")
+        parser.add_argument("--domains", type=int, default=5, help="Nombre de domaines")
+        parser.add_argument("--votes", type=int, default=300, help="Nombre de votes mesurés par phase")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        users = options["users"]
+        domains = [f"{BENCH_PREFIX}domain-{i}" for i in range(options["domains"])]
+
+        self.stdout.write(f"Creating synthetic graph: {users} users, {len(domains)} domains...")
+        SchemaRepository.ensure_schema()
+        self._create_graph(users, domains)
+        try:
+            SchemaRepository.drop_schema()
+            before = self._measure(rng, users, domains, options["votes"])
+
+            SchemaRepository.ensure_schema()
+            after = self._measure(rng, users, domains, options["votes"])
+        finally:
+            self._delete_graph()
+            SchemaRepository.ensure_schema()
+
+        self.stdout.write(f"{'':<16}{'mean':>10}{'p50':>10}{'p95':>10}")
+        for label, latencies in (("without schema", before), ("with schema", after)):
+            self.stdout.write(
+                f"{label:<16}"
+                f"{statistics.mean(latencies):>8.2f}ms"
+                f"{statistics.median(latencies):>8.2f}ms"
+                f"{statistics.quantiles(latencies, n=20)[-1]:>8.2f}ms"
+            )
+
+    @staticmethod
+    def _measure(rng: random.Random, users: int, domains: list[str], votes: int) -> list[float]:
+        latencies = []
+        for _ in range(votes):
+            voter, target = rng.sample(range(users), 2)
+            vote = {
+                "id": uuid.uuid4(),
+                "voterId": f"{BENCH_PREFIX}{voter}",
+                "targetUserId": f"{BENCH_PREFIX}{target}",
+                "domain": rng.choice(domains),
+                "createdAt": timezone.now(),
+            }
+            started = time.perf_counter()
+            VoteRepository.save_vote(vote)
+            latencies.append((time.perf_counter() - started) * 1000)
+        return latencies
+
+    @staticmethod
+    def _create_graph(users: int, domains: list[str]):
+        # Un vote courant par utilisateur et par domaine vers l'utilisateur suivant
+        driver = get_driver()
+        with driver.session() as session:
+            session.run(
+                """
+                UNWIND range(0, $users - 1) AS i
+                CREATE (:User {id: $prefix + toString(i), threshold: 100, publishVotes: false})
+                """,
+                users=users,
+                prefix=BENCH_PREFIX,
+            ).consume()
+            for domain in domains:
+                session.run(
+                    """
+                    UNWIND range(0, $users - 1) AS i
+                    MATCH (u:User {id: $prefix + toString(i)})
+                    MATCH (t:User {id: $prefix + toString((i + 1) % $users)})
+                    CREATE (u)-[:VOTED {domain: $domain, processed: true, valid: true,
+                                        current: true, count: 1, cycle: false,
+                                        createdAt: datetime()}]->(t)
+                    """,
+                    users=users,
+                    prefix=BENCH_PREFIX,
+                    domain=domain,
+                ).consume()
+
+    @staticmethod
+    def _delete_graph():
+        driver = get_driver()
+        with driver.session() as session:
+            session.run(
+                """
+                MATCH (u:User)
+                WHERE u.id STARTS WITH $prefix
+                DETACH DELETE u
+                """,
+                prefix=BENCH_PREFIX,
+            ).consume()
@@ -0,0 +1,27 @@
+"""
+Commande Django de contrôle des poids des votes (`count` / `cycle`) maintenus par le recalcul incrémental.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.delegation_graph_service import DelegationGraphService
+
+
+class Command(BaseCommand):
+    help = "Compare stored vote weights with a full in-memory recompute (optionally fix them)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Réécrit les relations dont le poids stocké est incohérent",
+        )
+
+    def handle(self, *args, **options):
+        mismatches = DelegationGraphService.check_counts(fix=options["fix"])
+        for domain, count in sorted(mismatches.items()):
+            self.stdout.write(f"{domain}: {count} inconsistent relationships")
+
+        if mismatches and not options["fix"]:
+            raise CommandError("Stored vote weights are inconsistent, rerun with --fix")
+
+        self.stdout.write(self.style.SUCCESS("Vote weights are consistent" if not mismatches else "Vote weights fixed"))
@@ -0,0 +1,27 @@
+"""
+Commande Django de création et de vérification des contraintes et index Neo4j.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from db.repository.schema_repository import SchemaRepository
+
+
+class Command(BaseCommand):
+    help = "Create (idempotently) and verify the Neo4j constraints and indexes of the vote graph"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Vérifie seulement, sans rien créer",
+        )
+
+    def handle(self, *args, **options):
+        if not options["check"]:
+            SchemaRepository.ensure_schema()
+
+        missing = SchemaRepository.missing_schema()
+        if missing:
+            raise CommandError(f"Missing Neo4j constraints/indexes: {', '.join(missing)}")
+
+        self.stdout.write(self.style.SUCCESS("Neo4j schema is up to date"))
@@ -0,0 +1,78 @@
+"""
+Commande Django de migration des anciennes stats JSON (`User.stats`) vers les nœuds DailyStat.
+"""
+import datetime
+import json
+
+from django.core.management.base import BaseCommand
+
+from db.repository.schema_repository import SchemaRepository
+from db.repository.vote_repository import VoteRepository
+
+
+def stats_blob_to_rows(user_id: str, stats_json: str) -> list[dict]:
+    """
+    Convertit un blob JSON { 'YYYY-MM-DD': { domain: count } } en lignes DailyStat
+    { userId, domain, date, count }. Les entrées illisibles sont ignorées.
+    """
+    try:
+        stats_map = json.loads(stats_json)
+    except Exception:
+        return []
+    if not isinstance(stats_map, dict):
+        return []
+
+    rows = []
+    for date_str, domain_map in stats_map.items():
+        try:
+            datetime.date.fromisoformat(date_str)
+        except Exception:
+            continue
+        if not isinstance(domain_map, dict):
+            continue
+        for domain, value in domain_map.items():
+            try:
+                count = int(value)
+            except Exception:
+                count = 0
+            rows.append({"userId": user_id, "domain": domain, "date": date_str, "count": count})
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Migrate User.stats JSON blobs to DailyStat nodes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Nombre d'utilisateurs migrés par transaction",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        SchemaRepository.ensure_schema()
+
+        users_count = 0
+        rows_count = 0
+        while True:
+            blobs = VoteRepository.fetch_stats_blobs(batch_size)
+            if not blobs:
+                break
+
+            rows = [
+                row
+                for blob in blobs
+                for row in stats_blob_to_rows(blob["userId"], blob["stats"])
+            ]
+            VoteRepository.replace_stats_blobs([blob["userId"] for blob in blobs], rows)
+
+            users_count += len(blobs)
+            rows_count += len(rows)
+            self.stdout.write(f"{users_count} users migrated...")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Users migrated: {users_count}, DailyStat written: {rows_count}"
+        ))
@@ -0,0 +1,26 @@
+from drf_spectacular.utils import extend_schema
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+
+from app.neo4j_config import Neo4jPoolMetrics
+from core.dto.metrics_response_dto import Neo4jPoolMetricsSerializer
+
+
+class Neo4jPoolMetricsView(APIView):
+    """
+    GET /api/metrics/neo4j-pool
+    """
+
+    @extend_schema(
+        tags=["Metrics"],
+        responses={200: Neo4jPoolMetricsSerializer},
+        description=(
+            "Retourne l'état du pool de connexions Neo4j (connexions utilisées / libres) "
+            "et les temps d'attente d'acquisition cumulés depuis le démarrage, en secondes."
+        )
+    )
+    def get(self, _):
+        serializer = Neo4jPoolMetricsSerializer(Neo4jPoolMetrics.snapshot())
+        return Response(serializer.data, status=status.HTTP_200_OK)
@@ -6,16 +6,17 @@ from drf_spectacular.utils import (
     OpenApiTypes,
 )
 
-from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from datetime import datetime
+from django.utils.cache import get_conditional_response, patch_cache_control
 
+from api.async_view import AsyncAPIView
 from core.dto.result_response_dto import VoteResultSerializer
 from core.services.result_service import ResultService
 
 
-class ResultView(APIView):
+class ResultView(AsyncAPIView):
     """
     GET /api/results
     """
@@ -47,13 +48,15 @@ class ResultView(APIView):
         ],
         responses={
             200: VoteResultSerializer(many=True),
+            304: OpenApiResponse(description="Résultats inchangés depuis l'ETag fourni (If-None-Match)"),
             400: OpenApiResponse(description="Paramètres invalides"),
             401: OpenApiResponse(description="Unauthorized"),
         },
         description="Récupère les résultats agrégés des votes avec classement. "
-                    "Paramètres: domain, top, since (YYYY-MM-DD).",
+                    "Paramètres: domain, top, since (YYYY-MM-DD). "
+                    "La réponse porte un ETag qui change à chaque calcul quotidien.",
     )
-    def get(self, request):
+    async def get(self, request):
         """
         Récupère les résultats agrégés des votes.
         """
@@ -95,8 +98,16 @@ class ResultView(APIView):
                     status=status.HTTP_400_BAD_REQUEST,
                 )
 
+        # Requête conditionnelle : résultats inchangés depuis le dernier calcul quotidien
+        etag = await ResultService.aget_results_etag()
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            not_modified["ETag"] = etag
+            patch_cache_control(not_modified, private=True, no_cache=True)
+            return not_modified
+
         # Récupération des résultats
-        results = ResultService.get_vote_results(
+        results = await ResultService.aget_vote_results(
             domain=domain,
             top=top,
             since=since
@@ -105,4 +116,7 @@ class ResultView(APIView):
         # Sérialisation
         serializer = VoteResultSerializer(results, many=True)
         
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = Response(serializer.data, status=status.HTTP_200_OK)
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -9,6 +9,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 
+from api.async_view import AsyncAPIView
 from core.dto.stats_response_dto import StatsDailySerializer, StatsMonthlySerializer, StatsChartSerializer
 from core.services.stats_service import StatsService
 
@@ -74,7 +75,7 @@ class StatsMonthlyView(APIView):
         serializer = StatsMonthlySerializer(payload)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-class StatsChartView(APIView):
+class StatsChartView(AsyncAPIView):
     """
     GET /stats/chart
     Récupère les 10 utilisateurs les plus votés pour chaque domaine, ainsi qu'un histogramme de votes pour chacun d'eux.
@@ -89,7 +90,7 @@ class StatsChartView(APIView):
         responses={200: StatsChartSerializer(many=True), 401: OpenApiResponse(description="Unauthorized")},
         description="Retourne les données des scores des 10 utilisateurs avec le plus de voix par domaine sur les derniers jours."
     )
-    def get(self, request):
+    async def get(self, request):
         current_user_id = getattr(request.user, "id", None)
         if current_user_id is None:
             return Response({"detail": "Unauthorized"}, status=status.HTTP_401_UNAUTHORIZED)
@@ -97,7 +98,7 @@ class StatsChartView(APIView):
         domain = request.query_params.get("domain")
         days = int(request.query_params.get("days", 30))
 
-        chart = StatsService.get_chart(domain=domain, days=days)
+        chart = await StatsService.aget_chart(domain=domain, days=days)
         serializer = StatsChartSerializer(data=chart, many=True)
         serializer.is_valid(raise_exception=False)
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -9,9 +9,11 @@ from rest_framework.response import Response
 from rest_framework import status
 
 from core.dto.vote_request_dto import VoteRequestSerializer
+from api.async_view import AsyncAPIView
+from core.dto.validation_job_response_dto import ValidationJobSerializer
 from core.dto.vote_response_dto import VoteSerializer, ReceivedVotesSerializer
+from core.services.validation_job_service import ValidationJobService
 from core.services.vote_service import VoteService
-from core.services.vote_validation_service import VoteValidationService
 
 
 class VoteView(APIView):
@@ -176,7 +178,7 @@ class VotesByVoterMeView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class VotesForUserView(APIView):
+class VotesForUserView(AsyncAPIView):
     """
     GET /api/votes/for-user/{userId}
     """
@@ -201,10 +203,10 @@ class VotesForUserView(APIView):
         responses={200: ReceivedVotesSerializer},
         description="Retourne les votes reçus par un utilisateur."
     )
-    def get(self, request, userId: str):
+    async def get(self, request, userId: str):
         domain = request.query_params.get("domain")
 
-        received_votes = VoteService.get_received_votes(
+        received_votes = await VoteService.aget_received_votes(
             user_id=str(userId),
             domain=domain,
         )
@@ -213,7 +215,7 @@ class VotesForUserView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class VotesForUserMeView(APIView):
+class VotesForUserMeView(AsyncAPIView):
     """
     GET /api/votes/for-user/me
     """
@@ -232,7 +234,7 @@ class VotesForUserMeView(APIView):
         responses={200: ReceivedVotesSerializer},
         description="Retourne les votes reçus par l'utilisateur authentifié."
     )
-    def get(self, request):
+    async def get(self, request):
         user_id = request.user.id
 
         if user_id is None:
@@ -243,7 +245,7 @@ class VotesForUserMeView(APIView):
 
         domain = request.query_params.get("domain")
 
-        received_votes = VoteService.get_received_votes(
+        received_votes = await VoteService.aget_received_votes(
             user_id=str(user_id),
             domain=domain,
         )
@@ -258,9 +260,47 @@ class VoteValidationView(APIView):
     
     @extend_schema(
         tags=["Votes"],
-        responses={200: OpenApiResponse(description="Validation exécutée")},
-        description="Force l'exécution de la tâche quotidienne de validation des votes."
+        responses={
+            202: ValidationJobSerializer,
+            409: ValidationJobSerializer,
+        },
+        description=(
+            "Lance en arrière-plan la tâche quotidienne de validation des votes et retourne le job créé "
+            "(ou repris s'il avait été interrompu). Retourne 409 avec le job en cours si une validation "
+            "est déjà en cours d'exécution."
+        )
     )
     def get(self, _):
-        VoteValidationService.process_daily_votes()
-        return Response(status=status.HTTP_200_OK)
+        job, started = ValidationJobService.enqueue(trigger="api")
+        if not started:
+            if job is None:
+                return Response(
+                    {"error": "Validation already running"},
+                    status=status.HTTP_409_CONFLICT,
+                )
+            return Response(ValidationJobSerializer(job).data, status=status.HTTP_409_CONFLICT)
+
+        return Response(ValidationJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+
+class VoteValidationJobView(APIView):
+    """
+    GET /api/votes/validate/jobs/{jobId}
+    """
+
+    @extend_schema(
+        tags=["Votes"],
+        responses={
+            200: ValidationJobSerializer,
+            404: OpenApiResponse(description="Job not found"),
+        },
+        description="Retourne l'état d'un job de validation et l'avancement de chacune de ses phases."
+    )
+    def get(self, _, jobId: str):
+        job = ValidationJobService.get_job(jobId)
+        if job is None:
+            return Response(
+                {"error": "Job not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(ValidationJobSerializer(job).data, status=status.HTTP_200_OK)
@@ -13,4 +13,21 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from app.neo4j_config import async_driver_lifespan  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """
+    Application Django, plus le protocole lifespan que Django ne gère pas.
+    """
+    if scope["type"] == "lifespan":
+        await async_driver_lifespan(receive, send)
+    else:
+        await django_application(scope, receive, send)
+
+# Télécharge les certificats de signature de Google avant la première requête qui en a besoin
+from app.token_cache import CertificatePrefetcher  # noqa: E402
+
+CertificatePrefetcher.start()
@@ -1,4 +1,4 @@
-from core.services.vote_validation_service import VoteValidationService
+from core.services.validation_job_service import ValidationJobService
 
 def process_daily_votes():
-    VoteValidationService.process_daily_votes()
\ No newline at end of file
+    ValidationJobService.run(trigger="cron")
\ No newline at end of file
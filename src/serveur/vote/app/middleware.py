@@ -0,0 +1,31 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from app.neo4j_config import unit_of_work
+
+
+class Neo4jUnitOfWorkMiddleware:
+    """
+    Exécute chaque requête dans une unité de travail Neo4j :
+    toutes les méthodes de repository appelées par la vue partagent une seule session.
+
+    Le middleware est aussi asynchrone pour ne pas renvoyer les vues async dans un thread sous ASGI ;
+    les repositories async ouvrent leurs propres sessions sur le driver async.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with unit_of_work():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with unit_of_work():
+            return await self.get_response(request)
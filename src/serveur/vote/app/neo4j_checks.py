@@ -0,0 +1,32 @@
+from django.core.checks import Warning, register
+
+from db.repository.schema_repository import SchemaRepository
+
+
+@register("neo4j", deploy=True)
+def check_neo4j_schema(app_configs, **kwargs):
+    """
+    Vérifie que les contraintes et index Neo4j sont en place.
+
+    Contrôle de déploiement (`manage.py check --deploy`) : les autres commandes
+    (migrate, crontab, test...) n'ouvrent pas de connexion à Neo4j.
+    """
+    try:
+        missing = SchemaRepository.missing_schema()
+    except Exception as exc:
+        return [
+            Warning(
+                f"Impossible de vérifier le schéma Neo4j : {exc}",
+                id="vote.W001",
+            )
+        ]
+
+    if missing:
+        return [
+            Warning(
+                f"Contraintes/index Neo4j manquants : {', '.join(missing)}",
+                hint="Lancer `python manage.py init_neo4j_schema`.",
+                id="vote.W002",
+            )
+        ]
+    return []
@@ -1,11 +1,272 @@
+import asyncio
 import os
-from neo4j import GraphDatabase
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from neo4j import AsyncGraphDatabase, GraphDatabase
 
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "password")
 
-_driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+# Pool de connexions : taille, attente maximale d'une connexion libre (s), durée de vie d'une connexion (s)
+NEO4J_MAX_CONNECTION_POOL_SIZE = int(os.getenv("NEO4J_MAX_CONNECTION_POOL_SIZE", "100"))
+NEO4J_CONNECTION_ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "60"))
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+# Nombre d'enregistrements récupérés par aller-retour
+NEO4J_FETCH_SIZE = int(os.getenv("NEO4J_FETCH_SIZE", "1000"))
+
+_DRIVER_CONFIG = {
+    "auth": (NEO4J_USER, NEO4J_PASSWORD),
+    "max_connection_pool_size": NEO4J_MAX_CONNECTION_POOL_SIZE,
+    "connection_acquisition_timeout": NEO4J_CONNECTION_ACQUISITION_TIMEOUT,
+    "max_connection_lifetime": NEO4J_MAX_CONNECTION_LIFETIME,
+    "fetch_size": NEO4J_FETCH_SIZE,
+}
+
+_driver = GraphDatabase.driver(NEO4J_URI, **_DRIVER_CONFIG)
+
+# Driver asynchrone des vues async : ses connexions sont liées à la boucle d'événements qui l'a ouvert.
+# Sous ASGI, il est ouvert au démarrage du serveur et fermé à son arrêt (lifespan, voir app/asgi.py)
+_async_driver = None
+_async_driver_loop = None
+# Driver temporaire d'une requête servie hors de la boucle du serveur ASGI (WSGI, client de test)
+_request_async_driver: ContextVar = ContextVar("neo4j_request_async_driver", default=None)
+
+# Session partagée par l'unité de travail en cours (une requête HTTP), None hors unité de travail
+_unit_of_work: ContextVar["_UnitOfWork | None"] = ContextVar("neo4j_unit_of_work", default=None)
+
+
+class _UnitOfWork:
+    """
+    Session Neo4j ouverte à la première utilisation puis partagée jusqu'à la fin de l'unité de travail.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.session = None
+
+    def get_session(self):
+        if self.session is None:
+            self.session = self.driver.session()
+        return self.session
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+
+class _SharedSession:
+    """
+    Contexte `with driver.session() as session` qui rend la session de l'unité de travail sans la fermer.
+    """
+
+    def __init__(self, session):
+        self._session = session
+
+    def __enter__(self):
+        return self._session
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class _UnitOfWorkDriver:
+    """
+    Driver retourné par `get_driver()` pendant une unité de travail : les repositories
+    gardent `with driver.session() as session` mais réutilisent tous la même session.
+    Une session demandée avec une configuration particulière reste indépendante.
+    """
+
+    def __init__(self, unit_of_work: _UnitOfWork):
+        self._unit_of_work = unit_of_work
+
+    def session(self, **config):
+        if config:
+            return self._unit_of_work.driver.session(**config)
+        return _SharedSession(self._unit_of_work.get_session())
+
+    def __getattr__(self, name):
+        return getattr(self._unit_of_work.driver, name)
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Exécute toutes les requêtes Neo4j du bloc dans une seule session (ouverte seulement si besoin).
+    Les unités de travail imbriquées réutilisent la session de l'unité englobante.
+    """
+    if _unit_of_work.get() is not None:
+        yield
+        return
+
+    current = _UnitOfWork(_driver)
+    token = _unit_of_work.set(current)
+    try:
+        yield
+    finally:
+        _unit_of_work.reset(token)
+        current.close()
+
 
 def get_driver():
-    return _driver
\ No newline at end of file
+    current = _unit_of_work.get()
+    if current is not None:
+        return _UnitOfWorkDriver(current)
+    return _driver
+
+
+def open_async_driver():
+    """
+    Ouvre le driver asynchrone partagé sur la boucle courante (démarrage du serveur ASGI).
+    """
+    global _async_driver, _async_driver_loop
+    if _async_driver is None:
+        _async_driver = AsyncGraphDatabase.driver(NEO4J_URI, **_DRIVER_CONFIG)
+        _async_driver_loop = asyncio.get_running_loop()
+    return _async_driver
+
+
+async def close_async_driver():
+    """
+    Ferme le driver asynchrone partagé et ses connexions (arrêt du serveur ASGI).
+    """
+    global _async_driver, _async_driver_loop
+    driver, _async_driver, _async_driver_loop = _async_driver, None, None
+    if driver is not None:
+        await driver.close()
+
+
+async def async_driver_lifespan(receive, send):
+    """
+    Protocole lifespan ASGI : le driver asynchrone partagé est ouvert au démarrage du serveur
+    et fermé, avec ses connexions, à son arrêt.
+    """
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            open_async_driver()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await close_async_driver()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+def _shared_async_driver():
+    if _async_driver is not None and _async_driver_loop is asyncio.get_running_loop():
+        return _async_driver
+    return None
+
+
+@asynccontextmanager
+async def async_driver_scope():
+    """
+    Garantit un driver asynchrone pendant le bloc (une requête d'une vue async).
+
+    Sous ASGI, le driver partagé est utilisé tel quel. Hors de la boucle du serveur
+    (WSGI, où Django exécute chaque vue async dans une nouvelle boucle, ou client de test),
+    un driver est ouvert pour le bloc puis fermé à sa sortie : aucune connexion ne survit
+    à la boucle qui l'a créée.
+    """
+    if _shared_async_driver() is not None or _request_async_driver.get() is not None:
+        yield
+        return
+
+    driver = AsyncGraphDatabase.driver(NEO4J_URI, **_DRIVER_CONFIG)
+    token = _request_async_driver.set(driver)
+    try:
+        yield
+    finally:
+        _request_async_driver.reset(token)
+        await driver.close()
+
+
+def get_async_driver():
+    driver = _shared_async_driver() or _request_async_driver.get()
+    if driver is None:
+        raise RuntimeError("Aucun driver Neo4j asynchrone ouvert : utiliser async_driver_scope()")
+    return driver
+
+
+class Neo4jPoolMetrics:
+    """
+    Métriques du pool de connexions du driver : connexions utilisées / libres
+    et temps d'attente pour obtenir une connexion.
+
+    Le driver n'expose pas ces valeurs publiquement : elles sont lues sur son pool interne
+    (neo4j 6.x), et restent à zéro si sa structure change.
+    """
+
+    _lock = threading.Lock()
+    acquisitions = 0
+    wait_total = 0.0
+    wait_max = 0.0
+    errors = 0
+
+    @staticmethod
+    def instrument(driver) -> None:
+        """
+        Chronomètre chaque acquisition de connexion du pool de `driver`.
+        """
+        pool = getattr(driver, "_pool", None)
+        acquire = getattr(pool, "acquire", None)
+        if acquire is None or getattr(acquire, "_timed", False):
+            return
+
+        def timed_acquire(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return acquire(*args, **kwargs)
+            except Exception:
+                with Neo4jPoolMetrics._lock:
+                    Neo4jPoolMetrics.errors += 1
+                raise
+            finally:
+                Neo4jPoolMetrics._record(time.perf_counter() - started)
+
+        timed_acquire._timed = True
+        pool.acquire = timed_acquire
+
+    @staticmethod
+    def _record(wait: float) -> None:
+        with Neo4jPoolMetrics._lock:
+            Neo4jPoolMetrics.acquisitions += 1
+            Neo4jPoolMetrics.wait_total += wait
+            Neo4jPoolMetrics.wait_max = max(Neo4jPoolMetrics.wait_max, wait)
+
+    @staticmethod
+    def snapshot(driver=None) -> dict:
+        """
+        Retourne l'état courant du pool et les temps d'attente cumulés depuis le démarrage.
+        """
+        pool = getattr(driver or _driver, "_pool", None)
+        in_use = idle = 0
+        for connections in list(getattr(pool, "connections", {}).values()):
+            for connection in list(connections):
+                if getattr(connection, "in_use", False):
+                    in_use += 1
+                else:
+                    idle += 1
+
+        with Neo4jPoolMetrics._lock:
+            acquisitions = Neo4jPoolMetrics.acquisitions
+            wait_total = Neo4jPoolMetrics.wait_total
+            wait_max = Neo4jPoolMetrics.wait_max
+            errors = Neo4jPoolMetrics.errors
+
+        return {
+            "maxSize": NEO4J_MAX_CONNECTION_POOL_SIZE,
+            "inUse": in_use,
+            "idle": idle,
+            "acquisitions": acquisitions,
+            "acquisitionErrors": errors,
+            "waitTimeTotal": wait_total,
+            "waitTimeAvg": wait_total / acquisitions if acquisitions else 0.0,
+            "waitTimeMax": wait_max,
+        }
+
+
+Neo4jPoolMetrics.instrument(_driver)
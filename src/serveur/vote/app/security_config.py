@@ -1,14 +1,11 @@
 from typing import Optional, Tuple
-from django.conf import settings
 from rest_framework.authentication import BaseAuthentication
 from rest_framework import exceptions
 
-import firebase_admin
-from firebase_admin import auth as firebase_auth
-from firebase_admin import credentials
-
 from drf_spectacular.extensions import OpenApiAuthenticationExtension
 
+from app.token_cache import TokenCache
+
 class FirebaseUser:
     """Minimal user object holding only the Firebase UID."""
     
@@ -36,12 +33,8 @@ class FirebaseAuthentication(BaseAuthentication):
         if scheme.lower() != 'bearer':
             return None
 
-        if not firebase_admin._apps:
-            cred = credentials.Certificate(settings.FIREBASE_SERVICE_ACCOUNT_KEY)
-            firebase_admin.initialize_app(cred)
-
         try:
-            decoded = firebase_auth.verify_id_token(token)
+            decoded = TokenCache.verify(token)
         except Exception:
             raise exceptions.AuthenticationFailed("Invalid or expired Firebase token")
 
@@ -54,6 +54,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'app.middleware.Neo4jUnitOfWorkMiddleware',
 ]
 
 ROOT_URLCONF = 'app.urls'
@@ -97,6 +98,29 @@ DATABASES = {
 }
 
 
+# Cache
+# Cache `votes` : visibilité des votes (VoteCache). Le job quotidien (cron, autre processus)
+# invalide ce cache : il doit être partagé entre les workers et le cron, donc il n'est actif
+# que si VOTE_CACHE_REDIS_URL est défini. Sans Redis, il est désactivé (DummyCache) :
+# un cache local à chaque processus servirait des données périmées jusqu'à VOTE_CACHE_TIMEOUT.
+VOTE_CACHE_ALIAS = 'votes'
+VOTE_CACHE_REDIS_URL = os.getenv('VOTE_CACHE_REDIS_URL', '')
+VOTE_CACHE_TIMEOUT = int(os.getenv('VOTE_CACHE_TIMEOUT', '300'))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    VOTE_CACHE_ALIAS: {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': VOTE_CACHE_REDIS_URL,
+        'TIMEOUT': VOTE_CACHE_TIMEOUT,
+    } if VOTE_CACHE_REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -142,6 +166,27 @@ CRONJOBS = [
     ('0 1 * * *', 'app.cron.process_daily_votes'),
 ]
 
+# Moteur de recalcul des poids des votes : 'gds' (Neo4j GDS) ou 'memory' (calcul en Python)
+VOTE_RECALCULATION_ENGINE = os.getenv('VOTE_RECALCULATION_ENGINE', 'gds')
+# Recalcul 'full' (tous les domaines, par défaut) ou 'incremental' (en aval des votes modifiés, sur option) ;
+# en mode incrémental, un recalcul complet de contrôle est fait chaque semaine ce jour-là (0 = lundi, -1 = jamais)
+VOTE_RECALCULATION_MODE = os.getenv('VOTE_RECALCULATION_MODE', 'full')
+VOTE_FULL_RECALCULATION_WEEKDAY = int(os.getenv('VOTE_FULL_RECALCULATION_WEEKDAY', '6'))
+
+# Validation quotidienne des votes : 'sequential' (vote par vote) ou 'batch' (par lots en mémoire)
+VOTE_VALIDATION_MODE = os.getenv('VOTE_VALIDATION_MODE', 'sequential')
+VOTE_VALIDATION_BATCH_SIZE = int(os.getenv('VOTE_VALIDATION_BATCH_SIZE', '1000'))
+# Durée (en secondes) du verrou de validation sans renouvellement avant qu'un autre run puisse reprendre le job
+VOTE_VALIDATION_LOCK_TTL = int(os.getenv('VOTE_VALIDATION_LOCK_TTL', '300'))
+
+# Classements de /stats/chart matérialisés chaque nuit : fenêtres (en jours) et taille du top
+STATS_CHART_WINDOWS = [int(days) for days in os.getenv('STATS_CHART_WINDOWS', '7,30').split(',')]
+STATS_CHART_TOP = int(os.getenv('STATS_CHART_TOP', '10'))
+
+# Résultats de /results matérialisés chaque nuit : nombre de candidats conservés par domaine
+# (une requête avec un `top` plus grand ou un filtre `since` est calculée à la volée)
+RESULT_SNAPSHOT_TOP = int(os.getenv('RESULT_SNAPSHOT_TOP', '1000'))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Vote API",
     "DESCRIPTION": "API du serveur de vote",
@@ -192,6 +237,10 @@ CORS_ALLOW_HEADERS = [
 
 # Firebase Configuration
 FIREBASE_SERVICE_ACCOUNT_KEY = os.getenv('FIREBASE_SERVICE_ACCOUNT_KEY', None)
+# Tokens vérifiés mis en cache (en secondes, jamais au-delà de leur expiration)
+FIREBASE_TOKEN_CACHE_TTL = int(os.getenv('FIREBASE_TOKEN_CACHE_TTL', '300'))
+# Intervalle (en secondes) entre deux téléchargements des certificats de signature de Google
+FIREBASE_CERTS_REFRESH_INTERVAL = int(os.getenv('FIREBASE_CERTS_REFRESH_INTERVAL', '3600'))
 
 # Security Settings
 SECURE_SSL_REDIRECT = os.getenv('SECURE_SSL_REDIRECT', 'False') == 'True'
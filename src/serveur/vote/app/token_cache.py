@@ -0,0 +1,86 @@
+import hashlib
+import logging
+import threading
+import time
+
+import firebase_admin
+from django.conf import settings
+from django.core.cache import cache
+from firebase_admin import _token_gen
+from firebase_admin import auth as firebase_auth
+from firebase_admin import credentials
+
+logger = logging.getLogger(__name__)
+
+
+def initialize_firebase() -> None:
+    if not firebase_admin._apps:
+        cred = credentials.Certificate(settings.FIREBASE_SERVICE_ACCOUNT_KEY)
+        firebase_admin.initialize_app(cred)
+
+
+class TokenCache:
+    """
+    Cache court des tokens Firebase vérifiés : les claims décodés sont indexés par un hash du token
+    et conservés `FIREBASE_TOKEN_CACHE_TTL` secondes, sans jamais dépasser l'expiration (`exp`) du token.
+    """
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return f"firebase_token:{hashlib.sha256(token.encode()).hexdigest()}"
+
+    @staticmethod
+    def verify(token: str) -> dict:
+        """
+        Retourne les claims du token, vérifié auprès de Firebase seulement s'il n'est pas en cache.
+        Lève les exceptions de `verify_id_token` si le token est invalide ou expiré.
+        """
+        key = TokenCache._key(token)
+        claims = cache.get(key)
+        if claims is not None and claims.get("exp", 0) > time.time():
+            return claims
+
+        initialize_firebase()
+        claims = firebase_auth.verify_id_token(token)
+        ttl = min(settings.FIREBASE_TOKEN_CACHE_TTL, int(claims.get("exp", 0) - time.time()))
+        if ttl > 0:
+            cache.set(key, claims, ttl)
+        return claims
+
+
+class CertificatePrefetcher:
+    """
+    Garde les certificats de signature de Google dans le cache HTTP du SDK Firebase :
+    téléchargés au démarrage puis toutes les `FIREBASE_CERTS_REFRESH_INTERVAL` secondes
+    (moins que leur max-age d'environ 6 h), aucune requête ne paie leur téléchargement.
+    """
+
+    _thread = None
+
+    @staticmethod
+    def start() -> None:
+        if CertificatePrefetcher._thread is not None:
+            return
+        CertificatePrefetcher._thread = threading.Thread(
+            target=CertificatePrefetcher._run, name="firebase-certs-prefetch", daemon=True
+        )
+        CertificatePrefetcher._thread.start()
+
+    @staticmethod
+    def fetch() -> None:
+        """
+        Télécharge les certificats via la session HTTP avec cache du SDK, en ignorant ce cache.
+        """
+        initialize_firebase()
+        # La session du SDK est portée par le vérificateur de tokens du client auth
+        request = firebase_auth._get_client(firebase_admin.get_app())._token_verifier.request
+        request(_token_gen.ID_TOKEN_CERT_URI, headers={"cache-control": "no-cache"})
+
+    @staticmethod
+    def _run() -> None:
+        while True:
+            try:
+                CertificatePrefetcher.fetch()
+            except Exception:
+                logger.warning("Préchargement des certificats Firebase impossible", exc_info=True)
+            time.sleep(settings.FIREBASE_CERTS_REFRESH_INTERVAL)
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'vote.settings')
 
 application = get_wsgi_application()
+
+# Télécharge les certificats de signature de Google avant la première requête qui en a besoin
+from app.token_cache import CertificatePrefetcher  # noqa: E402
+
+CertificatePrefetcher.start()
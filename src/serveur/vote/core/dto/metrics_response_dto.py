@@ -0,0 +1,12 @@
+from rest_framework import serializers
+
+
+class Neo4jPoolMetricsSerializer(serializers.Serializer):
+    maxSize = serializers.IntegerField()
+    inUse = serializers.IntegerField()
+    idle = serializers.IntegerField()
+    acquisitions = serializers.IntegerField()
+    acquisitionErrors = serializers.IntegerField()
+    waitTimeTotal = serializers.FloatField()
+    waitTimeAvg = serializers.FloatField()
+    waitTimeMax = serializers.FloatField()
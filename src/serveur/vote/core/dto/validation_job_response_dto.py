@@ -0,0 +1,21 @@
+from rest_framework import serializers
+
+
+class ValidationJobPhaseSerializer(serializers.Serializer):
+    name = serializers.CharField()
+    status = serializers.CharField()
+    done = serializers.IntegerField(allow_null=True)
+    total = serializers.IntegerField(allow_null=True)
+    duration = serializers.FloatField(allow_null=True)
+
+class ValidationJobSerializer(serializers.Serializer):
+    jobId = serializers.CharField()
+    trigger = serializers.CharField()
+    status = serializers.CharField()
+    currentPhase = serializers.CharField(allow_null=True)
+    voteCount = serializers.IntegerField(allow_null=True)
+    createdAt = serializers.DateTimeField()
+    startedAt = serializers.DateTimeField(allow_null=True)
+    finishedAt = serializers.DateTimeField(allow_null=True)
+    error = serializers.CharField(allow_null=True)
+    phases = ValidationJobPhaseSerializer(many=True)
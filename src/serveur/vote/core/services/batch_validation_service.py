@@ -0,0 +1,198 @@
+import time
+from typing import Callable
+
+from db.repository.vote_repository import VoteRepository
+
+
+class DomainDelegationState:
+    """
+    Copie locale des relations VOTED current=true d'un domaine.
+
+    Reproduit en mémoire `VoteRepository._check_vote_validity` et `VoteRepository._update_counts`,
+    de sorte que les votes d'un même run voient les poids mis à jour par les votes validés avant eux.
+    """
+
+    def __init__(self, rows: list[dict]):
+        self.edges: dict[str, dict] = {}
+        self.out_edges: dict[str, list[str]] = {}
+        self.in_edges: dict[str, list[str]] = {}
+        self.thresholds: dict[str, int] = {}
+        self.touched: set[str] = set()
+
+        for row in rows:
+            self.thresholds[row["sourceId"]] = row["sourceThreshold"]
+            self.thresholds[row["targetId"]] = row["targetThreshold"]
+            self._add_edge(row["relId"], row["sourceId"], row["targetId"], row["count"], row["cycle"])
+
+    def _add_edge(self, rel_id: str, source_id: str, target_id: str, count, cycle):
+        self.edges[rel_id] = {"sourceId": source_id, "targetId": target_id, "count": count, "cycle": cycle}
+        self.out_edges.setdefault(source_id, []).append(rel_id)
+        self.in_edges.setdefault(target_id, []).append(rel_id)
+
+    def incoming(self, node_id: str) -> int:
+        # Somme des counts entrants non cycliques (cycle = false)
+        return sum(
+            self.edges[rel_id]["count"] or 0
+            for rel_id in self.in_edges.get(node_id, ())
+            if self.edges[rel_id]["cycle"] is False
+        )
+
+    def chain(self, start_id: str) -> tuple[list[str], list[str]]:
+        """
+        Plus long chemin de votes depuis `start_id` sans réutiliser une relation.
+        Chaque votant n'ayant qu'un vote courant par domaine, on suit l'unique relation sortante.
+        """
+        nodes = [start_id]
+        rels: list[str] = []
+        used: set[str] = set()
+        node_id = start_id
+        while True:
+            rel_id = next((r for r in self.out_edges.get(node_id, ()) if r not in used), None)
+            if rel_id is None:
+                return nodes, rels
+            used.add(rel_id)
+            rels.append(rel_id)
+            node_id = self.edges[rel_id]["targetId"]
+            nodes.append(node_id)
+
+    def check(self, voter_id: str, target_id: str) -> tuple[int, list[str] | None, bool]:
+        """
+        Même contrat que `VoteRepository.check_vote_validity`.
+        """
+        if voter_id == target_id:
+            return 0, [], True
+
+        nodes, rels = self.chain(target_id)
+
+        # Si le dernier rel est une self-loop, on l’enlève
+        if rels and self.edges[rels[-1]]["sourceId"] == self.edges[rels[-1]]["targetId"]:
+            rels.pop()
+            nodes.pop()
+
+        incoming = self.incoming(voter_id)
+        violated = False
+        cycle = nodes[-1] == voter_id
+
+        if cycle:
+            for node_id in nodes:
+                threshold = self.thresholds[node_id]
+                if threshold != -1 and incoming >= threshold:
+                    violated = True
+                    break
+
+        else:
+            for rel_id in rels:
+                rel = self.edges[rel_id]
+                threshold = self.thresholds[rel["sourceId"]]
+                incoming_sum = (rel["count"] or 0) + incoming
+                if rel["cycle"]:
+                    incoming_sum += 1
+                if threshold != -1 and incoming_sum > threshold:
+                    violated = True
+                    break
+
+            if not violated:
+                last_node_threshold = self.thresholds[nodes[-1]]
+                if not (last_node_threshold == -1 or (rels and self.edges[rels[-1]]["cycle"])):
+                    if self.incoming(nodes[-1]) + incoming > last_node_threshold:
+                        violated = True
+
+        if violated:
+            return -1, None, cycle
+
+        return incoming + 1, rels, cycle
+
+    def apply(self, vote: dict, count: int, rel_ids: list[str], cycle: bool):
+        """
+        Ajoute le vote validé à l'état local puis met à jour les poids du chemin,
+        comme `VoteRepository.mark_vote_valid` suivi de `VoteRepository.update_counts`.
+        """
+        self._add_edge(vote["relId"], vote["voterId"], vote["targetId"], count, cycle)
+        self.touched.add(vote["relId"])
+
+        for rel_id in rel_ids:
+            rel = self.edges[rel_id]
+            if cycle:
+                rel["count"] = count
+                rel["cycle"] = True
+            elif rel["count"] is not None:
+                rel["count"] += count
+            self.touched.add(rel_id)
+
+    def flush_rows(self) -> list[dict]:
+        """
+        Retourne les relations modifiées depuis le dernier appel sous forme de lignes { relId, count, cycle }.
+        """
+        rows = [
+            {"relId": rel_id, "count": self.edges[rel_id]["count"], "cycle": self.edges[rel_id]["cycle"]}
+            for rel_id in self.touched
+        ]
+        self.touched = set()
+        return rows
+
+
+class BatchValidationService:
+    @staticmethod
+    def validate_votes(
+        vote_ids: list[str],
+        batch_size: int = 1000,
+        on_batch: Callable[[int, list[str]], None] | None = None,
+    ) -> tuple[list[str], dict]:
+        """
+        Valide une liste de votes, dans l'ordre donné, par lots de `batch_size`.
+
+        Pour chaque lot : une lecture des votes, une lecture de l'état de chaque nouveau domaine,
+        la validation en mémoire, puis une seule transaction d'écriture (marquage + poids).
+
+        :param vote_ids: elementId() des relations VOTED à valider
+        :param batch_size: nombre de votes par lot
+        :param on_batch: appelé après l'écriture de chaque lot avec (taille du lot, votes rejetés du lot)
+        :return: (liste des votes invalidés, durées cumulées en secondes par phase)
+        """
+        states: dict[str, DomainDelegationState] = {}
+        rejected: list[str] = []
+        timings = {"load": 0.0, "validate": 0.0, "write": 0.0}
+
+        for start in range(0, len(vote_ids), batch_size):
+            chunk = vote_ids[start:start + batch_size]
+
+            started = time.perf_counter()
+            votes = {vote["relId"]: vote for vote in VoteRepository.fetch_votes_by_ids(chunk)}
+            for domain in {vote["domain"] for vote in votes.values()} - states.keys():
+                states[domain] = DomainDelegationState(VoteRepository.fetch_domain_state(domain))
+            timings["load"] += time.perf_counter() - started
+
+            started = time.perf_counter()
+            valid_ids: list[str] = []
+            chunk_rejected: list[str] = []
+            for vote_id in chunk:
+                vote = votes.get(vote_id)
+                if vote is None:
+                    # Relation supprimée depuis la récupération des votes non traités
+                    continue
+
+                state = states[vote["domain"]]
+                state.thresholds.setdefault(vote["voterId"], vote["voterThreshold"])
+                state.thresholds.setdefault(vote["targetId"], vote["targetThreshold"])
+
+                (count, rel_ids, cycle) = state.check(vote["voterId"], vote["targetId"])
+                if count == -1:
+                    chunk_rejected.append(vote_id)
+                    continue
+
+                state.apply(vote, count, rel_ids, cycle)
+                valid_ids.append(vote_id)
+
+            rows = [row for state in states.values() for row in state.flush_rows()]
+            timings["validate"] += time.perf_counter() - started
+
+            started = time.perf_counter()
+            if valid_ids:
+                VoteRepository.save_validation_batch(valid_ids, rows)
+            timings["write"] += time.perf_counter() - started
+
+            rejected.extend(chunk_rejected)
+            if on_batch is not None:
+                on_batch(len(chunk), chunk_rejected)
+
+        return rejected, timings
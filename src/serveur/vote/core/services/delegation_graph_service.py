@@ -0,0 +1,289 @@
+from db.repository.vote_repository import VoteRepository
+
+
+class DelegationGraphService:
+    """
+    Moteur en mémoire du recalcul des poids des votes.
+
+    Équivalent du recalcul GDS de `VoteRepository.recalculate_counts_by_domain` :
+    pour chaque domaine, les relations VOTED current=true sont lues en une requête,
+    les SCC, le tri topologique et les poids des cycles sont calculés en Python,
+    puis tous les `count` / `cycle` sont réécrits en un seul UNWIND.
+
+    En mode incrémental, seuls les domaines ayant des relations marquées `dirty`
+    sont recalculés, et seulement en aval des votants concernés.
+    """
+
+    @staticmethod
+    def recalculate_counts_by_domain() -> None:
+        """
+        Recalcule les poids de toutes les relations VOTED current=true, domaine par domaine.
+        """
+        for domain in VoteRepository.get_all_domains():
+            edges = VoteRepository.fetch_current_edges_by_domain(domain)
+            VoteRepository.write_counts(DelegationGraphService.compute_counts(edges))
+
+    @staticmethod
+    def recalculate_dirty_domains() -> int:
+        """
+        Recalcul incrémental : pour chaque domaine ayant des relations VOTED marquées `dirty`
+        (vote désactivé, self-loop validée), recalcule les SCC et les poids du seul sous-graphe
+        en aval des votants concernés, écrit les relations dont la valeur change puis retire les marques.
+
+        :return: nombre de relations réécrites
+        """
+        written = 0
+        for domain, seeds in VoteRepository.fetch_dirty_seeds().items():
+            edges = VoteRepository.fetch_current_edges_by_domain(domain)
+            rows = DelegationGraphService.compute_affected_counts(edges, seeds)
+            VoteRepository.write_counts(rows)
+            VoteRepository.clear_dirty_votes(domain)
+            written += len(rows)
+        return written
+
+    @staticmethod
+    def check_counts(fix: bool = False) -> dict[str, int]:
+        """
+        Contrôle de cohérence : recalcule en mémoire tous les poids de chaque domaine
+        et les compare aux valeurs stockées.
+
+        :param fix: réécrire les relations incohérentes
+        :return: nombre de relations incohérentes par domaine (domaines cohérents omis)
+        """
+        mismatches: dict[str, int] = {}
+        for domain in VoteRepository.get_all_domains():
+            edges = VoteRepository.fetch_current_edges_by_domain(domain)
+            stored = {edge["relId"]: (edge["count"], edge["cycle"]) for edge in edges}
+            rows = [
+                row for row in DelegationGraphService.compute_counts(edges)
+                if stored[row["relId"]] != (row["count"], row["cycle"])
+            ]
+            if rows:
+                mismatches[domain] = len(rows)
+                if fix:
+                    VoteRepository.write_counts(rows)
+        return mismatches
+
+    @staticmethod
+    def compute_affected_counts(edges: list[dict], seeds: set[str]) -> list[dict]:
+        """
+        Recalcule les relations dont le poids peut dépendre de `seeds`.
+
+        Le poids d'une relation ne dépend que des relations en amont : seuls les nœuds atteignables
+        depuis `seeds` sont concernés. Les relations entrantes venant du reste du graphe gardent
+        leur valeur stockée et sont prises en compte comme poids externes.
+
+        :param edges: toutes les relations current=true du domaine { relId, sourceId, targetId, count, cycle }
+        :param seeds: elementId() des nœuds dont une relation sortante a changé (ancienne cible comprise)
+        :return: liste de dict { relId, count, cycle } des seules relations dont la valeur change
+        """
+        out_edges: dict[str, list[dict]] = {}
+        for edge in edges:
+            out_edges.setdefault(edge["sourceId"], []).append(edge)
+
+        affected = set(seeds)
+        stack = list(seeds)
+        while stack:
+            for edge in out_edges.get(stack.pop(), ()):
+                if edge["targetId"] not in affected:
+                    affected.add(edge["targetId"])
+                    stack.append(edge["targetId"])
+
+        sub_edges = [edge for edge in edges if edge["sourceId"] in affected]
+        external: dict[str, int | None] = {}
+        for edge in edges:
+            if edge["sourceId"] in affected or edge["targetId"] not in affected or edge["cycle"]:
+                continue
+            if edge["count"] is None or external.get(edge["targetId"], 0) is None:
+                # Relation non propagée (en aval d'un cycle) : le nœud ne l'est pas non plus
+                external[edge["targetId"]] = None
+            else:
+                external[edge["targetId"]] = external.get(edge["targetId"], 0) + edge["count"]
+
+        stored = {edge["relId"]: (edge["count"], edge["cycle"]) for edge in sub_edges}
+        return [
+            row for row in DelegationGraphService.compute_counts(sub_edges, external)
+            if stored[row["relId"]] != (row["count"], row["cycle"])
+        ]
+
+    @staticmethod
+    def compute_counts(edges: list[dict], external: dict | None = None) -> list[dict]:
+        """
+        Calcule `count` et `cycle` pour chaque relation d'un domaine.
+
+        Règles (identiques au moteur GDS) :
+        - une relation est cyclique si ses deux extrémités sont dans la même SCC (self-loop compris) ;
+        - hors cycle, selon l'ordre topologique, count = 1 + somme des counts entrants non cycliques ;
+          les nœuds dans un cycle ou atteignables depuis un cycle ne sont pas propagés ;
+        - dans une SCC de taille > 1, toutes les relations internes valent
+          taille de la SCC + somme des counts entrants depuis l'extérieur.
+
+        :param edges: liste de dict { relId, sourceId, targetId }
+        :param external: poids entrants venant de relations hors de `edges`, par nœud ;
+                         None si l'une d'elles n'est pas propagée (nœud en aval d'un cycle)
+        :return: liste de dict { relId, count, cycle } dans le même ordre que `edges`
+        """
+        # Adjacence indexée par entiers (format CSR)
+        index: dict = {}
+        src: list[int] = []
+        dst: list[int] = []
+        for edge in edges:
+            src.append(index.setdefault(edge["sourceId"], len(index)))
+            dst.append(index.setdefault(edge["targetId"], len(index)))
+
+        n = len(index)
+        m = len(edges)
+        ext_in = [0] * n
+        blocked: list[int] = []
+        for node_id, weight in (external or {}).items():
+            if node_id not in index:
+                continue
+            if weight is None:
+                blocked.append(index[node_id])
+            else:
+                ext_in[index[node_id]] = weight
+        out_start, out_edges = DelegationGraphService._build_csr(src, n)
+        in_start, in_edges = DelegationGraphService._build_csr(dst, n)
+
+        comp, comp_sizes = DelegationGraphService._strongly_connected_components(
+            n, out_start, out_edges, dst
+        )
+        cycle = [comp[src[e]] == comp[dst[e]] for e in range(m)]
+        count: list[int | None] = [None] * m
+
+        # Propagation des poids hors cycle selon l'ordre topologique (Kahn)
+        for node in DelegationGraphService._topological_order(n, out_start, out_edges, dst, blocked):
+            incoming = ext_in[node]
+            for i in range(in_start[node], in_start[node + 1]):
+                e = in_edges[i]
+                if not cycle[e]:
+                    incoming += count[e] or 0
+            for i in range(out_start[node], out_start[node + 1]):
+                e = out_edges[i]
+                if not cycle[e]:
+                    count[e] = 1 + incoming
+
+        # Valeur des cycles : taille de la composante + poids entrants depuis l'extérieur
+        ext_sums = [0] * len(comp_sizes)
+        for v in range(n):
+            ext_sums[comp[v]] += ext_in[v]
+        for e in range(m):
+            if not cycle[e]:
+                ext_sums[comp[dst[e]]] += count[e] or 0
+
+        for e in range(m):
+            c = comp[src[e]]
+            if cycle[e] and comp_sizes[c] > 1:
+                count[e] = comp_sizes[c] + ext_sums[c]
+
+        return [
+            {"relId": edges[e]["relId"], "count": count[e], "cycle": cycle[e]}
+            for e in range(m)
+        ]
+
+    @staticmethod
+    def _build_csr(endpoints: list[int], n: int) -> tuple[list[int], list[int]]:
+        """
+        Construit une adjacence compacte : les relations du nœud v sont
+        edges[start[v]:start[v + 1]].
+        """
+        start = [0] * (n + 1)
+        for v in endpoints:
+            start[v + 1] += 1
+        for v in range(n):
+            start[v + 1] += start[v]
+
+        edges = [0] * len(endpoints)
+        cursor = start[:-1]
+        for e, v in enumerate(endpoints):
+            edges[cursor[v]] = e
+            cursor[v] += 1
+        return start, edges
+
+    @staticmethod
+    def _strongly_connected_components(
+        n: int, out_start: list[int], out_edges: list[int], dst: list[int]
+    ) -> tuple[list[int], list[int]]:
+        """
+        Algorithme de Tarjan itératif.
+        Retourne (composante de chaque nœud, taille de chaque composante).
+        """
+        comp = [-1] * n
+        order = [-1] * n
+        low = [0] * n
+        on_stack = [False] * n
+        stack: list[int] = []
+        sizes: list[int] = []
+        counter = 0
+
+        for root in range(n):
+            if order[root] != -1:
+                continue
+
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = True
+            work = [[root, out_start[root]]]
+
+            while work:
+                frame = work[-1]
+                v, i = frame
+                if i < out_start[v + 1]:
+                    frame[1] = i + 1
+                    w = dst[out_edges[i]]
+                    if order[w] == -1:
+                        order[w] = low[w] = counter
+                        counter += 1
+                        stack.append(w)
+                        on_stack[w] = True
+                        work.append([w, out_start[w]])
+                    elif on_stack[w] and order[w] < low[v]:
+                        low[v] = order[w]
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+
+                if low[v] == order[v]:
+                    size = 0
+                    while True:
+                        w = stack.pop()
+                        on_stack[w] = False
+                        comp[w] = len(sizes)
+                        size += 1
+                        if w == v:
+                            break
+                    sizes.append(size)
+
+        return comp, sizes
+
+    @staticmethod
+    def _topological_order(
+        n: int, out_start: list[int], out_edges: list[int], dst: list[int], blocked: list[int] = ()
+    ) -> list[int]:
+        """
+        Tri topologique de Kahn. Comme `gds.dag.topologicalSort`, les nœuds
+        d'un cycle (self-loop compris) et ceux atteignables depuis un cycle sont exclus,
+        ainsi que les nœuds `blocked` et ceux atteignables depuis eux.
+        """
+        in_degree = [0] * n
+        for e in out_edges:
+            in_degree[dst[e]] += 1
+        for v in blocked:
+            in_degree[v] += 1
+
+        order = [v for v in range(n) if in_degree[v] == 0]
+        head = 0
+        while head < len(order):
+            v = order[head]
+            head += 1
+            for i in range(out_start[v], out_start[v + 1]):
+                w = dst[out_edges[i]]
+                in_degree[w] -= 1
+                if in_degree[w] == 0:
+                    order.append(w)
+        return order
@@ -1,3 +1,4 @@
+from core.services.vote_cache import VoteCache
 from db.repository.publication_repository import PublicationRepository
 
 
@@ -16,4 +17,6 @@ class PublicationService:
         Met à jour le paramètre de publication d'un utilisateur.
         return dict contenant userId, publishVotes et threshold mis à jour
         """
-        return PublicationRepository.update_publication_setting(user_id, publish_votes, threshold)
+        setting = PublicationRepository.update_publication_setting(user_id, publish_votes, threshold)
+        VoteCache.invalidate_user(user_id)
+        return setting
@@ -1,6 +1,11 @@
 from typing import Optional, List
 from datetime import datetime
 
+from django.conf import settings
+from django.utils.http import quote_etag
+
+from core.services.vote_cache import VoteCache
+from db.repository.async_result_repository import AsyncResultRepository
 from db.repository.result_repository import ResultRepository
 
 
@@ -32,7 +37,42 @@ class ResultService:
         """
         # Récupérer les résultats du repository (qui incluent domainTotal)
         results = ResultRepository.get_vote_results(domain, top, since)
-        
+        return ResultService._mark_elected(results)
+
+    @staticmethod
+    async def aget_vote_results(
+        domain: Optional[str] = None,
+        top: int = 100,
+        since: Optional[datetime] = None
+    ) -> List[dict]:
+        """
+        Version asynchrone de `get_vote_results`.
+        """
+        results = await AsyncResultRepository.get_vote_results(domain, top, since)
+        return ResultService._mark_elected(results)
+
+    @staticmethod
+    async def aget_results_etag() -> str:
+        """
+        ETag des résultats : ils ne changent qu'avec le job de validation (quotidien ou forcé),
+        qui réécrit le snapshot et sa version (`StatsMeta.lastDate` et `resultsVersion`).
+        La version est lue via VoteCache (aucune requête Neo4j en régime établi).
+        """
+        version = await VoteCache.aget_or_load(
+            VoteCache.RESULTS_VERSION_KEY, AsyncResultRepository.get_results_version
+        )
+        return quote_etag(f"results-{version}")
+
+    @staticmethod
+    def refresh_snapshot() -> None:
+        """
+        Matérialise les résultats de chaque domaine pour la dernière date de calcul
+        (appelé par le job quotidien après l'ajout des stats du jour).
+        """
+        ResultRepository.save_result_snapshot(settings.RESULT_SNAPSHOT_TOP)
+
+    @staticmethod
+    def _mark_elected(results: List[dict]) -> List[dict]:
         # Calculer elected pour chaque résultat
         # elected = true si votes >= 20% des votes du domaine
         for result in results:
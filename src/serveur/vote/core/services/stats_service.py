@@ -1,5 +1,9 @@
 import os
 from typing import List
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from db.repository.async_vote_repository import AsyncVoteRepository
 from db.repository.vote_repository import VoteRepository
 
 MIN_PUBLIC_VOTES = int(os.getenv("MIN_PUBLIC_VOTES", 5))
@@ -55,14 +59,52 @@ class StatsService:
     def get_chart(domain: str | None = None, days: int = 30) -> List:
         """
         Retourne pour chaque domaine (ou pour un domaine donné) la liste des top users.
-        Si domain est None, on génère pour tous les domaines trouvés.
+        Les classements sont lus depuis les Leaderboard matérialisés par le job quotidien ;
+        une fenêtre absente est calculée à partir des DailyStat, et n'est matérialisée
+        que si elle fait partie de `STATS_CHART_WINDOWS`.
         """
-        domains = VoteRepository.get_all_domains()
-        res = []
+        charts = VoteRepository.get_charts(days)
+        if not charts:
+            charts = StatsService._materialize_chart(days)
+        return StatsService._select_chart(charts, domain)
+
+    @staticmethod
+    async def aget_chart(domain: str | None = None, days: int = 30) -> List:
+        """
+        Version asynchrone de `get_chart`. La matérialisation d'une fenêtre absente (rare)
+        reste synchrone et s'exécute hors de la boucle d'événements.
+        """
+        charts = await AsyncVoteRepository.get_charts(days)
+        if not charts:
+            charts = await sync_to_async(StatsService._materialize_chart)(days)
+        return StatsService._select_chart(charts, domain)
+
+    @staticmethod
+    def _materialize_chart(days: int) -> dict:
+        charts = VoteRepository.compute_charts(
+            VoteRepository.get_all_domains(), days, settings.STATS_CHART_TOP
+        )
+        # Une fenêtre arbitraire demandée par un client n'est pas persistée :
+        # le graphe ne contient que les fenêtres configurées
+        if days in settings.STATS_CHART_WINDOWS:
+            VoteRepository.save_charts(charts, days)
+        return charts
+
+    @staticmethod
+    def _select_chart(charts: dict, domain: str | None) -> List:
         if domain:
-            domains = [domain] if domain in domains else []
+            return [{"domain": domain, "users": charts[domain]}] if domain in charts else []
+        return [{"domain": d, "users": users} for d, users in charts.items()]
 
-        for d in domains:
-            users = VoteRepository.get_chart_for_domain(d, days)
-            res.append({"domain": d, "users": users})
-        return res
+    @staticmethod
+    def refresh_charts() -> None:
+        """
+        Recalcule les classements de toutes les fenêtres de `STATS_CHART_WINDOWS`
+        après l'ajout des stats du jour, puis remplace les anciens en une seule transaction :
+        un lecteur concurrent voit les anciens ou les nouveaux classements, jamais aucun.
+        """
+        domains = VoteRepository.get_all_domains()
+        VoteRepository.replace_charts({
+            days: VoteRepository.compute_charts(domains, days, settings.STATS_CHART_TOP)
+            for days in settings.STATS_CHART_WINDOWS
+        })
@@ -0,0 +1,278 @@
+import datetime
+import logging
+import random
+import threading
+import time
+import uuid
+from django.conf import settings
+
+from core.services.batch_validation_service import BatchValidationService
+from core.services.vote_validation_service import VoteValidationService
+from db.repository.validation_job_repository import ValidationJobRepository
+from db.repository.vote_repository import VoteRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationLockLost(Exception):
+    """
+    Le verrou a expiré et a été repris par un autre run pendant l'exécution du job.
+    """
+
+
+class LockHeartbeat(threading.Thread):
+    """
+    Renouvelle le verrou de validation à intervalle régulier tant que le job s'exécute,
+    y compris pendant les phases longues (recalcul GDS) qui ne rendent pas la main.
+    """
+
+    def __init__(self, owner: str):
+        super().__init__(name=f"vote-validation-heartbeat-{owner}", daemon=True)
+        self.owner = owner
+        self.lost = False
+        self._stopped = threading.Event()
+
+    def run(self):
+        interval = max(settings.VOTE_VALIDATION_LOCK_TTL / 3, 1)
+        while not self._stopped.wait(interval):
+            try:
+                renewed = ValidationJobRepository.renew_lock(
+                    ValidationJobService.LOCK_NAME, self.owner, settings.VOTE_VALIDATION_LOCK_TTL
+                )
+            except Exception:
+                # Neo4j momentanément injoignable : le prochain battement réessaiera avant expiration
+                logger.warning("Renouvellement du verrou de validation impossible", exc_info=True)
+                continue
+            if not renewed:
+                self.lost = True
+                return
+
+    def stop(self):
+        self._stopped.set()
+
+    def check(self):
+        if self.lost:
+            raise ValidationLockLost()
+
+
+class ValidationJobService:
+    """
+    Exécution de la validation quotidienne des votes sous forme de job :
+    - un seul job à la fois, que l'appel vienne de l'API ou du cron (verrou Neo4j)
+    - chaque phase terminée est un point de reprise : un job interrompu (arrêt du processus, verrou expiré)
+      reprend au run suivant du même jour à partir de la première phase non terminée ; un job en échec
+      n'est pas repris, le run suivant en crée un nouveau qui traite tous les votes non encore traités
+    - l'avancement de chaque phase est consultable pendant l'exécution
+    """
+
+    LOCK_NAME = "daily_vote_validation"
+    PHASES = ["remove_previous_votes", "fetch", "validate", "mark_invalid", "stats"]
+
+    @staticmethod
+    def enqueue(trigger: str = "api") -> tuple[dict | None, bool]:
+        """
+        Prend le verrou et lance le job dans un thread, sans attendre la fin de son exécution.
+
+        :return: (job, started) ; si un job est déjà en cours, started = False et job est celui en cours
+        """
+        owner = str(uuid.uuid4())
+        lock = ValidationJobRepository.acquire_lock(
+            ValidationJobService.LOCK_NAME, owner, settings.VOTE_VALIDATION_LOCK_TTL
+        )
+        if not lock["acquired"]:
+            job = ValidationJobRepository.get_job(lock["jobId"]) if lock["jobId"] else None
+            return job, False
+
+        try:
+            job_id = ValidationJobService._claim_job(owner, trigger)
+            threading.Thread(
+                target=ValidationJobService._run_locked,
+                args=(job_id, owner),
+                name=f"vote-validation-{job_id}",
+                daemon=True,
+            ).start()
+        except Exception:
+            ValidationJobRepository.release_lock(ValidationJobService.LOCK_NAME, owner)
+            raise
+
+        return ValidationJobRepository.get_job(job_id), True
+
+    @staticmethod
+    def run(trigger: str = "cron") -> dict | None:
+        """
+        Exécute le job de manière synchrone (cron, commande).
+
+        :return: durée (en secondes) de chaque phase exécutée, ou None si un autre job détient le verrou
+                 ou si le job a échoué
+        """
+        owner = str(uuid.uuid4())
+        lock = ValidationJobRepository.acquire_lock(
+            ValidationJobService.LOCK_NAME, owner, settings.VOTE_VALIDATION_LOCK_TTL
+        )
+        if not lock["acquired"]:
+            logger.info("Validation des votes déjà en cours (job %s), run ignoré", lock["jobId"])
+            return None
+
+        try:
+            job_id = ValidationJobService._claim_job(owner, trigger)
+        except Exception:
+            ValidationJobRepository.release_lock(ValidationJobService.LOCK_NAME, owner)
+            raise
+
+        return ValidationJobService._run_locked(job_id, owner)
+
+    @staticmethod
+    def get_job(job_id: str) -> dict | None:
+        """
+        Retourne l'état d'un job et l'avancement de chacune de ses phases.
+        """
+        return ValidationJobRepository.get_job(job_id)
+
+    @staticmethod
+    def _claim_job(owner: str, trigger: str) -> str:
+        """
+        Reprend le dernier job interrompu du jour ou en crée un nouveau, puis l'associe au verrou.
+        Les autres jobs interrompus (jours précédents) sont abandonnés : leurs points de reprise
+        portent sur des votes qui ne sont plus ceux à traiter.
+        Doit être appelé avec le verrou détenu par `owner`.
+        """
+        run_date = datetime.date.today().isoformat()
+        job_id = ValidationJobRepository.find_resumable_job(run_date)
+        for abandoned in ValidationJobRepository.abandon_stale_jobs(job_id):
+            logger.warning("Job de validation %s abandonné", abandoned)
+        if job_id is None:
+            job_id = str(uuid.uuid4())
+            ValidationJobRepository.create_job(job_id, trigger, ValidationJobService.PHASES, run_date)
+        else:
+            logger.info("Reprise du job de validation %s", job_id)
+
+        ValidationJobRepository.renew_lock(
+            ValidationJobService.LOCK_NAME, owner, settings.VOTE_VALIDATION_LOCK_TTL, job_id
+        )
+        return job_id
+
+    @staticmethod
+    def _run_locked(job_id: str, owner: str) -> dict | None:
+        """
+        Exécute les phases restantes du job puis libère le verrou.
+        """
+        heartbeat = LockHeartbeat(owner)
+        heartbeat.start()
+        try:
+            timings = ValidationJobService._execute(job_id, heartbeat)
+            ValidationJobRepository.finish_job(job_id, "succeeded")
+            return timings
+        except ValidationLockLost:
+            # Un autre run a repris le job : on ne touche plus à son état
+            logger.error("Verrou de validation perdu, abandon du job %s", job_id)
+            return None
+        except Exception as exc:
+            logger.exception("Échec du job de validation %s", job_id)
+            ValidationJobRepository.finish_job(job_id, "failed", str(exc))
+            return None
+        finally:
+            heartbeat.stop()
+            ValidationJobRepository.release_lock(ValidationJobService.LOCK_NAME, owner)
+
+    @staticmethod
+    def _execute(job_id: str, heartbeat: LockHeartbeat) -> dict:
+        """
+        Traite les votes non encore validés :
+        - Supprime ou réinitialise les votes précédents via le service VoteService
+        - Récupère les IDs des relations VOTED non traitées dans la base Neo4j
+        - Mélange aléatoirement ces votes
+        - Valide environ 80 % des votes et rejette les 20 % restants,
+          vote par vote ou par lots selon `VOTE_VALIDATION_MODE`
+        - Marque les votes validés ou invalidés dans Neo4j via VoteRepository
+
+        Les phases déjà terminées lors d'un run précédent sont sautées.
+        Retourne la durée (en secondes) de chaque phase exécutée.
+        """
+        job = ValidationJobRepository.get_job(job_id, with_ids=True)
+        completed = {phase["name"] for phase in job["phases"] if phase["status"] == "done"}
+        timings: dict[str, float] = {}
+        ValidationJobRepository.start_job(job_id)
+
+        for phase in ValidationJobService.PHASES:
+            if phase in completed:
+                continue
+
+            heartbeat.check()
+            ValidationJobRepository.start_phase(job_id, phase)
+            started = time.perf_counter()
+            checkpoint = getattr(ValidationJobService, f"_phase_{phase}")(job, timings)
+            timings[phase] = time.perf_counter() - started
+            heartbeat.check()
+            ValidationJobRepository.complete_phase(job_id, phase, timings[phase], checkpoint)
+            if checkpoint:
+                job.update(checkpoint)
+
+        logger.info(
+            "process_daily_votes (job %s): %s votes, %s",
+            job_id,
+            job.get("voteCount"),
+            ", ".join(f"{phase}={duration:.3f}s" for phase, duration in timings.items()),
+        )
+        return timings
+
+    @staticmethod
+    def _phase_remove_previous_votes(job: dict, timings: dict) -> None:
+        VoteValidationService.remove_previous_votes()
+
+    @staticmethod
+    def _phase_fetch(job: dict, timings: dict) -> dict:
+        # Récupérer la liste des relations VOTED non encore traitées
+        vote_ids = VoteRepository.fetch_unprocessed_votes()
+
+        # Mélanger les IDs pour éviter un biais d'ordre
+        random.shuffle(vote_ids)
+        # Déterminer le nombre de votes à valider (80 %)
+        cutoff = int(len(vote_ids) * 0.8) + 1
+
+        # Séparer les votes validés et rejetés (enregistrés comme point de reprise)
+        return {
+            "voteCount": len(vote_ids),
+            "validatedIds": vote_ids[:cutoff],
+            "rejectedIds": vote_ids[cutoff:],
+        }
+
+    @staticmethod
+    def _phase_validate(job: dict, timings: dict) -> None:
+        validated = job["validatedIds"]
+        rejected = set(job["rejectedIds"])
+        # Reprise : les votes déjà marqués ou déjà rejetés par un run précédent ne sont pas revalidés
+        remaining = [
+            vote_id for vote_id in VoteRepository.filter_unprocessed_votes(validated)
+            if vote_id not in rejected
+        ] if validated else []
+
+        progress = {"done": len(validated) - len(remaining)}
+
+        def report(count: int, batch_rejected: list[str]):
+            progress["done"] += count
+            ValidationJobRepository.update_phase_progress(
+                job["jobId"], "validate", progress["done"], len(validated), batch_rejected
+            )
+            job["rejectedIds"] = job["rejectedIds"] + batch_rejected
+
+        report(0, [])
+        batch_size = settings.VOTE_VALIDATION_BATCH_SIZE
+        if settings.VOTE_VALIDATION_MODE == "batch":
+            _, batch_timings = BatchValidationService.validate_votes(remaining, batch_size, on_batch=report)
+            timings.update({f"validate.{phase}": duration for phase, duration in batch_timings.items()})
+        else:
+            for start in range(0, len(remaining), batch_size):
+                chunk = remaining[start:start + batch_size]
+                report(len(chunk), [
+                    vote_id for vote_id in chunk if not VoteValidationService.validate_vote(vote_id)
+                ])
+
+    @staticmethod
+    def _phase_mark_invalid(job: dict, timings: dict) -> None:
+        # Marquer les votes rejetés dans la base
+        if job["rejectedIds"]:
+            VoteRepository.mark_votes_invalid(job["rejectedIds"])
+
+    @staticmethod
+    def _phase_stats(job: dict, timings: dict) -> None:
+        VoteValidationService.finalize_daily_stats()
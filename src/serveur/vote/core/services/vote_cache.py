@@ -0,0 +1,77 @@
+import time
+from typing import Any, Awaitable, Callable
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class VoteCache:
+    """
+    Cache read-through des données de visibilité des votes (cache Django `votes`) :
+    date du dernier calcul, version des résultats, liste des domaines et, par utilisateur,
+    (publishVotes, voix du dernier jour).
+
+    Les clés par utilisateur sont préfixées par une génération renouvelée par le job
+    quotidien : une nouvelle génération invalide toutes les entrées d'un coup.
+    Les invalidations venant du cron et des autres workers, le cache doit être partagé
+    (Redis, VOTE_CACHE_REDIS_URL) ; sans Redis il est désactivé et chaque lecture va à Neo4j.
+    """
+
+    LAST_UPDATE_KEY = "votes:last_update"
+    RESULTS_VERSION_KEY = "votes:results_version"
+    DOMAINS_KEY = "votes:domains"
+    GENERATION_KEY = "votes:generation"
+
+    @staticmethod
+    def _cache():
+        return caches[settings.VOTE_CACHE_ALIAS]
+
+    @staticmethod
+    def get_or_load(key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Retourne la valeur en cache, ou l'obtient via `loader` et la met en cache.
+        """
+        cache = VoteCache._cache()
+        value = cache.get(key)
+        if value is None:
+            value = loader()
+            cache.set(key, value, settings.VOTE_CACHE_TIMEOUT)
+        return value
+
+    @staticmethod
+    async def aget_or_load(key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Version asynchrone de `get_or_load` : `loader` est une fonction coroutine.
+        """
+        cache = VoteCache._cache()
+        value = await cache.aget(key)
+        if value is None:
+            value = await loader()
+            await cache.aset(key, value, settings.VOTE_CACHE_TIMEOUT)
+        return value
+
+    @staticmethod
+    def user_key(user_id: str) -> str:
+        generation = VoteCache._cache().get_or_set(VoteCache.GENERATION_KEY, 0, None)
+        return f"votes:{generation}:user:{user_id}"
+
+    @staticmethod
+    async def auser_key(user_id: str) -> str:
+        generation = await VoteCache._cache().aget_or_set(VoteCache.GENERATION_KEY, 0, None)
+        return f"votes:{generation}:user:{user_id}"
+
+    @staticmethod
+    def invalidate_user(user_id: str) -> None:
+        """
+        Invalide les données de visibilité d'un utilisateur (changement de publishVotes).
+        """
+        VoteCache._cache().delete(VoteCache.user_key(user_id))
+
+    @staticmethod
+    def invalidate_all() -> None:
+        """
+        Invalide toutes les données de visibilité (après le calcul quotidien des stats).
+        """
+        cache = VoteCache._cache()
+        cache.set(VoteCache.GENERATION_KEY, time.time_ns(), None)
+        cache.delete_many([VoteCache.LAST_UPDATE_KEY, VoteCache.RESULTS_VERSION_KEY, VoteCache.DOMAINS_KEY])
@@ -1,7 +1,10 @@
+import asyncio
 import os
 import uuid
 from django.utils import timezone
 
+from core.services.vote_cache import VoteCache
+from db.repository.async_vote_repository import AsyncVoteRepository
 from db.repository.vote_repository import VoteRepository
 
 MIN_PUBLIC_VOTES = int(os.getenv("MIN_PUBLIC_VOTES", 5))
@@ -35,18 +38,46 @@ class VoteService:
             domain=domain,
         )
 
+    @staticmethod
+    def _get_visibility(user_id: str) -> tuple[bool, dict]:
+        """
+        Retourne (publishVotes, { domain: count } du dernier jour calculé) pour un user,
+        via VoteCache : en régime établi, aucune requête Neo4j.
+        """
+        last_update = VoteCache.get_or_load(
+            VoteCache.LAST_UPDATE_KEY, lambda: VoteRepository.get_last_update()
+        )
+        publish_votes, stats = VoteCache.get_or_load(
+            VoteCache.user_key(user_id), lambda: VoteRepository.get_publish_votes_setting(user_id)
+        )
+        return publish_votes, stats[last_update] if last_update in stats else {}
+
+    @staticmethod
+    async def _aget_visibility(user_id: str) -> tuple[bool, dict]:
+        """
+        Version asynchrone de `_get_visibility` : les deux lectures sont faites en parallèle.
+        """
+        last_update, (publish_votes, stats) = await asyncio.gather(
+            VoteCache.aget_or_load(VoteCache.LAST_UPDATE_KEY, AsyncVoteRepository.get_last_update),
+            VoteCache.aget_or_load(
+                await VoteCache.auser_key(user_id),
+                lambda: AsyncVoteRepository.get_publish_votes_setting(user_id),
+            ),
+        )
+        return publish_votes, stats[last_update] if last_update in stats else {}
+
     @staticmethod
     def get_votes_by_voter(voter_id: str, domain: str | None = None, is_me: bool = False) -> list[dict]:
         """
         Récupère la liste des votes émis par un user (option: filtrer par domaine).
         """
         
-        publish_votes, stats = VoteRepository.get_publish_votes_setting(voter_id)
-        last_update = VoteRepository.get_last_update()
-        last_counts = stats[last_update] if last_update in stats else {}
+        publish_votes, last_counts = VoteService._get_visibility(voter_id)
         public_domains = set()
         if is_me or publish_votes:
-            public_domains = set(VoteRepository.get_all_domains())
+            public_domains = set(
+                VoteCache.get_or_load(VoteCache.DOMAINS_KEY, lambda: VoteRepository.get_all_domains())
+            )
         else:
             for domain_name, count in last_counts.items():
                 if count >= MIN_PUBLIC_VOTES:
@@ -71,20 +102,36 @@ class VoteService:
         }
         """
 
-        publish_votes, stats = VoteRepository.get_publish_votes_setting(user_id)
-        last_update = VoteRepository.get_last_update()
-        last_counts = stats[last_update] if last_update in stats else {}
+        publish_votes, last_counts = VoteService._get_visibility(user_id)
+        res = VoteRepository.get_received_votes_summary(
+            user_id=user_id,
+            domain=domain,
+        )
+        return VoteService._filter_received_votes(res, publish_votes, last_counts, is_me)
+
+    @staticmethod
+    async def aget_received_votes(user_id: str, domain: str | None = None, is_me: bool = False) -> dict:
+        """
+        Version asynchrone de `get_received_votes` : la visibilité et les votes reçus
+        sont lus en parallèle.
+        """
+        (publish_votes, last_counts), res = await asyncio.gather(
+            VoteService._aget_visibility(user_id),
+            AsyncVoteRepository.get_received_votes_summary(user_id=user_id, domain=domain),
+        )
+        return VoteService._filter_received_votes(res, publish_votes, last_counts, is_me)
+
+    @staticmethod
+    def _filter_received_votes(res: dict, publish_votes: bool, last_counts: dict, is_me: bool) -> dict:
+        """
+        Ne garde que les domaines publics (ou tous pour l'utilisateur lui-même) et calcule le total.
+        """
         public_domains = set()
 
         for domain_name, count in last_counts.items():
             if is_me or publish_votes or count >= MIN_PUBLIC_VOTES:
                 public_domains.add(domain_name)
 
-        res = VoteRepository.get_received_votes_summary(
-            user_id=user_id,
-            domain=domain,
-        )
-
         res["byDomain"] = {
             domain_key: count
             for domain_key, count in last_counts.items()
@@ -1,47 +1,13 @@
 import datetime
-import random
+from django.conf import settings
+
+from core.services.delegation_graph_service import DelegationGraphService
+from core.services.result_service import ResultService
+from core.services.stats_service import StatsService
+from core.services.vote_cache import VoteCache
 from db.repository.vote_repository import VoteRepository
 
 class VoteValidationService:
-    @staticmethod
-    def process_daily_votes():
-        """
-        Traite les votes non encore validés chaque jour :
-        - Supprime ou réinitialise les votes précédents via le service VoteService
-        - Récupère les IDs des relations VOTED non traitées dans la base Neo4j
-        - Mélange aléatoirement ces votes
-        - Valide environ 80 % des votes et rejette les 20 % restants
-        - Marque les votes validés ou invalidés dans Neo4j via VoteRepository
-        """
-
-        # Supprimer ou réinitialiser les votes précédents
-        VoteValidationService.remove_previous_votes()
-
-        # Récupérer la liste des relations VOTED non encore traitées
-        vote_ids = VoteRepository.fetch_unprocessed_votes()
-
-        # Si aucun vote à traiter, on passe au calcule des stats
-        if vote_ids:
-            # Mélanger les IDs pour éviter un biais d'ordre
-            random.shuffle(vote_ids)
-            # Déterminer le nombre de votes à valider (80 %)
-            cutoff = int(len(vote_ids) * 0.8) + 1
-
-            # Séparer les votes validés et rejetés
-            validated = vote_ids[:cutoff]
-            rejected = vote_ids[cutoff:]
-
-            # Logique de validation des votes de validated
-            for vote_id in validated:
-                if not VoteValidationService.validate_vote(vote_id):
-                    rejected.append(vote_id)
-
-            # Marquer les votes rejetés dans la base
-            if rejected:
-                VoteRepository.mark_votes_invalid(rejected)
-        
-        VoteValidationService.finalize_daily_stats()
-
     @staticmethod
     def remove_previous_votes():
         """
@@ -50,12 +16,33 @@ class VoteValidationService:
         Étapes :
         1. Supprime les relations VOTED en doublon et valide toutes les self-loop pour chaque
            utilisateur et chaque domaine.
-        2. Recalcule les poids (`count`) et marque les cycles (`cycle`) pour tous les votes valides
-           via le recalcul par domaine dans GDS.
+        2. Recalcule les poids (`count`) et marque les cycles (`cycle`) :
+           - en mode incrémental, uniquement en aval des votants dont le vote a changé ;
+           - sinon (ou le jour du recalcul complet de contrôle), pour tous les votes valides
+             via le recalcul par domaine, dans GDS ou en mémoire selon `VOTE_RECALCULATION_ENGINE`.
         """
         VoteRepository.clean_duplicate_domain_votes()
 
-        VoteRepository.recalculate_counts_by_domain()
+        if VoteValidationService.use_incremental_recalculation():
+            DelegationGraphService.recalculate_dirty_domains()
+            return
+
+        if settings.VOTE_RECALCULATION_ENGINE == "memory":
+            DelegationGraphService.recalculate_counts_by_domain()
+        else:
+            VoteRepository.recalculate_counts_by_domain()
+        VoteRepository.clear_dirty_votes()
+
+    @staticmethod
+    def use_incremental_recalculation(today: datetime.date | None = None) -> bool:
+        """
+        Indique si le recalcul des poids doit être incrémental : `VOTE_RECALCULATION_MODE` vaut
+        'incremental' et on n'est pas le jour du recalcul complet (`VOTE_FULL_RECALCULATION_WEEKDAY`).
+        """
+        if settings.VOTE_RECALCULATION_MODE != "incremental":
+            return False
+        today = today or datetime.date.today()
+        return today.weekday() != settings.VOTE_FULL_RECALCULATION_WEEKDAY
     
     @staticmethod
     def validate_vote(vote_id: str) -> bool:
@@ -79,6 +66,10 @@ class VoteValidationService:
     def finalize_daily_stats():
         """
         Finalise les statistiques journalières en mettant à jour la date
-        du dernier calcul et en ajoutant les statistiques journalières
+        du dernier calcul, en ajoutant les statistiques journalières
+        et en recalculant les classements et les résultats matérialisés, puis invalide le cache de visibilité
         """
-        VoteRepository.append_daily_stats(datetime.date.today())
\ No newline at end of file
+        VoteRepository.append_daily_stats(datetime.date.today())
+        StatsService.refresh_charts()
+        ResultService.refresh_snapshot()
+        VoteCache.invalidate_all()
\ No newline at end of file
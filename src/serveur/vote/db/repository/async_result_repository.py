@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Optional, List
+
+from app.neo4j_config import get_async_driver
+from db.repository.result_repository import ResultRepository
+
+
+class AsyncResultRepository:
+    """
+    Version asynchrone de `ResultRepository` pour les vues async.
+    """
+
+    @staticmethod
+    async def get_vote_results(
+        domain: Optional[str] = None,
+        top: int = 100,
+        since: Optional[datetime] = None
+    ) -> List[dict]:
+        """
+        Même contrat que `ResultRepository.get_vote_results`.
+        """
+        async with get_async_driver().session() as session:
+            return await session.execute_read(
+                AsyncResultRepository._get_vote_results_tx, domain, top, since
+            )
+
+    @staticmethod
+    async def get_results_version() -> str:
+        """
+        Même contrat que `ResultRepository.get_results_version`.
+        """
+        async with get_async_driver().session() as session:
+            return await session.execute_read(AsyncResultRepository._get_results_version_tx)
+
+    @staticmethod
+    async def _get_results_version_tx(tx) -> str:
+        result = await tx.run(ResultRepository.RESULTS_VERSION_QUERY)
+        return ResultRepository._results_version(await result.single())
+
+    @staticmethod
+    async def _get_vote_results_tx(
+        tx,
+        domain: Optional[str],
+        top: int,
+        since: Optional[datetime]
+    ) -> List[dict]:
+        if since is None:
+            result = await tx.run(ResultRepository.SNAPSHOT_META_QUERY, top=top)
+            usable = await result.single()
+            if usable["usable"]:
+                result = await tx.run(ResultRepository.SNAPSHOT_QUERY, domain=domain, top=top)
+                return ResultRepository._results(await result.data())
+
+        query, params = ResultRepository._build_query(domain, top, since)
+        result = await tx.run(query, **params)
+        return ResultRepository._results(await result.data())
@@ -0,0 +1,99 @@
+from app.neo4j_config import get_async_driver
+from db.repository.vote_repository import VoteRepository
+
+
+class AsyncVoteRepository:
+    """
+    Lectures de `VoteRepository` utilisées par les vues async, avec le driver Neo4j asynchrone.
+
+    Les requêtes et la mise en forme des résultats sont celles de `VoteRepository` :
+    seules l'ouverture des sessions et l'attente des résultats diffèrent.
+    Chaque méthode ouvre sa propre session, de sorte que plusieurs lectures indépendantes
+    d'une même requête HTTP peuvent s'exécuter en parallèle (asyncio.gather).
+    """
+
+    @staticmethod
+    async def get_received_votes_summary(user_id: str, domain: str | None = None) -> dict:
+        """
+        Même contrat que `VoteRepository.get_received_votes_summary`.
+        """
+        async with get_async_driver().session() as session:
+            return await session.execute_read(
+                AsyncVoteRepository._get_received_votes_summary_tx, user_id, domain
+            )
+
+    @staticmethod
+    async def _get_received_votes_summary_tx(tx, user_id: str, domain: str | None) -> dict:
+        result = await tx.run(
+            VoteRepository.RECEIVED_VOTES_SUMMARY_QUERY,
+            userId=str(user_id),
+            domain=domain,
+        )
+        return VoteRepository._received_votes_summary(user_id, await result.data())
+
+    @staticmethod
+    async def get_last_update() -> str:
+        """
+        Même contrat que `VoteRepository.get_last_update`.
+        """
+        async with get_async_driver().session() as session:
+            return await session.execute_read(AsyncVoteRepository._get_last_update_tx)
+
+    @staticmethod
+    async def _get_last_update_tx(tx) -> str:
+        result = await tx.run(VoteRepository.LAST_DATE_QUERY)
+        return VoteRepository._last_update(await result.single())
+
+    @staticmethod
+    async def get_all_domains() -> list:
+        """
+        Même contrat que `VoteRepository.get_all_domains`.
+        """
+        async with get_async_driver().session() as session:
+            return await session.execute_read(AsyncVoteRepository._get_all_domains_tx)
+
+    @staticmethod
+    async def _get_all_domains_tx(tx) -> list:
+        result = await tx.run(VoteRepository.ALL_DOMAINS_QUERY)
+        return [rec["domain"] async for rec in result]
+
+    @staticmethod
+    async def get_publish_votes_setting(user_id: str) -> tuple[bool, dict]:
+        """
+        Même contrat que `VoteRepository.get_publish_votes_setting`.
+        """
+        async with get_async_driver().session() as session:
+            return await session.execute_read(AsyncVoteRepository._get_publish_votes_setting_tx, user_id)
+
+    @staticmethod
+    async def _get_publish_votes_setting_tx(tx, user_id: str) -> tuple[bool, dict]:
+        last_date = await AsyncVoteRepository._get_last_date_tx(tx)
+        result = await tx.run(
+            VoteRepository.PUBLISH_VOTES_SETTING_QUERY,
+            userId=user_id,
+            lastDate=last_date.isoformat(),
+        )
+        return VoteRepository._publish_votes_setting(await result.single(), last_date)
+
+    @staticmethod
+    async def get_charts(days: int) -> dict[str, list[dict]]:
+        """
+        Même contrat que `VoteRepository.get_charts`.
+        """
+        async with get_async_driver().session() as session:
+            return await session.execute_read(AsyncVoteRepository._get_charts_tx, days)
+
+    @staticmethod
+    async def _get_charts_tx(tx, days: int) -> dict[str, list[dict]]:
+        last_date = await AsyncVoteRepository._get_last_date_tx(tx)
+        result = await tx.run(
+            VoteRepository.CHARTS_QUERY,
+            days=days,
+            lastDate=last_date.isoformat(),
+        )
+        return VoteRepository._charts(await result.data())
+
+    @staticmethod
+    async def _get_last_date_tx(tx):
+        result = await tx.run(VoteRepository.LAST_DATE_QUERY)
+        return VoteRepository._last_date(await result.single())
@@ -1,14 +1,63 @@
 from app.neo4j_config import get_driver
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional, List
 
 
 class ResultRepository:
     """
     Repository pour récupérer les résultats agrégés des votes.
-    
+
     Récupère le classement des utilisateurs par nombre de votes reçus,
     avec filtrage optionnel par domaine et date.
+
+    Modèle du snapshot écrit par le job quotidien :
+      (:StatsMeta {id: 'daily_stats', lastDate, resultsDate, resultsTop, resultsVersion})
+      (:ResultSnapshot {domain, domainTotal})-[:HAS_ENTRY]->(:ResultEntry {rank, userId, count, electedAt})
+    """
+
+    # ═══════════════════════════════════════════════════════════════
+    # Lecture du snapshot : utilisable s'il a été écrit pour la dernière date de calcul
+    # et s'il conserve au moins `top` candidats par domaine
+    # ═══════════════════════════════════════════════════════════════
+    SNAPSHOT_META_QUERY = """
+        OPTIONAL MATCH (m:StatsMeta {id: 'daily_stats'})
+        RETURN m IS NOT NULL AND m.resultsDate = m.lastDate AND m.resultsTop >= $top AS usable
+    """
+
+    # Version des résultats : date du dernier calcul et instant de la dernière écriture du snapshot
+    # (un run forcé le même jour réécrit le snapshot sans changer la date)
+    RESULTS_VERSION_QUERY = """
+        MATCH (m:StatsMeta {id: 'daily_stats'})
+        RETURN m.lastDate AS lastDate, m.resultsVersion.epochMillis AS resultsVersion
+    """
+
+    SNAPSHOT_QUERY = """
+        MATCH (s:ResultSnapshot)-[:HAS_ENTRY]->(e:ResultEntry)
+        WHERE $domain IS NULL OR s.domain = $domain
+        RETURN e.userId AS userId,
+               s.domain AS domain,
+               e.count AS count,
+               s.domainTotal AS domainTotal,
+               e.electedAt AS electedAt
+        ORDER BY count DESC, userId
+        LIMIT $top
+    """
+
+    # ═══════════════════════════════════════════════════════════════
+    # Candidats et totaux par domaine en un seul parcours des votes,
+    # les `top` premiers candidats de chaque domaine étant conservés
+    # ═══════════════════════════════════════════════════════════════
+    SNAPSHOT_COMPUTE_QUERY = """
+        MATCH (:User)-[v:VOTED {current: true}]->(target:User)
+        WITH target.id AS userId,
+             v.domain AS domain,
+             sum(v.count) AS userVotes,
+             min(v.createdAt) AS firstVoteAt
+        ORDER BY userVotes DESC, userId
+        WITH domain,
+             sum(userVotes) AS domainTotal,
+             collect({userId: userId, count: userVotes, electedAt: firstVoteAt}) AS candidates
+        RETURN domain, domainTotal, candidates[..$top] AS entries
     """
 
     @staticmethod
@@ -19,14 +68,14 @@ class ResultRepository:
     ) -> List[dict]:
         """
         Récupère les résultats des votes agrégés.
-        
+
         Args:
             domain: Domaine optionnel pour filtrer les votes
             top: Nombre maximum de résultats à retourner (défaut: 100)
             since: Date optionnelle - ne retourner que les votes depuis cette date
-            
+
         Returns:
-            Liste de dict contenant userId, domain, count, elected, electedAt
+            Liste de dict contenant userId, domain, count, domainTotal, electedAt
         """
         driver = get_driver()
         with driver.session() as session:
@@ -47,66 +96,143 @@ class ResultRepository:
     ) -> List[dict]:
         """
         Transaction de lecture pour récupérer les résultats agrégés.
-        
-        Cette fonction utilise 2 requêtes pour éviter le bug du calcul
-        des 20% avec le paramètre top :
-        1. Calcul des totaux par domaine (sur TOUS les votes)
-        2. Récupération des top N candidats avec leur domainTotal
+
+        Sans filtre `since`, les résultats sont lus dans le snapshot du job quotidien
+        s'il est à jour ; sinon ils sont calculés en un seul parcours des votes.
+        """
+        if since is None:
+            usable = tx.run(ResultRepository.SNAPSHOT_META_QUERY, top=top).single()
+            if usable["usable"]:
+                return ResultRepository._results(
+                    tx.run(ResultRepository.SNAPSHOT_QUERY, domain=domain, top=top)
+                )
+
+        query, params = ResultRepository._build_query(domain, top, since)
+        return ResultRepository._results(tx.run(query, **params))
+
+    @staticmethod
+    def get_results_version() -> str:
+        """
+        Retourne la version des résultats : change à chaque calcul, y compris un run forcé le même jour.
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            return ResultRepository._results_version(session.run(ResultRepository.RESULTS_VERSION_QUERY).single())
+
+    @staticmethod
+    def _results_version(record) -> str:
+        last_date = record["lastDate"] if record and record["lastDate"] is not None else date.today().isoformat()
+        version = record["resultsVersion"] if record and record["resultsVersion"] is not None else 0
+        return f"{last_date}-{version}"
+
+    @staticmethod
+    def _build_query(
+        domain: Optional[str],
+        top: int,
+        since: Optional[datetime]
+    ) -> tuple[str, dict]:
+        """
+        Construit la requête de calcul des résultats à la volée et ses paramètres,
+        partagée avec `AsyncResultRepository`.
+
+        Les totaux par domaine (sur TOUS les votes, pour le seuil des 20 %) et le top N
+        sont calculés dans le même parcours : les votes sont agrégés par candidat,
+        puis les candidats par domaine, avant d'appliquer la limite.
         """
-        
         # Paramètres communs
         params = {"top": top}
         conditions = []
-        
+
         if domain:
             conditions.append("v.domain = $domain")
             params["domain"] = domain
-        
+
         if since:
+            # Parcours de l'index voted_created_at sur la plage [since, +∞[
             conditions.append("v.createdAt >= datetime($since)")
             params["since"] = since.isoformat()
-        
+
         where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
-        
-        # ═══════════════════════════════════════════════════════════════
-        # REQUÊTE 1 : Calculer les totaux par domaine
-        # ═══════════════════════════════════════════════════════════════
-        query_totals = f"""
-            MATCH (voter:User)-[v:VOTED {{current: true}}]->(target:User)
-            {where_clause}
-            RETURN v.domain AS domain, sum(v.count) AS domainTotal
-        """
-        
-        result_totals = tx.run(query_totals, **params)
-        domain_totals = {record["domain"]: record["domainTotal"] for record in result_totals}
-        
-        # ═══════════════════════════════════════════════════════════════
-        # REQUÊTE 2 : Récupérer les top N candidats
-        # ═══════════════════════════════════════════════════════════════
-        query_results = f"""
+
+        query = f"""
             MATCH (voter:User)-[v:VOTED {{current: true}}]->(target:User)
             {where_clause}
             WITH target.id AS userId,
                  v.domain AS domain,
                  sum(v.count) AS userVotes,
                  min(v.createdAt) AS firstVoteAt
-            ORDER BY userVotes DESC
+            WITH domain,
+                 sum(userVotes) AS domainTotal,
+                 collect({{userId: userId, count: userVotes, electedAt: firstVoteAt}}) AS candidates
+            UNWIND candidates AS candidate
+            WITH candidate, domain, domainTotal
+            ORDER BY candidate.count DESC, candidate.userId
             LIMIT $top
-            RETURN userId, domain, userVotes AS count, firstVoteAt AS electedAt
+            RETURN candidate.userId AS userId,
+                   domain,
+                   candidate.count AS count,
+                   domainTotal,
+                   candidate.electedAt AS electedAt
         """
-        
-        result_users = tx.run(query_results, **params)
-        
-        # Construire les résultats avec le domainTotal
-        results = []
-        for record in result_users:
-            user_domain = record["domain"]
-            results.append({
+
+        return query, params
+
+    @staticmethod
+    def _results(records) -> List[dict]:
+        return [
+            {
                 "userId": record["userId"],
-                "domain": user_domain,
+                "domain": record["domain"],
                 "count": record["count"],
-                "domainTotal": domain_totals.get(user_domain, 0),
-                "electedAt": record["electedAt"]
+                "domainTotal": record["domainTotal"] or 0,
+                "electedAt": record["electedAt"],
+            }
+            for record in records
+        ]
+
+    @staticmethod
+    def save_result_snapshot(top: int) -> None:
+        """
+        Calcule et matérialise les résultats de chaque domaine (les `top` premiers candidats
+        et le total du domaine) pour la dernière date de calcul, en remplaçant le snapshot précédent.
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            session.execute_write(ResultRepository._save_result_snapshot_tx, top)
+
+    @staticmethod
+    def _save_result_snapshot_tx(tx, top: int):
+        snapshots = tx.run(ResultRepository.SNAPSHOT_COMPUTE_QUERY, top=top).data()
+
+        tx.run(
+            """
+            MATCH (s:ResultSnapshot)
+            OPTIONAL MATCH (s)-[:HAS_ENTRY]->(e:ResultEntry)
+            DETACH DELETE s, e
+            """
+        )
+        tx.run(
+            """
+            UNWIND $snapshots AS snapshot
+            CREATE (s:ResultSnapshot {domain: snapshot.domain, domainTotal: snapshot.domainTotal})
+            WITH s, snapshot
+            UNWIND range(0, size(snapshot.entries) - 1) AS rank
+            WITH s, rank, snapshot.entries[rank] AS entry
+            CREATE (s)-[:HAS_ENTRY]->(:ResultEntry {
+                rank:      rank,
+                userId:    entry.userId,
+                count:     entry.count,
+                electedAt: entry.electedAt
             })
-        
-        return results
\ No newline at end of file
+            """,
+            snapshots=snapshots,
+        )
+        tx.run(
+            """
+            MERGE (m:StatsMeta {id: 'daily_stats'})
+            SET m.resultsDate = m.lastDate,
+                m.resultsTop = $top,
+                m.resultsVersion = datetime()
+            """,
+            top=top,
+        )
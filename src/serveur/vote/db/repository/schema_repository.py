@@ -0,0 +1,81 @@
+from app.neo4j_config import get_driver
+
+
+class SchemaRepository:
+    """
+    Contraintes et index Neo4j utilisés par les requêtes du service de vote.
+
+    Toutes les instructions sont idempotentes (IF NOT EXISTS).
+    """
+
+    CONSTRAINTS = {
+        "user_id_unique":
+            "CREATE CONSTRAINT user_id_unique IF NOT EXISTS FOR (u:User) REQUIRE u.id IS UNIQUE",
+        "validation_job_id_unique":
+            "CREATE CONSTRAINT validation_job_id_unique IF NOT EXISTS FOR (j:ValidationJob) REQUIRE j.jobId IS UNIQUE",
+        "validation_lock_name_unique":
+            "CREATE CONSTRAINT validation_lock_name_unique IF NOT EXISTS FOR (l:ValidationLock) REQUIRE l.name IS UNIQUE",
+    }
+
+    INDEXES = {
+        "voted_domain_current":
+            "CREATE INDEX voted_domain_current IF NOT EXISTS FOR ()-[r:VOTED]-() ON (r.domain, r.current)",
+        "voted_processed":
+            "CREATE INDEX voted_processed IF NOT EXISTS FOR ()-[r:VOTED]-() ON (r.processed)",
+        "voted_created_at":
+            "CREATE INDEX voted_created_at IF NOT EXISTS FOR ()-[r:VOTED]-() ON (r.createdAt)",
+        "voted_dirty":
+            "CREATE INDEX voted_dirty IF NOT EXISTS FOR ()-[r:VOTED]-() ON (r.dirty)",
+        "daily_stat_user_date":
+            "CREATE INDEX daily_stat_user_date IF NOT EXISTS FOR (s:DailyStat) ON (s.userId, s.date)",
+        "daily_stat_domain_date":
+            "CREATE INDEX daily_stat_domain_date IF NOT EXISTS FOR (s:DailyStat) ON (s.domain, s.date)",
+        "leaderboard_days_date":
+            "CREATE INDEX leaderboard_days_date IF NOT EXISTS FOR (l:Leaderboard) ON (l.days, l.date)",
+        "validation_job_status":
+            "CREATE INDEX validation_job_status IF NOT EXISTS FOR (j:ValidationJob) ON (j.status, j.createdAt)",
+    }
+
+    @staticmethod
+    def ensure_schema() -> None:
+        """
+        Crée les contraintes et index manquants puis attend qu'ils soient en ligne.
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            for statement in SchemaRepository.CONSTRAINTS.values():
+                session.run(statement).consume()
+            for statement in SchemaRepository.INDEXES.values():
+                session.run(statement).consume()
+            session.run("CALL db.awaitIndexes(300)").consume()
+
+    @staticmethod
+    def missing_schema() -> list[str]:
+        """
+        Retourne le nom des contraintes et index absents ou pas encore en ligne.
+        """
+        # Requêtes auto-commit : pas de nouvelle tentative si Neo4j est injoignable au démarrage
+        driver = get_driver()
+        with driver.session() as session:
+            constraints = {rec["name"] for rec in session.run("SHOW CONSTRAINTS YIELD name")}
+            online_indexes = {
+                rec["name"]
+                for rec in session.run("SHOW INDEXES YIELD name, state WHERE state = 'ONLINE'")
+            }
+        return [
+            name for name in SchemaRepository.CONSTRAINTS if name not in constraints
+        ] + [
+            name for name in SchemaRepository.INDEXES if name not in online_indexes
+        ]
+
+    @staticmethod
+    def drop_schema() -> None:
+        """
+        Supprime les contraintes et index gérés par ce repository (benchmark uniquement).
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            for name in SchemaRepository.CONSTRAINTS:
+                session.run(f"DROP CONSTRAINT {name} IF EXISTS").consume()
+            for name in SchemaRepository.INDEXES:
+                session.run(f"DROP INDEX {name} IF EXISTS").consume()
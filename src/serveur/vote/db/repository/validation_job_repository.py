@@ -0,0 +1,367 @@
+from app.neo4j_config import get_driver
+
+
+class ValidationJobRepository:
+    """
+    Persistance des jobs de validation quotidienne des votes dans Neo4j.
+
+    Modèle :
+      (job:ValidationJob {jobId, trigger, runDate, status, currentPhase, createdAt, startedAt,
+                          finishedAt, error, voteCount, validatedIds, rejectedIds})
+      (job)-[:HAS_PHASE]->(phase:ValidationJobPhase {name, position, status, done, total, duration})
+      (lock:ValidationLock {name, owner, jobId, expiresAt})
+
+    Les phases terminées (status = 'done') servent de points de reprise : un job interrompu
+    (resté en attente ou en cours alors que son verrou a expiré) est repris à partir de la première
+    phase non terminée, le jour même seulement. Un job en échec n'est jamais repris, et un job
+    interrompu d'un jour précédent est abandonné (status = 'abandoned').
+    Le verrou garantit qu'un seul job s'exécute à la fois (API ou cron), il expire
+    s'il n'est plus renouvelé (processus arrêté en cours de route).
+    """
+
+    RESUMABLE_STATUSES = ["queued", "running"]
+
+    # -------------------- VERROU --------------------
+
+    @staticmethod
+    def acquire_lock(name: str, owner: str, ttl: int) -> dict:
+        """
+        Prend le verrou `name` pour `owner` s'il est libre ou expiré.
+
+        :return: dict { acquired, jobId } où jobId est le job du détenteur actuel du verrou
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            return session.execute_write(ValidationJobRepository._acquire_lock_tx, name, owner, ttl)
+
+    @staticmethod
+    def _acquire_lock_tx(tx, name: str, owner: str, ttl: int) -> dict:
+        # L'écriture de `touchedAt` pose un verrou d'écriture sur le nœud avant la lecture de `owner`,
+        # deux transactions concurrentes ne peuvent donc pas prendre le verrou en même temps
+        record = tx.run(
+            """
+            MERGE (l:ValidationLock {name: $name})
+            SET l.touchedAt = datetime()
+            WITH l, (l.owner IS NULL OR l.expiresAt < datetime() OR l.owner = $owner) AS free
+            FOREACH (_ IN CASE WHEN free THEN [1] ELSE [] END |
+                SET l.owner = $owner,
+                    l.jobId = null,
+                    l.expiresAt = datetime() + duration({seconds: $ttl})
+            )
+            RETURN free AS acquired, l.jobId AS jobId
+            """,
+            name=name,
+            owner=owner,
+            ttl=ttl,
+        ).single()
+        return {"acquired": record["acquired"], "jobId": record["jobId"]}
+
+    @staticmethod
+    def renew_lock(name: str, owner: str, ttl: int, job_id: str | None = None) -> bool:
+        """
+        Prolonge le verrou (et y associe `job_id` si fourni).
+
+        :return: False si `owner` ne détient plus le verrou
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            return session.execute_write(
+                ValidationJobRepository._renew_lock_tx, name, owner, ttl, job_id
+            )
+
+    @staticmethod
+    def _renew_lock_tx(tx, name: str, owner: str, ttl: int, job_id: str | None) -> bool:
+        record = tx.run(
+            """
+            MATCH (l:ValidationLock {name: $name, owner: $owner})
+            SET l.expiresAt = datetime() + duration({seconds: $ttl}),
+                l.jobId = coalesce($jobId, l.jobId)
+            RETURN count(l) AS renewed
+            """,
+            name=name,
+            owner=owner,
+            ttl=ttl,
+            jobId=job_id,
+        ).single()
+        return record["renewed"] > 0
+
+    @staticmethod
+    def release_lock(name: str, owner: str) -> None:
+        """
+        Libère le verrou s'il est toujours détenu par `owner`.
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            session.execute_write(ValidationJobRepository._release_lock_tx, name, owner)
+
+    @staticmethod
+    def _release_lock_tx(tx, name: str, owner: str):
+        tx.run(
+            """
+            MATCH (l:ValidationLock {name: $name, owner: $owner})
+            SET l.owner = null, l.jobId = null, l.expiresAt = null
+            """,
+            name=name,
+            owner=owner,
+        )
+
+    # -------------------- JOBS --------------------
+
+    @staticmethod
+    def create_job(job_id: str, trigger: str, phases: list[str], run_date: str) -> None:
+        """
+        Crée un job en attente pour le jour `run_date` (ISO) avec ses phases dans l'ordre d'exécution.
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            session.execute_write(ValidationJobRepository._create_job_tx, job_id, trigger, phases, run_date)
+
+    @staticmethod
+    def _create_job_tx(tx, job_id: str, trigger: str, phases: list[str], run_date: str):
+        tx.run(
+            """
+            CREATE (j:ValidationJob {
+                jobId: $jobId,
+                trigger: $trigger,
+                runDate: $runDate,
+                status: 'queued',
+                createdAt: datetime(),
+                validatedIds: [],
+                rejectedIds: []
+            })
+            WITH j
+            UNWIND range(0, size($phases) - 1) AS position
+            CREATE (j)-[:HAS_PHASE]->(:ValidationJobPhase {
+                name: $phases[position],
+                position: position,
+                status: 'pending',
+                done: 0
+            })
+            """,
+            jobId=job_id,
+            trigger=trigger,
+            phases=phases,
+            runDate=run_date,
+        )
+
+    @staticmethod
+    def find_resumable_job(run_date: str) -> str | None:
+        """
+        Retourne l'identifiant du dernier job interrompu (en attente ou en cours) du jour `run_date`, s'il existe.
+        Doit être appelé avec le verrou détenu : le job trouvé n'a donc plus de verrou valide.
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            return session.execute_read(ValidationJobRepository._find_resumable_job_tx, run_date)
+
+    @staticmethod
+    def _find_resumable_job_tx(tx, run_date: str) -> str | None:
+        record = tx.run(
+            """
+            MATCH (j:ValidationJob {runDate: $runDate})
+            WHERE j.status IN $statuses
+            RETURN j.jobId AS jobId
+            ORDER BY j.createdAt DESC
+            LIMIT 1
+            """,
+            runDate=run_date,
+            statuses=ValidationJobRepository.RESUMABLE_STATUSES,
+        ).single()
+        return record["jobId"] if record else None
+
+    @staticmethod
+    def abandon_stale_jobs(keep_job_id: str | None = None) -> list[str]:
+        """
+        Abandonne les jobs interrompus (en attente ou en cours) autres que `keep_job_id` :
+        ils ne seront plus repris et leurs listes de votes sont vidées.
+        Doit être appelé avec le verrou détenu.
+
+        :return: identifiants des jobs abandonnés
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            return session.execute_write(ValidationJobRepository._abandon_stale_jobs_tx, keep_job_id)
+
+    @staticmethod
+    def _abandon_stale_jobs_tx(tx, keep_job_id: str | None) -> list[str]:
+        result = tx.run(
+            """
+            MATCH (j:ValidationJob)
+            WHERE j.status IN $statuses AND ($keepJobId IS NULL OR j.jobId <> $keepJobId)
+            SET j.status = 'abandoned',
+                j.finishedAt = datetime(),
+                j.validatedIds = [],
+                j.rejectedIds = []
+            RETURN j.jobId AS jobId
+            """,
+            statuses=ValidationJobRepository.RESUMABLE_STATUSES,
+            keepJobId=keep_job_id,
+        )
+        return [record["jobId"] for record in result]
+
+    @staticmethod
+    def get_job(job_id: str, with_ids: bool = False) -> dict | None:
+        """
+        Récupère un job et ses phases.
+
+        :param with_ids: inclure les listes validatedIds / rejectedIds (points de reprise)
+        :return: dict du job, ou None s'il n'existe pas
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            return session.execute_read(ValidationJobRepository._get_job_tx, job_id, with_ids)
+
+    @staticmethod
+    def _get_job_tx(tx, job_id: str, with_ids: bool) -> dict | None:
+        record = tx.run(
+            """
+            MATCH (j:ValidationJob {jobId: $jobId})
+            OPTIONAL MATCH (j)-[:HAS_PHASE]->(p:ValidationJobPhase)
+            WITH j, p ORDER BY p.position
+            RETURN j {
+                .jobId, .trigger, .runDate, .status, .currentPhase, .createdAt, .startedAt,
+                .finishedAt, .error, .voteCount, .validatedIds, .rejectedIds
+            } AS job,
+            collect(p { .name, .status, .done, .total, .duration }) AS phases
+            """,
+            jobId=job_id,
+        ).single()
+        if record is None:
+            return None
+
+        job = dict(record["job"])
+        for key in ("createdAt", "startedAt", "finishedAt"):
+            if hasattr(job.get(key), "to_native"):
+                job[key] = job[key].to_native()
+        if not with_ids:
+            job.pop("validatedIds")
+            job.pop("rejectedIds")
+        job["phases"] = record["phases"]
+        return job
+
+    @staticmethod
+    def start_job(job_id: str) -> None:
+        """
+        Passe le job en cours d'exécution (une reprise conserve la date de premier démarrage).
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            session.execute_write(ValidationJobRepository._start_job_tx, job_id)
+
+    @staticmethod
+    def _start_job_tx(tx, job_id: str):
+        tx.run(
+            """
+            MATCH (j:ValidationJob {jobId: $jobId})
+            SET j.status = 'running',
+                j.startedAt = coalesce(j.startedAt, datetime()),
+                j.error = null
+            """,
+            jobId=job_id,
+        )
+
+    @staticmethod
+    def finish_job(job_id: str, status: str, error: str | None = None) -> None:
+        """
+        Termine le job avec le statut `succeeded` ou `failed`.
+        Les listes de votes ne servent plus une fois le job réussi : elles sont vidées.
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            session.execute_write(ValidationJobRepository._finish_job_tx, job_id, status, error)
+
+    @staticmethod
+    def _finish_job_tx(tx, job_id: str, status: str, error: str | None):
+        tx.run(
+            """
+            MATCH (j:ValidationJob {jobId: $jobId})
+            SET j.status = $status,
+                j.error = $error,
+                j.finishedAt = datetime(),
+                j.currentPhase = CASE WHEN $status = 'succeeded' THEN null ELSE j.currentPhase END,
+                j.validatedIds = CASE WHEN $status = 'succeeded' THEN [] ELSE j.validatedIds END,
+                j.rejectedIds = CASE WHEN $status = 'succeeded' THEN [] ELSE j.rejectedIds END
+            """,
+            jobId=job_id,
+            status=status,
+            error=error,
+        )
+
+    # -------------------- PHASES --------------------
+
+    @staticmethod
+    def start_phase(job_id: str, phase: str) -> None:
+        """
+        Marque la phase comme en cours.
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            session.execute_write(ValidationJobRepository._start_phase_tx, job_id, phase)
+
+    @staticmethod
+    def _start_phase_tx(tx, job_id: str, phase: str):
+        tx.run(
+            """
+            MATCH (j:ValidationJob {jobId: $jobId})-[:HAS_PHASE]->(p:ValidationJobPhase {name: $phase})
+            SET j.currentPhase = $phase,
+                p.status = 'running'
+            """,
+            jobId=job_id,
+            phase=phase,
+        )
+
+    @staticmethod
+    def update_phase_progress(job_id: str, phase: str, done: int, total: int, rejected_ids: list[str]) -> None:
+        """
+        Enregistre l'avancement d'une phase et ajoute les votes rejetés depuis la dernière mise à jour,
+        pour qu'une reprise ne revalide pas les votes déjà traités.
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            session.execute_write(
+                ValidationJobRepository._update_phase_progress_tx, job_id, phase, done, total, rejected_ids
+            )
+
+    @staticmethod
+    def _update_phase_progress_tx(tx, job_id: str, phase: str, done: int, total: int, rejected_ids: list[str]):
+        tx.run(
+            """
+            MATCH (j:ValidationJob {jobId: $jobId})-[:HAS_PHASE]->(p:ValidationJobPhase {name: $phase})
+            SET p.done = $done,
+                p.total = $total,
+                j.rejectedIds = j.rejectedIds + $rejectedIds
+            """,
+            jobId=job_id,
+            phase=phase,
+            done=done,
+            total=total,
+            rejectedIds=rejected_ids,
+        )
+
+    @staticmethod
+    def complete_phase(job_id: str, phase: str, duration: float, checkpoint: dict | None = None) -> None:
+        """
+        Marque la phase comme terminée (point de reprise) et enregistre les propriétés de `checkpoint`
+        (voteCount, validatedIds, rejectedIds) dans la même transaction.
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            session.execute_write(
+                ValidationJobRepository._complete_phase_tx, job_id, phase, duration, checkpoint or {}
+            )
+
+    @staticmethod
+    def _complete_phase_tx(tx, job_id: str, phase: str, duration: float, checkpoint: dict):
+        tx.run(
+            """
+            MATCH (j:ValidationJob {jobId: $jobId})-[:HAS_PHASE]->(p:ValidationJobPhase {name: $phase})
+            SET j += $checkpoint,
+                p.status = 'done',
+                p.duration = $duration,
+                p.done = coalesce(p.total, p.done)
+            """,
+            jobId=job_id,
+            phase=phase,
+            duration=duration,
+            checkpoint=checkpoint,
+        )
@@ -1,7 +1,6 @@
 import datetime
-import json
+import heapq
 from app.neo4j_config import get_driver
-from uuid import *
 from typing import List
 
 class VoteRepository:
@@ -10,8 +9,40 @@ class VoteRepository:
 
     Modèle :
       (voter:User {id, threshold, publishVotes})
-          -[:VOTED {id, createdAt, domain, count, processed, valid, cycle, current}]->
+          -[:VOTED {id, createdAt, domain, count, processed, valid, cycle, current, dirty}]->
       (target:User {id, threshold, publishVotes})
+
+      (:DailyStat {userId, domain, date, count})   voix reçues par jour et par domaine
+      (:Leaderboard {domain, days, date})-[:HAS_ENTRY]->(:LeaderboardEntry {rank, userId, total, dates, counts})
+
+    Les requêtes de lecture partagées avec `AsyncVoteRepository` sont définies ci-dessous,
+    avec les fonctions qui mettent en forme leurs résultats.
+    """
+
+    RECEIVED_VOTES_SUMMARY_QUERY = """
+        MATCH (voter:User)-[rel:VOTED {current: true}]->(target:User {id: $userId})
+        WHERE $domain IS NULL OR rel.domain = $domain
+        RETURN rel.domain                 AS domain,
+               collect(DISTINCT voter.id) AS voters
+    """
+
+    LAST_DATE_QUERY = "MATCH (m:StatsMeta {id: 'daily_stats'}) RETURN m.lastDate AS lastDate"
+
+    CHARTS_QUERY = """
+        MATCH (l:Leaderboard {days: $days, date: $lastDate})
+        OPTIONAL MATCH (l)-[:HAS_ENTRY]->(e:LeaderboardEntry)
+        WITH l, e
+        ORDER BY e.rank
+        RETURN l.domain AS domain, collect(e) AS entries
+    """
+
+    ALL_DOMAINS_QUERY = "MATCH ()-[r:VOTED]->() WHERE r.current = true RETURN DISTINCT r.domain AS domain"
+
+    PUBLISH_VOTES_SETTING_QUERY = """
+        MATCH (u:User {id: $userId})
+        OPTIONAL MATCH (s:DailyStat {userId: $userId, date: date($lastDate)})
+        RETURN u.publishVotes AS publishVotes,
+               collect([s.domain, s.count]) AS counts
     """
 
     @staticmethod
@@ -210,19 +241,15 @@ class VoteRepository:
 
     @staticmethod
     def _get_received_votes_summary_tx(tx, user_id: str, domain: str | None) -> dict:
-        query = """
-                MATCH (voter:User)-[rel:VOTED {current: true}]->(target:User {id: $userId})
-                WHERE $domain IS NULL OR rel.domain = $domain
-                RETURN rel.domain                 AS domain,
-                       collect(DISTINCT voter.id) AS voters
-            """
-
         records = tx.run(
-            query,
+            VoteRepository.RECEIVED_VOTES_SUMMARY_QUERY,
             userId=str(user_id),
             domain=domain,
         )
+        return VoteRepository._received_votes_summary(user_id, records)
 
+    @staticmethod
+    def _received_votes_summary(user_id: str, records) -> dict:
         users_by_domain: dict[str, list[str]] = {}
 
         for record in records:
@@ -269,6 +296,32 @@ class VoteRepository:
         # Retourne uniquement les identifiants des relations
         return [row["relId"] for row in results]
 
+    @staticmethod
+    def filter_unprocessed_votes(rel_ids: list[str]) -> list[str]:
+        """
+        Parmi `rel_ids`, retourne (dans le même ordre) les relations VOTED encore non traitées.
+        Sert à reprendre une validation interrompue sans revalider les votes déjà traités.
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            unprocessed = set(session.execute_read(
+                VoteRepository._filter_unprocessed_votes_tx, rel_ids
+            ))
+        return [rel_id for rel_id in rel_ids if rel_id in unprocessed]
+
+    @staticmethod
+    def _filter_unprocessed_votes_tx(tx, rel_ids: list[str]) -> list[str]:
+        results = tx.run(
+            """
+            MATCH (:User)-[v:VOTED]->(:User)
+            WHERE elementId(v) IN $ids
+              AND coalesce(v.processed, false) = false
+            RETURN elementId(v) AS relId
+            """,
+            ids=rel_ids,
+        ).data()
+        return [row["relId"] for row in results]
+
 
     # -------------------- MARQUAGE D'UN VOTE VALIDE --------------------
 
@@ -365,17 +418,19 @@ class VoteRepository:
             MATCH (voter:User)-[v:VOTED {processed: false}]->(target:User)
             WITH voter, v.domain AS vDomain, target
             MATCH (voter)-[v2:VOTED {current: true, domain: vDomain}]->(target)
-            SET v2.current = false
+            SET v2.current = false,
+                v2.dirty = true
             """
         )
         
 
         # Valide toutes les self-loop non traitées (processed=false)
         # Celles-ci sont marquées processed=true et valid=true
+        # Les relations désactivées ou validées ici sont marquées `dirty` pour le recalcul incrémental
         tx.run(
             """
             MATCH (u:User)-[v:VOTED {processed: false}]->(u)
-            SET v.processed = true, v.valid = true, v.current = true
+            SET v.processed = true, v.valid = true, v.current = true, v.dirty = true
             """
         )
 
@@ -578,7 +633,198 @@ class VoteRepository:
     def _cleanup_recalculation_by_domain_tx(tx):
         # Supprime le graphe global projeté dans GDS
         tx.run("CALL gds.graph.drop('myGraph') YIELD graphName")
-    
+
+
+    # -------------------- LECTURE / ECRITURE EN MASSE POUR LE MOTEUR EN MEMOIRE --------------------
+
+    @staticmethod
+    def fetch_current_edges_by_domain(domain: str) -> list[dict]:
+        """
+        Récupère en une seule requête toutes les relations VOTED current=true d'un domaine.
+
+        :param domain: domaine à charger
+        :return: liste de dict { relId, sourceId, targetId, count, cycle }
+                 (elementId() des relations et des nœuds, poids actuellement stockés)
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            return session.execute_read(VoteRepository._fetch_current_edges_by_domain_tx, domain)
+
+    @staticmethod
+    def _fetch_current_edges_by_domain_tx(tx, domain: str) -> list[dict]:
+        return tx.run(
+            """
+            MATCH (u1:User)-[r:VOTED]->(u2:User)
+            WHERE r.domain = $domain
+            AND r.current = true
+            RETURN elementId(r)  AS relId,
+                   elementId(u1) AS sourceId,
+                   elementId(u2) AS targetId,
+                   r.count       AS count,
+                   coalesce(r.cycle, false) AS cycle
+            """,
+            domain=domain
+        ).data()
+
+    @staticmethod
+    def fetch_dirty_seeds() -> dict[str, set[str]]:
+        """
+        Récupère, par domaine, les extrémités des relations VOTED marquées `dirty`
+        (votes désactivés ou self-loops validées depuis le dernier recalcul).
+
+        :return: dict { domain: ensemble des elementId() des votants et de leurs anciennes cibles }
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            return session.execute_read(VoteRepository._fetch_dirty_seeds_tx)
+
+    @staticmethod
+    def _fetch_dirty_seeds_tx(tx) -> dict[str, set[str]]:
+        rows = tx.run(
+            """
+            MATCH (u1:User)-[r:VOTED {dirty: true}]->(u2:User)
+            RETURN r.domain AS domain,
+                   collect(DISTINCT elementId(u1)) + collect(DISTINCT elementId(u2)) AS nodeIds
+            """
+        ).data()
+        return {row["domain"]: set(row["nodeIds"]) for row in rows}
+
+    @staticmethod
+    def clear_dirty_votes(domain: str | None = None) -> None:
+        """
+        Retire la marque `dirty` des relations VOTED d'un domaine (de tous les domaines si None),
+        une fois leurs poids recalculés.
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            session.execute_write(VoteRepository._clear_dirty_votes_tx, domain)
+
+    @staticmethod
+    def _clear_dirty_votes_tx(tx, domain: str | None):
+        tx.run(
+            """
+            MATCH (:User)-[r:VOTED {dirty: true}]->(:User)
+            WHERE $domain IS NULL OR r.domain = $domain
+            REMOVE r.dirty
+            """,
+            domain=domain,
+        )
+
+    @staticmethod
+    def write_counts(rows: list[dict]) -> None:
+        """
+        Écrit en un seul UNWIND les propriétés `count` et `cycle` d'un lot de relations VOTED.
+
+        :param rows: liste de dict { relId, count, cycle }
+        """
+        if not rows:
+            return
+
+        driver = get_driver()
+        with driver.session() as session:
+            session.execute_write(VoteRepository._write_counts_tx, rows)
+
+    @staticmethod
+    def _write_counts_tx(tx, rows: list[dict]):
+        tx.run(
+            """
+            UNWIND $rows AS row
+            MATCH (:User)-[r:VOTED]->(:User)
+            WHERE elementId(r) = row.relId
+            SET r.count = row.count, r.cycle = row.cycle
+            """,
+            rows=rows
+        )
+
+
+    # -------------------- VALIDATION PAR LOTS --------------------
+
+    @staticmethod
+    def fetch_votes_by_ids(rel_ids: list[str]) -> list[dict]:
+        """
+        Récupère en une requête le votant, la cible, le domaine et les seuils d'une liste de votes.
+
+        :param rel_ids: elementId() des relations VOTED
+        :return: liste de dict { relId, voterId, targetId, domain, voterThreshold, targetThreshold }
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            return session.execute_read(VoteRepository._fetch_votes_by_ids_tx, rel_ids)
+
+    @staticmethod
+    def _fetch_votes_by_ids_tx(tx, rel_ids: list[str]) -> list[dict]:
+        return tx.run(
+            """
+            UNWIND $relIds AS relId
+            MATCH (u:User)-[v:VOTED]->(t:User)
+            WHERE elementId(v) = relId
+            RETURN relId,
+                   elementId(u) AS voterId,
+                   elementId(t) AS targetId,
+                   v.domain     AS domain,
+                   u.threshold  AS voterThreshold,
+                   t.threshold  AS targetThreshold
+            """,
+            relIds=rel_ids
+        ).data()
+
+    @staticmethod
+    def fetch_domain_state(domain: str) -> list[dict]:
+        """
+        Récupère en une requête l'état de délégation d'un domaine :
+        toutes les relations VOTED current=true avec leurs poids et les seuils de leurs extrémités.
+
+        :return: liste de dict { relId, sourceId, targetId, count, cycle, sourceThreshold, targetThreshold }
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            return session.execute_read(VoteRepository._fetch_domain_state_tx, domain)
+
+    @staticmethod
+    def _fetch_domain_state_tx(tx, domain: str) -> list[dict]:
+        return tx.run(
+            """
+            MATCH (u1:User)-[r:VOTED]->(u2:User)
+            WHERE r.domain = $domain
+            AND r.current = true
+            RETURN elementId(r)  AS relId,
+                   elementId(u1) AS sourceId,
+                   elementId(u2) AS targetId,
+                   r.count       AS count,
+                   r.cycle       AS cycle,
+                   u1.threshold  AS sourceThreshold,
+                   u2.threshold  AS targetThreshold
+            """,
+            domain=domain
+        ).data()
+
+    @staticmethod
+    def save_validation_batch(valid_ids: list[str], rows: list[dict]) -> None:
+        """
+        Marque un lot de votes comme validés et écrit les poids des relations modifiées,
+        dans une seule transaction.
+
+        :param valid_ids: elementId() des votes validés
+        :param rows: liste de dict { relId, count, cycle }
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            session.execute_write(VoteRepository._save_validation_batch_tx, valid_ids, rows)
+
+    @staticmethod
+    def _save_validation_batch_tx(tx, valid_ids: list[str], rows: list[dict]):
+        tx.run(
+            """
+            MATCH (:User)-[v:VOTED]->(:User)
+            WHERE elementId(v) IN $ids
+            SET v.processed = true,
+                v.valid = true,
+                v.current = true
+            """,
+            ids=valid_ids,
+        )
+        VoteRepository._write_counts_tx(tx, rows)
+
 
     # -------------------- VERIFICATION DE LA VALIDITE D'UN VOTE --------------------
     
@@ -605,59 +851,32 @@ class VoteRepository:
             """
             MATCH (u:User)-[v:VOTED]->(t:User)
             WHERE elementId(v) = $relId
-            RETURN elementId(u) AS voterId, v.domain AS domain, t as target
+            RETURN elementId(u) AS voterId, v.domain AS domain,
+                   elementId(t) AS targetId, t.threshold AS targetThreshold
             """,
             relId=rel_id
         ).single()
         voter_id = rec["voterId"]
-        target = rec["target"]
+        target_id = rec["targetId"]
         domain = rec["domain"]
 
         # Si la relation est un auto-vote (u == t), on marque comme cycle
-        if voter_id == target.element_id:
+        if voter_id == target_id:
             return 0, [], True
 
-        # Recherche du chemin des votes valides à partir de la cible
-        path = tx.run(
-            """
-            MATCH p = ((start:User)-[:VOTED* {domain: $domain, current: true}]->(n:User)
-            WHERE elementId(start) = $startId)
-            WITH nodes(p) AS allNodes, relationships(p) AS allRels
-            ORDER BY length(p) DESC
-            LIMIT 1
-            RETURN allNodes, allRels
-            """,
-            startId=target.element_id,
-            domain=domain
-        ).single()
-        nodes = path["allNodes"] or [] if path else []
-        rels = path["allRels"] or [] if path else []
+        # Chaîne des votes valides à partir de la cible
+        nodes, rels = VoteRepository._walk_chain_tx(tx, target_id, rec["targetThreshold"], domain)
 
         # Si le dernier rel est une self-loop, on l’enlève
-        if len(rels) and rels[-1].nodes[0].element_id == rels[-1].nodes[1].element_id:
+        if rels and rels[-1]["sourceId"] == rels[-1]["targetId"]:
             rels.pop()
             nodes.pop()
-        elif not len(nodes):
-            # S’il n’y a pas de chemin, on considère juste la cible
-            nodes = [target]
 
         # Calcul des counts entrantes jusqu’au votant
-        incoming_rec = tx.run(
-            """
-            MATCH (:User)-[inR:VOTED]->(u:User)
-            WHERE elementId(u) = $endId
-            AND inR.cycle = false
-            AND inR.domain = $domain
-            AND inR.current = true
-            RETURN sum(coalesce(inR.count, 0)) AS incoming
-            """,
-            endId=voter_id,
-            domain=domain
-        ).single()
-        incoming = incoming_rec["incoming"] or 0
+        incoming = VoteRepository._incoming_count_tx(tx, voter_id, domain)
         
         violated = False
-        cycle = nodes[-1].element_id == voter_id
+        cycle = nodes[-1]["id"] == voter_id
 
         if cycle:
             # Si c’est un cycle, vérifier seuils de tous les nœuds du cycle
@@ -670,8 +889,8 @@ class VoteRepository:
         else:
             # Chemin “normal” sans cycle
             for rel in rels:
-                threshold = rel.nodes[0]["threshold"]
-                incoming_sum = rel["count"] + incoming
+                threshold = rel["sourceThreshold"]
+                incoming_sum = (rel["count"] or 0) + incoming
                 if rel["cycle"]:
                     incoming_sum += 1
                 if threshold != -1 and incoming_sum > threshold:
@@ -682,27 +901,81 @@ class VoteRepository:
                 # Vérification supplémentaire avec le dernier nœud
                 last_node_threshold = nodes[-1]["threshold"]
                 if not(last_node_threshold == -1 or (len(rels) and rels[-1]["cycle"])):
-                    last_node_incoming_rec = tx.run(
-                        """
-                        MATCH (:User)-[inR:VOTED]->(u:User)
-                        WHERE elementId(u) = $endId
-                        AND inR.cycle = false
-                        AND inR.domain = $domain
-                        AND inR.current = true
-                        RETURN sum(coalesce(inR.count, 0)) AS incoming
-                        """,
-                        endId=nodes[-1].element_id,
-                        domain=domain
-                    ).single()
-                    last_node_incoming = last_node_incoming_rec["incoming"] or 0
-                    if last_node_incoming + incoming > nodes[-1]["threshold"]:
+                    last_node_incoming = VoteRepository._incoming_count_tx(tx, nodes[-1]["id"], domain)
+                    if last_node_incoming + incoming > last_node_threshold:
                         violated = True
 
         if violated:
             return -1, None, cycle
         
         # Si tout est OK, on renvoie le count, les relations du chemin, et si on crée un cycle
-        return incoming + 1, [rel.element_id for rel in rels], cycle
+        return incoming + 1, [rel["relId"] for rel in rels], cycle
+
+    @staticmethod
+    def _walk_chain_tx(tx, start_id: str, start_threshold: int, domain: str) -> tuple[list[dict], list[dict]]:
+        """
+        Suit la chaîne des votes current=true d'un domaine depuis `start_id`.
+
+        Chaque votant n'a qu'un vote courant par domaine : on suit l'unique relation sortante
+        à chaque saut (une requête indexée par saut) et on s'arrête dès qu'une relation serait réutilisée,
+        c'est-à-dire au retour sur un nœud déjà quitté. Le coût est linéaire en la longueur de la chaîne,
+        au lieu d'énumérer tous les chemins de longueur variable.
+
+        :return: (nœuds { id, threshold }, relations { relId, sourceId, targetId, sourceThreshold, count, cycle }),
+                 comme le plus long chemin sans relation répétée (le nœud répété termine la liste des nœuds)
+        """
+        nodes = [{"id": start_id, "threshold": start_threshold}]
+        rels: list[dict] = []
+        used: set[str] = set()
+
+        while True:
+            node = nodes[-1]
+            rec = tx.run(
+                """
+                MATCH (u:User)-[r:VOTED {domain: $domain, current: true}]->(t:User)
+                WHERE elementId(u) = $nodeId
+                AND NOT elementId(r) IN $used
+                RETURN elementId(r) AS relId,
+                       elementId(t) AS targetId,
+                       t.threshold AS targetThreshold,
+                       r.count AS count,
+                       coalesce(r.cycle, false) AS cycle
+                LIMIT 1
+                """,
+                nodeId=node["id"],
+                domain=domain,
+                used=list(used),
+            ).single()
+            if rec is None:
+                return nodes, rels
+
+            used.add(rec["relId"])
+            rels.append({
+                "relId": rec["relId"],
+                "sourceId": node["id"],
+                "targetId": rec["targetId"],
+                "sourceThreshold": node["threshold"],
+                "count": rec["count"],
+                "cycle": rec["cycle"],
+            })
+            nodes.append({"id": rec["targetId"], "threshold": rec["targetThreshold"]})
+
+    @staticmethod
+    def _incoming_count_tx(tx, node_id: str, domain: str) -> int:
+        # Somme des counts entrants non cycliques (cycle = false) d'un nœud
+        rec = tx.run(
+            """
+            MATCH (:User)-[inR:VOTED]->(u:User)
+            WHERE elementId(u) = $endId
+            AND inR.cycle = false
+            AND inR.domain = $domain
+            AND inR.current = true
+            RETURN sum(coalesce(inR.count, 0)) AS incoming
+            """,
+            endId=node_id,
+            domain=domain
+        ).single()
+        return rec["incoming"] or 0
     
 
     # -------------------- MISE A JOUR DES COUNTS D'UN NOUVEAU VOTE VALIDE --------------------
@@ -765,11 +1038,12 @@ class VoteRepository:
     @staticmethod
     def append_daily_stats(date: datetime.date | None = None) -> int:
         """
-        Pour chaque User, ajoute dans la map `stats` une entrée dont la clé est la date (YYYY-MM-DD)
-        et la valeur est le nombre de voix reçues ce jour :
+        Pour chaque User et chaque domaine, enregistre un nœud
+        (:DailyStat {userId, domain, date, count}) contenant le nombre de voix reçues ce jour :
           - si l'utilisateur a au moins une relation entrante VOTED current=true avec cycle=true,
             on prend la valeur `count` de l'une de ces relations (elles ont la même valeur pour un cycle),
           - sinon on prend la somme des `count` de toutes les relations entrantes current=true.
+        Les DailyStat déjà présents pour cette date sont remplacés.
         Retourne le nombre d'utilisateurs mis à jour.
         """
         if date is None:
@@ -782,28 +1056,26 @@ class VoteRepository:
 
     @staticmethod
     def _append_daily_stats_tx(tx, date_str: str) -> int:
+        tx.run(
+            "MATCH (s:DailyStat) WHERE s.date = date($dateStr) DETACH DELETE s",
+            dateStr=date_str,
+        )
+
         res = tx.run(
             """
-            MATCH (u:User)
-            OPTIONAL MATCH (u)<-[r:VOTED {current: true}]-(:User)
-            WITH u, collect(r) AS rels
-            UNWIND [d IN [x IN rels | x.domain] WHERE d IS NOT NULL] AS domain
-            WITH u, domain, [x IN rels WHERE x.domain = domain] AS relsByDomain
+            MATCH (u:User)<-[r:VOTED {current: true}]-(:User)
+            WHERE r.domain IS NOT NULL
+            WITH u, r.domain AS domain, collect(r) AS relsByDomain
             WITH u, domain,
                  [x IN relsByDomain WHERE coalesce(x.cycle, false) = true] AS cycles,
                  reduce(total = 0, y IN relsByDomain | total + coalesce(y.count, 0)) AS totalSum
-            WITH u, domain,
-                 CASE WHEN size(cycles) > 0 THEN cycles[0].count ELSE totalSum END AS votes
-            WITH u, collect([domain, votes]) AS entries
-            WITH u, apoc.map.fromPairs(entries) AS domainMap
-            SET u.stats = apoc.convert.toJson(
-                apoc.map.setKey(
-                    apoc.convert.fromJsonMap(coalesce(u.stats, '{}')),
-                    $dateStr,
-                    domainMap
-                )
-            )
-            WITH count(u) AS updated
+            CREATE (:DailyStat {
+                userId: u.id,
+                domain: domain,
+                date:   date($dateStr),
+                count:  coalesce(CASE WHEN size(cycles) > 0 THEN cycles[0].count ELSE totalSum END, 0)
+            })
+            WITH count(DISTINCT u) AS updated
             MERGE (m:StatsMeta {id: 'daily_stats'})
             SET m.lastDate = $dateStr
             RETURN updated
@@ -812,15 +1084,89 @@ class VoteRepository:
         ).single()
 
         return int(res["updated"]) if res is not None else 0
-    
+
+
+    # -------------------- MIGRATION DES ANCIENNES STATS JSON --------------------
+
+    @staticmethod
+    def fetch_stats_blobs(limit: int) -> list[dict]:
+        """
+        Récupère au plus `limit` utilisateurs ayant encore une propriété `stats` (JSON string).
+        Retourne une liste de dict { userId, stats }.
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            return session.execute_read(VoteRepository._fetch_stats_blobs_tx, limit)
+
+    @staticmethod
+    def _fetch_stats_blobs_tx(tx, limit: int) -> list[dict]:
+        return tx.run(
+            """
+            MATCH (u:User)
+            WHERE u.stats IS NOT NULL
+            RETURN u.id AS userId, u.stats AS stats
+            LIMIT $limit
+            """,
+            limit=limit,
+        ).data()
+
+    @staticmethod
+    def replace_stats_blobs(user_ids: list[str], rows: list[dict]) -> None:
+        """
+        Crée les DailyStat issus des anciennes stats JSON puis supprime la propriété `stats`
+        des utilisateurs migrés, dans une seule transaction.
+
+        :param user_ids: utilisateurs dont la propriété `stats` est supprimée
+        :param rows: liste de dict { userId, domain, date (YYYY-MM-DD), count }
+        """
+        driver = get_driver()
+        with driver.session() as session:
+            session.execute_write(VoteRepository._replace_stats_blobs_tx, user_ids, rows)
+
+    @staticmethod
+    def _replace_stats_blobs_tx(tx, user_ids: list[str], rows: list[dict]):
+        tx.run(
+            """
+            UNWIND $rows AS row
+            MERGE (s:DailyStat {userId: row.userId, domain: row.domain, date: date(row.date)})
+            SET s.count = row.count
+            """,
+            rows=rows,
+        )
+        tx.run(
+            """
+            MATCH (u:User)
+            WHERE u.id IN $userIds
+            REMOVE u.stats
+            """,
+            userIds=user_ids,
+        )
+
 
     # -------------------- RECUPERATION DES STATS DE VOTES --------------------
 
-    def get_daily_votes_to_user(user_id: uuid4, days: int = 30) -> tuple[list[dict], bool]:
+    @staticmethod
+    def _get_last_date_tx(tx) -> datetime.date:
+        return VoteRepository._last_date(tx.run(VoteRepository.LAST_DATE_QUERY).single())
+
+    @staticmethod
+    def _last_date(meta) -> datetime.date:
+        # Date du dernier calcul des stats (string YYYY-MM-DD ou date Neo4j), aujourd'hui par défaut
+        last_date = meta["lastDate"] if meta is not None else None
+        if hasattr(last_date, "to_native"):
+            return last_date.to_native()
+        try:
+            return datetime.date.fromisoformat(last_date) if last_date else datetime.date.today()
+        except Exception:
+            return datetime.date.today()
+
+    @staticmethod
+    def get_daily_votes_to_user(user_id: str, days: int = 30) -> tuple[list[dict], bool]:
         """
-        Retourne une liste d'objets { date: 'YYYY-MM-DD', count: int, byDomain: {domain:count} }
-        triée par date décroissante, limitée à `days`.
-        Lit la propriété u.stats (JSON string) et la parse côté application.
+        Retourne une liste d'objets { domain, series: [{date: 'YYYY-MM-DD', count: int}] }
+        avec chaque série triée par date décroissante et limitée aux `days` derniers jours,
+        ainsi que le paramètre publishVotes de l'utilisateur.
+        Seuls les DailyStat de la période sont lus.
         """
         drv = get_driver()
         with drv.session() as session:
@@ -828,66 +1174,45 @@ class VoteRepository:
 
     @staticmethod
     def _get_daily_votes_to_user_tx(tx, user_id: str, days: int) -> tuple[list[dict], bool]:
-        meta = tx.run("MATCH (m:StatsMeta {id: 'daily_stats'}) RETURN m.lastDate AS lastDate").single()
-        last_date_str = meta["lastDate"] if meta and meta["lastDate"] is not None else None
-        try:
-            last_date = datetime.date.fromisoformat(last_date_str) if last_date_str else datetime.date.today()
-        except Exception:
-            last_date = datetime.date.today()
-        
-        rec = tx.run(
-            """
-            MATCH (u:User {id: $userId})
-            RETURN u.stats AS stats, u.publishVotes AS publishVotes
-            """,
+        last_date = VoteRepository._get_last_date_tx(tx)
+        cutoff = last_date - datetime.timedelta(days=days-1)
+
+        user = tx.run(
+            "MATCH (u:User {id: $userId}) RETURN u.publishVotes AS publishVotes",
             userId=user_id
         ).single()
-        stats_json = rec["stats"] if rec is not None else None
-        if not stats_json:
-            return []
+        publish_votes = user["publishVotes"] if user is not None else False
 
-        try:
-            stats_map = json.loads(stats_json)
-        except Exception:
-            return []
+        res = tx.run(
+            """
+            MATCH (s:DailyStat {userId: $userId})
+            WHERE s.date >= date($cutoff) AND s.date <= date($lastDate)
+            RETURN s.domain AS domain, toString(s.date) AS date, s.count AS count
+            ORDER BY s.date DESC
+            """,
+            userId=user_id,
+            cutoff=cutoff.isoformat(),
+            lastDate=last_date.isoformat(),
+        )
 
-        cutoff = last_date - datetime.timedelta(days=days-1)
-        # domain -> list of {date, count}
+        # domain -> list of {date, count}, déjà triée par date décroissante
         domain_series: dict[str, list[dict]] = {}
+        for rec in res:
+            domain_series.setdefault(rec["domain"], []).append(
+                {"date": rec["date"], "count": int(rec["count"] or 0)}
+            )
 
-        for date_str, domain_map in stats_map.items():
-            try:
-                d = datetime.date.fromisoformat(date_str)
-            except Exception:
-                continue
-            if d < cutoff or d > last_date:
-                continue
-            if not isinstance(domain_map, dict):
-                continue
-            for dom, v in domain_map.items():
-                try:
-                    val = int(v)
-                except Exception:
-                    val = 0
-                if dom not in domain_series:
-                    domain_series[dom] = []
-                domain_series[dom].append({"date": date_str, "count": val})
-
-        # trier chaque série par date décroissante
-        result: list[dict] = []
-        for dom, series in domain_series.items():
-            series.sort(key=lambda e: e["date"], reverse=True)
-            result.append({"domain": dom, "series": series})
+        result = [{"domain": dom, "series": series} for dom, series in domain_series.items()]
 
         # trier domaines par somme décroissante (utile pour présentation)
         result.sort(key=lambda entry: sum(item["count"] for item in entry["series"]), reverse=True)
-        return (result, rec["publishVotes"] if rec is not None else False)
+        return (result, publish_votes)
 
     @staticmethod
     def get_monthly_votes_to_user(user_id: str, months: int = 12) -> List[dict]:
         """
-        Agrège les valeurs journalières en mois (année, mois, count) et retourne
-        une liste triée par (year, month) décroissant limitée à `months`.
+        Agrège les valeurs journalières des `months` derniers mois en mois (année, mois, count)
+        et retourne pour chaque domaine une série triée par (year, month) décroissant.
         """
         drv = get_driver()
         with drv.session() as session:
@@ -895,130 +1220,210 @@ class VoteRepository:
 
     @staticmethod
     def _get_monthly_votes_to_user_tx(tx, user_id: str, months: int) -> List[dict]:
-        meta = tx.run("MATCH (m:StatsMeta {id: 'daily_stats'}) RETURN m.lastDate AS lastDate").single()
-        last_date_str = meta["lastDate"] if meta and meta["lastDate"] is not None else None
-        try:
-            last_date = datetime.date.fromisoformat(last_date_str) if last_date_str else datetime.date.today()
-        except Exception:
-            last_date = datetime.date.today()
+        last_date = VoteRepository._get_last_date_tx(tx)
+        # Premier jour du mois le plus ancien de la fenêtre
+        first_month = last_date.year * 12 + last_date.month - 1 - (months - 1)
+        cutoff = datetime.date(first_month // 12, first_month % 12 + 1, 1)
 
-        rec = tx.run(
+        res = tx.run(
             """
-            MATCH (u:User {id: $userId})
-            RETURN u.stats AS stats
+            MATCH (s:DailyStat {userId: $userId})
+            WHERE s.date >= date($cutoff) AND s.date <= date($lastDate)
+            RETURN s.domain AS domain, s.date.year AS year, s.date.month AS month, sum(s.count) AS count
+            ORDER BY year DESC, month DESC
             """,
-            userId=user_id
-        ).single()
-        stats_json = rec["stats"] if rec is not None else None
-        if not stats_json:
-            return []
-
-        try:
-            stats_map = json.loads(stats_json)
-        except Exception:
-            return []
+            userId=user_id,
+            cutoff=cutoff.isoformat(),
+            lastDate=last_date.isoformat(),
+        )
 
-        monthly_per_domain: dict[str, dict[tuple[int,int], int]] = {}
+        # pour chaque domaine une série triée (year,month) desc
+        monthly_per_domain: dict[str, list[dict]] = {}
+        for rec in res:
+            monthly_per_domain.setdefault(rec["domain"], []).append(
+                {"year": rec["year"], "month": rec["month"], "count": int(rec["count"] or 0)}
+            )
 
-        for date_str, domain_map in stats_map.items():
-            try:
-                d = datetime.date.fromisoformat(date_str)
-            except Exception:
-                continue
-            if d > last_date:
-                continue
-            if not isinstance(domain_map, dict):
-                continue
-            year_month = (d.year, d.month)
-            for dom, v in domain_map.items():
-                try:
-                    val = int(v)
-                except Exception:
-                    val = 0
-                monthly_per_domain.setdefault(dom, {})
-                monthly_per_domain[dom][year_month] = monthly_per_domain[dom].get(year_month, 0) + val
-
-        # construire le résultat : pour chaque domaine une série triée (year,month) desc
-        result: list[dict] = []
-        for dom, map_ym in monthly_per_domain.items():
-            series = [
-                {"year": ym[0], "month": ym[1], "count": cnt}
-                for ym, cnt in map_ym.items()
-            ]
-            series.sort(key=lambda e: (e["year"], e["month"]), reverse=True)
-            result.append({"domain": dom, "series": series[:months]})
+        result = [{"domain": dom, "series": series} for dom, series in monthly_per_domain.items()]
 
         # trier domaines par total décroissant
         result.sort(key=lambda entry: sum(item["count"] for item in entry["series"]), reverse=True)
         return result
 
     @staticmethod
-    def get_chart_for_domain(domain: str, days: int = 30) -> List[dict]:
+    def compute_charts(domains: List[str], days: int = 30, top: int = 10) -> dict[str, List[dict]]:
         """
-        Pour un domaine donné, retourne les top 10 users (sur la période `days`)
-        avec pour chacun la série journalière [{date, count}] (triée décroissante).
+        Pour chaque domaine donné, calcule les top `top` users (sur la période `days`)
+        avec pour chacun le total et la série journalière [{date, count}] (triée décroissante).
+        Seuls les DailyStat de la période sont lus, en une requête pour tous les domaines.
+        Retourne { domain: [ {userId, total, votes}, ... ] }.
         """
         drv = get_driver()
         with drv.session() as session:
-            return session.execute_read(VoteRepository._get_chart_for_domain_tx, domain, days)
+            return session.execute_read(VoteRepository._compute_charts_tx, domains, days, top)
 
     @staticmethod
-    def _get_chart_for_domain_tx(tx, domain: str, days: int) -> List[dict]:
-        meta = tx.run("MATCH (m:StatsMeta {id: 'daily_stats'}) RETURN m.lastDate AS lastDate").single()
-        last_date_str = meta["lastDate"] if meta and meta["lastDate"] is not None else None
-        try:
-            last_date = datetime.date.fromisoformat(last_date_str) if last_date_str else datetime.date.today()
-        except Exception:
-            last_date = datetime.date.today()
+    def _compute_charts_tx(tx, domains: List[str], days: int, top: int) -> dict[str, List[dict]]:
+        last_date = VoteRepository._get_last_date_tx(tx)
+        cutoff = last_date - datetime.timedelta(days=days-1)
 
-        # Récupère tous les users qui ont une propriété stats
+        # Ne lit que les DailyStat non nuls des domaines sur la période
         res = tx.run(
             """
-            MATCH (u:User)
-            WHERE u.stats IS NOT NULL
-            RETURN u.id AS userId, u.stats AS stats
-            """
+            MATCH (s:DailyStat)
+            WHERE s.domain IN $domains
+            AND s.date >= date($cutoff) AND s.date <= date($lastDate)
+            AND s.count > 0
+            RETURN s.domain AS domain, s.userId AS userId, toString(s.date) AS date, s.count AS count
+            ORDER BY s.date DESC
+            """,
+            domains=domains,
+            cutoff=cutoff.isoformat(),
+            lastDate=last_date.isoformat(),
         )
 
-        cutoff = last_date - datetime.timedelta(days=days-1)
-        per_user = []
+        per_domain: dict[str, dict[str, dict]] = {domain: {} for domain in domains}
         for rec in res:
-            user_id = rec["userId"]
-            stats_json = rec["stats"]
-            try:
-                stats_map = json.loads(stats_json)
-            except Exception:
-                continue
+            entry = per_domain[rec["domain"]].setdefault(
+                rec["userId"], {"userId": rec["userId"], "total": 0, "votes": []}
+            )
+            entry["votes"].append({"date": rec["date"], "count": rec["count"]})
+            entry["total"] += rec["count"]
+
+        # trier par total desc et garder le top
+        return {
+            domain: heapq.nsmallest(top, per_user.values(), key=lambda u: (-u["total"], u["userId"]))
+            for domain, per_user in per_domain.items()
+        }
+
+    @staticmethod
+    def get_charts(days: int) -> dict[str, List[dict]]:
+        """
+        Lit les classements matérialisés pour la fenêtre `days` et la dernière date de calcul.
+        Retourne { domain: [ {userId, total, votes}, ... ] }, vide si la fenêtre n'est pas matérialisée.
+        """
+        drv = get_driver()
+        with drv.session() as session:
+            return session.execute_read(VoteRepository._get_charts_tx, days)
+
+    @staticmethod
+    def _get_charts_tx(tx, days: int) -> dict[str, List[dict]]:
+        last_date = VoteRepository._get_last_date_tx(tx)
+        res = tx.run(
+            VoteRepository.CHARTS_QUERY,
+            days=days,
+            lastDate=last_date.isoformat(),
+        )
+        return VoteRepository._charts(res)
+
+    @staticmethod
+    def _charts(res) -> dict[str, List[dict]]:
+        return {
+            rec["domain"]: [
+                {
+                    "userId": entry["userId"],
+                    "total": entry["total"],
+                    "votes": [
+                        {"date": date, "count": count}
+                        for date, count in zip(entry["dates"], entry["counts"])
+                    ],
+                }
+                for entry in rec["entries"]
+            ]
+            for rec in res
+        }
+
+    @staticmethod
+    def save_charts(charts: dict[str, List[dict]], days: int) -> None:
+        """
+        Matérialise les classements { domain: [ {userId, total, votes}, ... ] } de la fenêtre `days`
+        pour la dernière date de calcul, en remplaçant ceux déjà présents.
+        """
+        drv = get_driver()
+        with drv.session() as session:
+            session.execute_write(VoteRepository._save_charts_tx, VoteRepository._boards(charts), days)
+
+    @staticmethod
+    def replace_charts(charts_by_days: dict[int, dict[str, List[dict]]]) -> None:
+        """
+        Remplace tous les classements matérialisés par ceux de `charts_by_days`
+        ({ days: { domain: [ {userId, total, votes}, ... ] } }), dans une seule transaction.
+        """
+        drv = get_driver()
+        with drv.session() as session:
+            session.execute_write(
+                VoteRepository._replace_charts_tx,
+                {days: VoteRepository._boards(charts) for days, charts in charts_by_days.items()},
+            )
+
+    @staticmethod
+    def _replace_charts_tx(tx, boards_by_days: dict[int, List[dict]]):
+        VoteRepository._clear_charts_tx(tx)
+        for days, boards in boards_by_days.items():
+            VoteRepository._save_charts_tx(tx, boards, days)
+
+    @staticmethod
+    def _boards(charts: dict[str, List[dict]]) -> List[dict]:
+        return [
+            {
+                "domain": domain,
+                "entries": [
+                    {
+                        "rank": rank,
+                        "userId": user["userId"],
+                        "total": user["total"],
+                        "dates": [vote["date"] for vote in user["votes"]],
+                        "counts": [vote["count"] for vote in user["votes"]],
+                    }
+                    for rank, user in enumerate(users)
+                ],
+            }
+            for domain, users in charts.items()
+        ]
 
-            day_entries = []
-            total = 0
-            for date_str, domain_map in stats_map.items():
-                try:
-                    d = datetime.date.fromisoformat(date_str)
-                except Exception:
-                    continue
-                # n'utiliser que les dates entre cutoff et last_date
-                if d < cutoff or d > last_date:
-                    continue
-                count_for_domain = 0
-                if isinstance(domain_map, dict):
-                    val = domain_map.get(domain)
-                    try:
-                        count_for_domain = int(val) if val is not None else 0
-                    except Exception:
-                        count_for_domain = 0
-                if count_for_domain > 0:
-                    day_entries.append({"date": date_str, "count": count_for_domain})
-                    total += count_for_domain
-
-            if total > 0:
-                # trier day_entries par date desc
-                day_entries.sort(key=lambda e: e["date"], reverse=True)
-                per_user.append({"userId": user_id, "total": total, "votes": day_entries})
-
-        # trier par total desc et garder top 10
-        per_user.sort(key=lambda u: u["total"], reverse=True)
-        return per_user[:10]
+    @staticmethod
+    def _save_charts_tx(tx, boards: List[dict], days: int):
+        last_date = VoteRepository._get_last_date_tx(tx)
+        tx.run(
+            """
+            UNWIND $boards AS board
+            MERGE (l:Leaderboard {domain: board.domain, days: $days, date: $lastDate})
+            WITH l, board
+            OPTIONAL MATCH (l)-[:HAS_ENTRY]->(old:LeaderboardEntry)
+            DETACH DELETE old
+            WITH DISTINCT l, board
+            UNWIND board.entries AS entry
+            CREATE (l)-[:HAS_ENTRY]->(:LeaderboardEntry {
+                rank:   entry.rank,
+                userId: entry.userId,
+                total:  entry.total,
+                dates:  entry.dates,
+                counts: entry.counts
+            })
+            """,
+            boards=boards,
+            days=days,
+            lastDate=last_date.isoformat(),
+        )
+
+    @staticmethod
+    def clear_charts() -> None:
+        """
+        Supprime tous les classements matérialisés.
+        """
+        drv = get_driver()
+        with drv.session() as session:
+            session.execute_write(VoteRepository._clear_charts_tx)
+
+    @staticmethod
+    def _clear_charts_tx(tx):
+        tx.run(
+            """
+            MATCH (l:Leaderboard)
+            OPTIONAL MATCH (l)-[:HAS_ENTRY]->(e:LeaderboardEntry)
+            DETACH DELETE l, e
+            """
+        )
 
     @staticmethod
     def get_all_domains() -> List:
@@ -1028,9 +1433,7 @@ class VoteRepository:
 
     @staticmethod
     def _get_all_domains_tx(tx) -> List:
-        res = tx.run(
-            "MATCH ()-[r:VOTED]->() WHERE r.current = true RETURN DISTINCT r.domain AS domain"
-        )
+        res = tx.run(VoteRepository.ALL_DOMAINS_QUERY)
         return [rec['domain'] for rec in res]
     
     @staticmethod
@@ -1041,26 +1444,37 @@ class VoteRepository:
 
     @staticmethod
     def _get_last_update_tx(tx) -> str:
-        res = tx.run(
-            "MATCH (m:StatsMeta {id: 'daily_stats'}) RETURN m.lastDate AS lastDate"
-        ).single()
+        return VoteRepository._last_update(tx.run(VoteRepository.LAST_DATE_QUERY).single())
+
+    @staticmethod
+    def _last_update(res) -> str:
         return res['lastDate'] if res and res['lastDate'] is not None else datetime.date.today().isoformat()
 
     @staticmethod
     def get_publish_votes_setting(user_id: str) -> tuple[bool, dict]:
+        """
+        Retourne (publishVotes, { lastDate: { domain: count } }) : seules les stats
+        du dernier jour calculé sont lues.
+        """
         drv = get_driver()
         with drv.session() as session:
             return session.execute_read(VoteRepository._get_publish_votes_setting_tx, user_id)
     
     @staticmethod
     def _get_publish_votes_setting_tx(tx, user_id: str) -> tuple[bool, dict]:
+        last_date = VoteRepository._get_last_date_tx(tx)
         res = tx.run(
-            "MATCH (u:User {id: $userId}) RETURN u.publishVotes AS publishVotes, u.stats AS stats",
-            userId=user_id
+            VoteRepository.PUBLISH_VOTES_SETTING_QUERY,
+            userId=user_id,
+            lastDate=last_date.isoformat(),
         ).single()
-        stats_json = res['stats'] if res and res['stats'] is not None else None
-        try:
-            stats = json.loads(stats_json)
-        except Exception:
-            return res['publishVotes'] if res and res['publishVotes'] is not False else False, {}
-        return res['publishVotes'] if res and res['publishVotes'] is not False else False, stats
+        return VoteRepository._publish_votes_setting(res, last_date)
+
+    @staticmethod
+    def _publish_votes_setting(res, last_date: datetime.date) -> tuple[bool, dict]:
+        if res is None:
+            return False, {}
+
+        publish_votes = res['publishVotes'] if res['publishVotes'] is not False else False
+        counts = {domain: count for domain, count in res['counts'] if domain is not None}
+        return publish_votes, ({last_date.isoformat(): counts} if counts else {})
@@ -16,4 +16,28 @@ django.setup()
 def override_authentication(settings):
     settings.REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"] = [
         "tests.fake_authentication.FakeAuthentication"
-    ]
\ No newline at end of file
+    ]
+
+@pytest.fixture(autouse=True)
+def clear_vote_cache():
+    from django.conf import settings
+    from django.core.cache import caches
+
+    caches[settings.VOTE_CACHE_ALIAS].clear()
+
+
+@pytest.fixture
+def shared_vote_cache(settings):
+    """
+    Active le cache `votes` (désactivé sans VOTE_CACHE_REDIS_URL) avec un LocMem tenant lieu de Redis.
+    """
+    from django.core.cache import caches
+
+    settings.CACHES = {
+        **settings.CACHES,
+        settings.VOTE_CACHE_ALIAS: {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "votes-test",
+        },
+    }
+    caches[settings.VOTE_CACHE_ALIAS].clear()
@@ -0,0 +1,123 @@
+from datetime import datetime
+
+from rest_framework.test import APIClient
+
+from db.repository.result_repository import ResultRepository
+
+ROW = {"userId": "u1", "domain": "tech", "count": 3, "domainTotal": 10, "electedAt": None}
+
+
+class FakeResult(list):
+    def single(self):
+        return self[0] if self else None
+
+
+class FakeTx:
+    """
+    Répond aux requêtes de `_get_vote_results_tx` et mémorise celles exécutées.
+    """
+
+    def __init__(self, usable):
+        self.usable = usable
+        self.queries = []
+
+    def run(self, query, **params):
+        self.queries.append((query, params))
+        if query is ResultRepository.SNAPSHOT_META_QUERY:
+            return FakeResult([{"usable": self.usable}])
+        return FakeResult([ROW])
+
+
+def test_results_are_read_from_an_up_to_date_snapshot():
+    tx = FakeTx(usable=True)
+
+    results = ResultRepository._get_vote_results_tx(tx, "tech", 5, None)
+
+    assert results == [ROW]
+    assert [query for query, _ in tx.queries] == [
+        ResultRepository.SNAPSHOT_META_QUERY,
+        ResultRepository.SNAPSHOT_QUERY,
+    ]
+    assert tx.queries[1][1] == {"domain": "tech", "top": 5}
+
+
+def test_results_are_computed_in_one_query_without_snapshot():
+    tx = FakeTx(usable=False)
+
+    ResultRepository._get_vote_results_tx(tx, None, 5, None)
+
+    (query, params) = tx.queries[-1]
+    assert len(tx.queries) == 2
+    assert query.count("MATCH") == 1
+    assert params == {"top": 5}
+
+
+def test_since_filter_bypasses_snapshot():
+    tx = FakeTx(usable=True)
+
+    ResultRepository._get_vote_results_tx(tx, "tech", 5, datetime(2025, 12, 1))
+
+    ((query, params),) = tx.queries
+    assert "v.createdAt >= datetime($since)" in query
+    assert params == {"top": 5, "domain": "tech", "since": "2025-12-01T00:00:00"}
+
+
+def test_results_endpoint_answers_304_for_current_etag(monkeypatch):
+    class DummyAsyncResultRepo:
+        calls = 0
+        version = "2025-12-15-1765760400000"
+
+        @staticmethod
+        async def get_results_version():
+            return DummyAsyncResultRepo.version
+
+        @staticmethod
+        async def get_vote_results(domain, top, since):
+            DummyAsyncResultRepo.calls += 1
+            return [dict(ROW)]
+
+    monkeypatch.setattr("core.services.result_service.AsyncResultRepository", DummyAsyncResultRepo, raising=True)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer test-user")
+
+    response = client.get("/api/results")
+    assert response.status_code == 200
+    assert response["ETag"] == '"results-2025-12-15-1765760400000"'
+    assert response.json()[0]["elected"] is True
+
+    response = client.get("/api/results", HTTP_IF_NONE_MATCH='"results-2025-12-15-1765760400000"')
+    assert response.status_code == 304
+    assert response["ETag"] == '"results-2025-12-15-1765760400000"'
+    assert DummyAsyncResultRepo.calls == 1
+
+    assert client.get("/api/results", HTTP_IF_NONE_MATCH='"results-2025-12-14-1765674000000"').status_code == 200
+
+
+def test_forced_run_on_the_same_day_changes_results_etag(monkeypatch):
+    class DummyAsyncResultRepo:
+        version = "2025-12-15-1765760400000"
+
+        @staticmethod
+        async def get_results_version():
+            return DummyAsyncResultRepo.version
+
+        @staticmethod
+        async def get_vote_results(domain, top, since):
+            return [dict(ROW)]
+
+    monkeypatch.setattr("core.services.result_service.AsyncResultRepository", DummyAsyncResultRepo, raising=True)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Bearer test-user")
+    etag = client.get("/api/results")["ETag"]
+
+    # Run forcé le même jour : le snapshot est réécrit, seule la version change
+    DummyAsyncResultRepo.version = "2025-12-15-1765798200000"
+
+    response = client.get("/api/results", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] == '"results-2025-12-15-1765798200000"'
+
+
+def test_results_version_falls_back_when_never_computed():
+    assert ResultRepository._results_version({"lastDate": "2025-12-15", "resultsVersion": 1765760400000}) == "2025-12-15-1765760400000"
+    assert ResultRepository._results_version(None).endswith("-0")
@@ -0,0 +1,35 @@
+from app.neo4j_checks import check_neo4j_schema
+
+
+def test_check_reports_missing_schema(monkeypatch):
+    monkeypatch.setattr(
+        "app.neo4j_checks.SchemaRepository.missing_schema",
+        staticmethod(lambda: ["user_id_unique", "voted_processed"]),
+    )
+
+    warnings = check_neo4j_schema(None)
+
+    assert [w.id for w in warnings] == ["vote.W002"]
+    assert "user_id_unique, voted_processed" in warnings[0].msg
+
+
+def test_check_passes_when_schema_is_online(monkeypatch):
+    monkeypatch.setattr("app.neo4j_checks.SchemaRepository.missing_schema", staticmethod(lambda: []))
+
+    assert check_neo4j_schema(None) == []
+
+
+def test_check_warns_when_neo4j_is_unreachable(monkeypatch):
+    def unreachable():
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr("app.neo4j_checks.SchemaRepository.missing_schema", staticmethod(unreachable))
+
+    assert [w.id for w in check_neo4j_schema(None)] == ["vote.W001"]
+
+
+def test_check_only_runs_with_deploy():
+    from django.core.checks import registry
+
+    assert check_neo4j_schema not in registry.registry.get_checks(include_deployment_checks=False)
+    assert check_neo4j_schema in registry.registry.get_checks(include_deployment_checks=True)
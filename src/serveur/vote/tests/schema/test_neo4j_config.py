@@ -0,0 +1,85 @@
+from app import neo4j_config
+from app.neo4j_config import Neo4jPoolMetrics, get_driver, unit_of_work
+
+
+class FakeSession:
+    def __init__(self, driver):
+        self.driver = driver
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDriver:
+    def __init__(self):
+        self.sessions = []
+
+    def session(self, **config):
+        session = FakeSession(self)
+        self.sessions.append(session)
+        return session
+
+
+def test_unit_of_work_shares_one_session(monkeypatch):
+    driver = FakeDriver()
+    monkeypatch.setattr(neo4j_config, "_driver", driver)
+
+    with unit_of_work():
+        with get_driver().session() as first:
+            pass
+        with unit_of_work():
+            with get_driver().session() as second:
+                pass
+        assert first is second
+        assert not first.closed
+
+    assert driver.sessions == [first]
+    assert first.closed
+
+
+def test_session_is_opened_lazily_and_not_shared_outside(monkeypatch):
+    driver = FakeDriver()
+    monkeypatch.setattr(neo4j_config, "_driver", driver)
+
+    with unit_of_work():
+        pass
+    assert driver.sessions == []
+
+    with get_driver().session() as first, get_driver().session() as second:
+        assert first is not second
+
+
+def test_pool_metrics_count_connections_and_wait_time(monkeypatch):
+    class Connection:
+        def __init__(self, in_use):
+            self.in_use = in_use
+
+    class Pool:
+        connections = {"localhost:7687": [Connection(True), Connection(False), Connection(False)]}
+
+        def acquire(self, *args, **kwargs):
+            return self.connections["localhost:7687"][0]
+
+    class Driver:
+        _pool = Pool()
+
+    for name, value in (("acquisitions", 0), ("wait_total", 0.0), ("wait_max", 0.0), ("errors", 0)):
+        monkeypatch.setattr(Neo4jPoolMetrics, name, value)
+
+    driver = Driver()
+    Neo4jPoolMetrics.instrument(driver)
+    Neo4jPoolMetrics.instrument(driver)
+    driver._pool.acquire("READ", 60, None, None, None, None)
+
+    metrics = Neo4jPoolMetrics.snapshot(driver)
+
+    assert (metrics["inUse"], metrics["idle"]) == (1, 2)
+    assert metrics["acquisitions"] == 1
+    assert metrics["waitTimeMax"] >= 0
@@ -0,0 +1,38 @@
+import time
+
+from django.core.cache import cache
+
+from app import token_cache
+from app.token_cache import TokenCache
+
+
+def _patch_verify(monkeypatch, claims):
+    calls = []
+
+    def verify_id_token(token):
+        calls.append(token)
+        return claims
+
+    cache.clear()
+    monkeypatch.setattr(token_cache, "initialize_firebase", lambda: None)
+    monkeypatch.setattr(token_cache.firebase_auth, "verify_id_token", verify_id_token)
+    return calls
+
+
+def test_verified_token_is_served_from_cache(monkeypatch):
+    calls = _patch_verify(monkeypatch, {"uid": "u1", "exp": time.time() + 3600})
+
+    assert TokenCache.verify("token-1")["uid"] == "u1"
+    assert TokenCache.verify("token-1")["uid"] == "u1"
+    TokenCache.verify("token-2")
+
+    assert calls == ["token-1", "token-2"]
+
+
+def test_expired_token_is_never_cached(monkeypatch):
+    calls = _patch_verify(monkeypatch, {"uid": "u1", "exp": time.time() - 1})
+
+    TokenCache.verify("token-1")
+    TokenCache.verify("token-1")
+
+    assert len(calls) == 2
@@ -24,11 +24,14 @@ def sample_data(driver):
 
         session.run("""
             CREATE (u:User {id: '1', publishVotes: true})
-            CREATE (u2:User {id: '2', stats: '{"2025-12-15": {"france": 1}}', publishVotes: true})
+            CREATE (u2:User {id: '2', publishVotes: true})
             CREATE (u3:User {id: '3', publishVotes: true})
-            CREATE (u4:User {id: '4', stats: '{"2025-12-15": {"france": 3}}', publishVotes: true})
+            CREATE (u4:User {id: '4', publishVotes: true})
             CREATE (u5:User {id: '5', publishVotes: true})
 
+            CREATE (:DailyStat {userId: '2', domain: "france", date: date('2025-12-15'), count: 1})
+            CREATE (:DailyStat {userId: '4', domain: "france", date: date('2025-12-15'), count: 3})
+
             CREATE (u)-[:VOTED {current: true, created_at: datetime(), count: 1, domain: "france"}]->(u2)
             CREATE (u2)-[:VOTED {created_at: datetime("2025-02-14T15:30:00Z"), count: 2, domain: "france"}]->(u4)
             CREATE (u3)-[:VOTED {created_at: datetime("2025-11-15T15:30:00Z"), count:1, domain: "france"}]->(u4)
@@ -0,0 +1,19 @@
+from api.management.commands.migrate_daily_stats import stats_blob_to_rows
+
+
+def test_stats_blob_to_rows():
+    rows = stats_blob_to_rows(
+        "4",
+        '{"2025-12-14": {"france": 2, "tech": "x"}, "2025-12-15": {"france": 3}, "bad": {"france": 1}}',
+    )
+
+    assert sorted(rows, key=lambda r: (r["date"], r["domain"])) == [
+        {"userId": "4", "domain": "france", "date": "2025-12-14", "count": 2},
+        {"userId": "4", "domain": "tech", "date": "2025-12-14", "count": 0},
+        {"userId": "4", "domain": "france", "date": "2025-12-15", "count": 3},
+    ]
+
+
+def test_stats_blob_to_rows_ignores_invalid_json():
+    assert stats_blob_to_rows("4", "not json") == []
+    assert stats_blob_to_rows("4", "[1, 2]") == []
@@ -0,0 +1,85 @@
+from core.services.stats_service import StatsService
+
+
+CHART = {
+    "france": [{"userId": "4", "total": 3, "votes": [{"date": "2025-12-15", "count": 3}]}],
+    "tech": [],
+}
+
+
+class DummyRepo:
+    precomputed = {}
+    computed_with = None
+    saved = []
+
+    @staticmethod
+    def get_charts(days):
+        return dict(DummyRepo.precomputed.get(days, {}))
+
+    @staticmethod
+    def get_all_domains():
+        return ["france", "tech"]
+
+    @staticmethod
+    def compute_charts(domains, days, top):
+        DummyRepo.computed_with = (domains, days, top)
+        return {domain: CHART[domain] for domain in domains}
+
+    @staticmethod
+    def save_charts(charts, days):
+        DummyRepo.saved.append((days, charts))
+
+    @staticmethod
+    def replace_charts(charts_by_days):
+        DummyRepo.saved = [("replace", charts_by_days)]
+
+
+def _patch(monkeypatch, precomputed):
+    DummyRepo.precomputed = precomputed
+    DummyRepo.computed_with = None
+    DummyRepo.saved = []
+    monkeypatch.setattr("core.services.stats_service.VoteRepository", DummyRepo, raising=True)
+
+
+def test_get_chart_serves_precomputed_leaderboard(monkeypatch):
+    _patch(monkeypatch, {30: CHART})
+
+    chart = StatsService.get_chart(domain="france", days=30)
+
+    assert chart == [{"domain": "france", "users": CHART["france"]}]
+    assert DummyRepo.computed_with is None
+    assert DummyRepo.saved == []
+
+
+def test_get_chart_computes_and_saves_missing_window(monkeypatch, settings):
+    settings.STATS_CHART_WINDOWS = [7, 30]
+    settings.STATS_CHART_TOP = 5
+    _patch(monkeypatch, {30: CHART})
+
+    chart = StatsService.get_chart(days=7)
+
+    assert chart == [{"domain": "france", "users": CHART["france"]}, {"domain": "tech", "users": []}]
+    assert DummyRepo.computed_with == (["france", "tech"], 7, 5)
+    assert DummyRepo.saved == [(7, CHART)]
+
+
+def test_get_chart_does_not_save_unconfigured_window(monkeypatch, settings):
+    settings.STATS_CHART_WINDOWS = [7, 30]
+    _patch(monkeypatch, {30: CHART})
+
+    chart = StatsService.get_chart(domain="france", days=45)
+
+    assert chart == [{"domain": "france", "users": CHART["france"]}]
+    assert DummyRepo.computed_with[1] == 45
+    assert DummyRepo.saved == []
+
+
+def test_refresh_charts_materialises_each_window(monkeypatch, settings):
+    settings.STATS_CHART_WINDOWS = [7, 30]
+    settings.STATS_CHART_TOP = 10
+    _patch(monkeypatch, {})
+
+    StatsService.refresh_charts()
+
+    # Tous les classements sont remplacés en un seul appel (une transaction)
+    assert DummyRepo.saved == [("replace", {7: CHART, 30: CHART})]
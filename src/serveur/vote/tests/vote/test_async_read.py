@@ -0,0 +1,150 @@
+import asyncio
+
+from rest_framework.test import APIClient
+
+from app import neo4j_config
+from core.services.stats_service import StatsService
+from core.services.vote_service import VoteService
+
+USER_ID = "99999999-9999-9999-9999-999999999999"
+
+
+class DummyAsyncVoteRepo:
+    """
+    Lectures async en mémoire, même contrat que AsyncVoteRepository.
+    """
+
+    publish_votes = False
+    calls = []
+
+    @staticmethod
+    async def get_last_update():
+        DummyAsyncVoteRepo.calls.append("last_update")
+        return "2025-12-15"
+
+    @staticmethod
+    async def get_publish_votes_setting(user_id):
+        DummyAsyncVoteRepo.calls.append("setting")
+        return DummyAsyncVoteRepo.publish_votes, {"2025-12-15": {"tech": 2, "france": 7}}
+
+    @staticmethod
+    async def get_received_votes_summary(user_id, domain=None):
+        DummyAsyncVoteRepo.calls.append("summary")
+        return {
+            "userId": user_id,
+            "usersByDomain": {"tech": ["1", "2"], "france": ["3"]},
+        }
+
+    @staticmethod
+    async def get_charts(days):
+        return {"tech": [{"userId": "1", "total": 2, "votes": []}]} if days == 30 else {}
+
+
+def _patch(monkeypatch, publish_votes=False):
+    DummyAsyncVoteRepo.publish_votes = publish_votes
+    DummyAsyncVoteRepo.calls = []
+    monkeypatch.setattr("core.services.vote_service.AsyncVoteRepository", DummyAsyncVoteRepo, raising=True)
+    monkeypatch.setattr("core.services.stats_service.AsyncVoteRepository", DummyAsyncVoteRepo, raising=True)
+
+
+def test_aget_received_votes_hides_private_domains(monkeypatch, shared_vote_cache):
+    _patch(monkeypatch)
+
+    res = asyncio.run(VoteService.aget_received_votes(USER_ID))
+
+    # Seul "france" atteint MIN_PUBLIC_VOTES
+    assert res["byDomain"] == {"france": 7}
+    assert res["usersByDomain"] == {"france": ["3"]}
+    assert res["total"] == 7
+
+    # Visibilité mise en cache : la seconde lecture ne relit que les votes reçus
+    DummyAsyncVoteRepo.calls = []
+    res = asyncio.run(VoteService.aget_received_votes(USER_ID, is_me=True))
+    assert res["total"] == 9
+    assert DummyAsyncVoteRepo.calls == ["summary"]
+
+
+def test_aget_chart_falls_back_to_materialisation(monkeypatch):
+    _patch(monkeypatch)
+    monkeypatch.setattr(StatsService, "_materialize_chart", staticmethod(lambda days: {"france": []}))
+
+    assert asyncio.run(StatsService.aget_chart(days=30)) == [
+        {"domain": "tech", "users": [{"userId": "1", "total": 2, "votes": []}]}
+    ]
+    assert asyncio.run(StatsService.aget_chart(days=45)) == [{"domain": "france", "users": []}]
+
+
+def test_async_view_authenticates_and_serves_received_votes(monkeypatch):
+    _patch(monkeypatch, publish_votes=True)
+    client = APIClient()
+
+    assert client.get("/api/votes/for-user/me").status_code == 403
+
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {USER_ID}")
+    response = client.get("/api/votes/for-user/me")
+
+    assert response.status_code == 200
+    assert response.json()["byDomain"] == {"tech": 2, "france": 7}
+
+
+class DummyAsyncDriver:
+    opened = []
+
+    def __init__(self):
+        self.closed = False
+        DummyAsyncDriver.opened.append(self)
+
+    async def close(self):
+        self.closed = True
+
+
+def _patch_async_driver(monkeypatch):
+    DummyAsyncDriver.opened = []
+    monkeypatch.setattr(
+        neo4j_config.AsyncGraphDatabase, "driver", staticmethod(lambda *args, **kwargs: DummyAsyncDriver())
+    )
+
+
+def test_async_driver_scope_closes_request_driver_outside_asgi_server(monkeypatch):
+    _patch_async_driver(monkeypatch)
+
+    async def request():
+        async with neo4j_config.async_driver_scope():
+            return neo4j_config.get_async_driver()
+
+    # Hors serveur ASGI, chaque boucle a son driver, fermé en fin de requête
+    first, second = asyncio.run(request()), asyncio.run(request())
+    assert first is not second
+    assert first.closed and second.closed
+
+
+def test_asgi_lifespan_shares_one_async_driver_and_closes_it(monkeypatch):
+    _patch_async_driver(monkeypatch)
+
+    async def serve():
+        messages = asyncio.Queue()
+        sent = []
+
+        async def send(message):
+            sent.append(message["type"])
+
+        server = asyncio.create_task(neo4j_config.async_driver_lifespan(messages.get, send))
+        await messages.put({"type": "lifespan.startup"})
+        while not sent:
+            await asyncio.sleep(0)
+
+        drivers = []
+        for _ in range(3):
+            async with neo4j_config.async_driver_scope():
+                drivers.append(neo4j_config.get_async_driver())
+
+        await messages.put({"type": "lifespan.shutdown"})
+        await server
+        return drivers, sent
+
+    drivers, sent = asyncio.run(serve())
+
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert DummyAsyncDriver.opened == [drivers[0]]
+    assert drivers == [drivers[0]] * 3
+    assert drivers[0].closed
@@ -0,0 +1,191 @@
+from core.services.batch_validation_service import BatchValidationService
+
+
+def _dummy_repo(state_rows, votes, thresholds):
+    class DummyRepo:
+        saved = []
+
+        @staticmethod
+        def fetch_votes_by_ids(rel_ids):
+            return [
+                {
+                    "relId": rel_id,
+                    "voterId": votes[rel_id][0],
+                    "targetId": votes[rel_id][1],
+                    "domain": "tech",
+                    "voterThreshold": thresholds.get(votes[rel_id][0], 100),
+                    "targetThreshold": thresholds.get(votes[rel_id][1], 100),
+                }
+                for rel_id in rel_ids
+                if rel_id in votes
+            ]
+
+        @staticmethod
+        def fetch_domain_state(domain):
+            return [
+                {
+                    "relId": f"{a}->{b}",
+                    "sourceId": a,
+                    "targetId": b,
+                    "count": count,
+                    "cycle": cycle,
+                    "sourceThreshold": thresholds.get(a, 100),
+                    "targetThreshold": thresholds.get(b, 100),
+                }
+                for a, b, count, cycle in state_rows
+            ]
+
+        @staticmethod
+        def save_validation_batch(valid_ids, rows):
+            DummyRepo.saved.append((valid_ids, {row["relId"]: (row["count"], row["cycle"]) for row in rows}))
+
+    return DummyRepo
+
+
+def test_votes_see_counts_of_previously_validated_votes(monkeypatch):
+    repo = _dummy_repo(
+        state_rows=[("a", "b", 1, False)],
+        votes={"v1": ("c", "a"), "v2": ("x", "c")},
+        thresholds={"b": 1},
+    )
+    monkeypatch.setattr("core.services.batch_validation_service.VoteRepository", repo, raising=True)
+
+    rejected, timings = BatchValidationService.validate_votes(["v1", "v2"])
+
+    # v1 est valide, puis b reçoit 2 voix > seuil 1 : v2 est rejeté
+    assert rejected == ["v2"]
+    assert repo.saved == [(["v1"], {"v1": (1, False), "a->b": (2, False)})]
+    assert set(timings) == {"load", "validate", "write"}
+
+
+def test_vote_closing_a_cycle_sets_cycle_weight(monkeypatch):
+    repo = _dummy_repo(
+        state_rows=[("a", "b", 1, False)],
+        votes={"v1": ("b", "a")},
+        thresholds={},
+    )
+    monkeypatch.setattr("core.services.batch_validation_service.VoteRepository", repo, raising=True)
+
+    rejected, _ = BatchValidationService.validate_votes(["v1"])
+
+    assert rejected == []
+    assert repo.saved == [(["v1"], {"v1": (2, True), "a->b": (2, True)})]
+
+
+def test_state_is_kept_across_chunks(monkeypatch):
+    repo = _dummy_repo(
+        state_rows=[("a", "b", 1, False)],
+        votes={"v1": ("c", "a"), "v2": ("d", "c")},
+        thresholds={},
+    )
+    monkeypatch.setattr("core.services.batch_validation_service.VoteRepository", repo, raising=True)
+
+    rejected, _ = BatchValidationService.validate_votes(["v1", "missing", "v2"], batch_size=2)
+
+    assert rejected == []
+    assert repo.saved == [
+        (["v1"], {"v1": (1, False), "a->b": (2, False)}),
+        (["v2"], {"v2": (1, False), "v1": (2, False), "a->b": (3, False)}),
+    ]
+
+
+# -------------------- EQUIVALENCE AVEC LA VALIDATION VOTE PAR VOTE (Neo4j) --------------------
+
+EQUIV_PREFIX = "batch-equiv-"
+EQUIV_DOMAIN = f"{EQUIV_PREFIX}tech"
+
+# Relations déjà validées : (votant, cible, count, cycle)
+EQUIV_CURRENT = [("a", "b", 1, False), ("g", "h", 1, False)]
+# Votes à valider, dans l'ordre : chaîne, dépassement de seuil, vote vers un votant rejeté,
+# auto-vote et fermeture de cycle
+EQUIV_VOTES = [("c", "a"), ("d", "c"), ("e", "d"), ("b", "e"), ("f", "f"), ("h", "g")]
+EQUIV_THRESHOLDS = {"b": 2, "f": -1}
+
+
+def _equiv_graph() -> list[str]:
+    """
+    (Re)crée le graphe de test et retourne les elementId() des votes à valider, dans l'ordre de EQUIV_VOTES.
+    """
+    from app.neo4j_config import get_driver
+
+    users = {name for edge in EQUIV_CURRENT + EQUIV_VOTES for name in edge[:2]}
+    driver = get_driver()
+    with driver.session() as session:
+        session.run("MATCH (u:User) WHERE u.id STARTS WITH $prefix DETACH DELETE u", prefix=EQUIV_PREFIX)
+        session.run(
+            """
+            UNWIND $users AS user
+            CREATE (:User {id: $prefix + user.name, threshold: user.threshold, publishVotes: false})
+            """,
+            prefix=EQUIV_PREFIX,
+            users=[{"name": name, "threshold": EQUIV_THRESHOLDS.get(name, 100)} for name in sorted(users)],
+        )
+        session.run(
+            """
+            UNWIND $edges AS edge
+            MATCH (u:User {id: $prefix + edge.voter}), (t:User {id: $prefix + edge.target})
+            CREATE (u)-[:VOTED {domain: $domain, processed: true, valid: true, current: true,
+                                count: edge.count, cycle: edge.cycle}]->(t)
+            """,
+            prefix=EQUIV_PREFIX,
+            domain=EQUIV_DOMAIN,
+            edges=[{"voter": v, "target": t, "count": c, "cycle": cy} for v, t, c, cy in EQUIV_CURRENT],
+        )
+        vote_ids = []
+        for voter, target in EQUIV_VOTES:
+            vote_ids.append(session.run(
+                """
+                MATCH (u:User {id: $prefix + $voter}), (t:User {id: $prefix + $target})
+                CREATE (u)-[v:VOTED {domain: $domain, processed: false}]->(t)
+                RETURN elementId(v) AS relId
+                """,
+                prefix=EQUIV_PREFIX,
+                domain=EQUIV_DOMAIN,
+                voter=voter,
+                target=target,
+            ).single()["relId"])
+    return vote_ids
+
+
+def _equiv_snapshot() -> dict:
+    """
+    État des relations du graphe de test : (votant, cible) -> (processed, valid, current, count, cycle).
+    """
+    from app.neo4j_config import get_driver
+
+    driver = get_driver()
+    with driver.session() as session:
+        rows = session.run(
+            """
+            MATCH (u:User)-[v:VOTED {domain: $domain}]->(t:User)
+            RETURN u.id AS voter, t.id AS target,
+                   v.processed AS processed, v.valid AS valid, v.current AS current,
+                   v.count AS count, v.cycle AS cycle
+            """,
+            domain=EQUIV_DOMAIN,
+        ).data()
+        session.run("MATCH (u:User) WHERE u.id STARTS WITH $prefix DETACH DELETE u", prefix=EQUIV_PREFIX)
+    return {
+        (row["voter"], row["target"]): (row["processed"], row["valid"], row["current"], row["count"], row["cycle"])
+        for row in rows
+    }
+
+
+def test_batch_validation_matches_vote_by_vote_validation():
+    from core.services.vote_validation_service import VoteValidationService
+
+    # Requêtes d'origine : check_vote_validity, mark_vote_valid et update_counts vote par vote
+    vote_ids = _equiv_graph()
+    rejected_one_by_one = [
+        EQUIV_VOTES[index] for index, vote_id in enumerate(vote_ids)
+        if not VoteValidationService.validate_vote(vote_id)
+    ]
+    expected = _equiv_snapshot()
+
+    # Requêtes réécrites : lectures groupées et une écriture par lot (lots de 2 pour traverser les lots)
+    vote_ids = _equiv_graph()
+    rejected_ids, _ = BatchValidationService.validate_votes(vote_ids, batch_size=2)
+    rejected_batch = [EQUIV_VOTES[vote_ids.index(vote_id)] for vote_id in rejected_ids]
+
+    assert rejected_batch == rejected_one_by_one == [("e", "d")]
+    assert _equiv_snapshot() == expected
@@ -0,0 +1,69 @@
+from db.repository.vote_repository import VoteRepository
+
+
+class FakeTx:
+    """
+    Répond à la requête d'un saut de `_walk_chain_tx` à partir d'une liste de relations (source, cible).
+    """
+
+    def __init__(self, pairs, thresholds=None):
+        self.pairs = pairs
+        self.thresholds = thresholds or {}
+        self.queries = 0
+
+    def run(self, query, nodeId, domain, used):
+        self.queries += 1
+        rows = [
+            {
+                "relId": f"{a}->{b}",
+                "targetId": b,
+                "targetThreshold": self.thresholds.get(b, 100),
+                "count": 1,
+                "cycle": False,
+            }
+            for a, b in self.pairs
+            if a == nodeId and f"{a}->{b}" not in used
+        ]
+        return FakeResult(rows[0] if rows else None)
+
+
+class FakeResult:
+    def __init__(self, record):
+        self.record = record
+
+    def single(self):
+        return self.record
+
+
+def _walk(pairs, start="a"):
+    tx = FakeTx(pairs)
+    nodes, rels = VoteRepository._walk_chain_tx(tx, start, 100, "tech")
+    return [node["id"] for node in nodes], [rel["relId"] for rel in rels], tx.queries
+
+
+def test_walk_follows_chain_to_its_end():
+    nodes, rels, queries = _walk([("a", "b"), ("b", "c"), ("x", "b")])
+
+    assert nodes == ["a", "b", "c"]
+    assert rels == ["a->b", "b->c"]
+    # Une requête par saut, plus celle qui constate la fin de chaîne
+    assert queries == 3
+
+
+def test_walk_stops_when_coming_back_to_a_node():
+    nodes, rels, _ = _walk([("a", "b"), ("b", "c"), ("c", "b")])
+
+    assert nodes == ["a", "b", "c", "b"]
+    assert rels == ["a->b", "b->c", "c->b"]
+
+
+def test_walk_keeps_final_self_loop_and_thresholds():
+    tx = FakeTx([("a", "b"), ("b", "b")], thresholds={"b": 3})
+
+    nodes, rels = VoteRepository._walk_chain_tx(tx, "a", 7, "tech")
+
+    assert [node["threshold"] for node in nodes] == [7, 3, 3]
+    assert [(rel["sourceId"], rel["targetId"], rel["sourceThreshold"]) for rel in rels] == [
+        ("a", "b", 7),
+        ("b", "b", 3),
+    ]
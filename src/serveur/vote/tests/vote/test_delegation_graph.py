@@ -0,0 +1,129 @@
+from core.services.delegation_graph_service import DelegationGraphService
+
+
+def _edges(*pairs):
+    return [
+        {"relId": f"{a}->{b}", "sourceId": a, "targetId": b}
+        for a, b in pairs
+    ]
+
+
+def _by_rel(rows):
+    return {row["relId"]: (row["count"], row["cycle"]) for row in rows}
+
+
+def test_chain_propagates_counts():
+    rows = _by_rel(DelegationGraphService.compute_counts(_edges(("a", "b"), ("b", "c"), ("d", "c"))))
+
+    assert rows["a->b"] == (1, False)
+    assert rows["b->c"] == (2, False)
+    assert rows["d->c"] == (1, False)
+
+
+def test_self_loop_is_cycle_without_count():
+    rows = _by_rel(DelegationGraphService.compute_counts(_edges(("a", "a"), ("b", "a"))))
+
+    assert rows["a->a"] == (None, True)
+    assert rows["b->a"] == (1, False)
+
+
+def test_cycle_value_includes_external_weight():
+    # x -> y -> a, z -> b, a <-> b <-> c forme un cycle de taille 3
+    rows = _by_rel(DelegationGraphService.compute_counts(_edges(
+        ("x", "y"), ("y", "a"), ("z", "b"),
+        ("a", "b"), ("b", "c"), ("c", "a"),
+    )))
+
+    assert rows["x->y"] == (1, False)
+    assert rows["y->a"] == (2, False)
+    assert rows["z->b"] == (1, False)
+    for rel in ("a->b", "b->c", "c->a"):
+        assert rows[rel] == (3 + 2 + 1, True)
+
+
+def test_nodes_downstream_of_cycle_are_not_propagated():
+    rows = _by_rel(DelegationGraphService.compute_counts(_edges(("a", "b"), ("b", "a"), ("a", "c"), ("c", "d"))))
+
+    assert rows["a->b"] == (2, True)
+    assert rows["a->c"] == (None, False)
+    assert rows["c->d"] == (None, False)
+
+
+def test_recalculate_writes_one_batch_per_domain(monkeypatch):
+    class DummyRepo:
+        written = []
+
+        @staticmethod
+        def get_all_domains():
+            return ["tech", "design"]
+
+        @staticmethod
+        def fetch_current_edges_by_domain(domain):
+            return _edges(("a", "b")) if domain == "tech" else _edges(("c", "c"))
+
+        @staticmethod
+        def write_counts(rows):
+            DummyRepo.written.append(rows)
+
+    monkeypatch.setattr(
+        "core.services.delegation_graph_service.VoteRepository",
+        DummyRepo,
+        raising=True,
+    )
+
+    DelegationGraphService.recalculate_counts_by_domain()
+
+    assert DummyRepo.written == [
+        [{"relId": "a->b", "count": 1, "cycle": False}],
+        [{"relId": "c->c", "count": None, "cycle": True}],
+    ]
+
+
+def _stored(edges):
+    # Relations telles que stockées après un recalcul complet
+    rows = _by_rel(DelegationGraphService.compute_counts(edges))
+    return [{**edge, "count": rows[edge["relId"]][0], "cycle": rows[edge["relId"]][1]} for edge in edges]
+
+
+def _apply_incremental(stored, seeds):
+    rows = _by_rel(DelegationGraphService.compute_affected_counts(stored, seeds))
+    return {
+        edge["relId"]: rows.get(edge["relId"], (edge["count"], edge["cycle"]))
+        for edge in stored
+    }
+
+
+def test_incremental_matches_full_recompute_after_vote_change():
+    # d ne vote plus pour b mais pour e : b, c et la branche e -> c changent, x -> a non
+    before = _edges(("x", "a"), ("a", "b"), ("d", "b"), ("b", "c"), ("f", "e"), ("e", "c"))
+    after = [edge for edge in before if edge["relId"] != "d->b"] + _edges(("d", "e"))
+    stored = [edge for edge in _stored(before) if edge["relId"] != "d->b"]
+    stored += [{**edge, "count": None, "cycle": False} for edge in _edges(("d", "e"))]
+
+    rows = DelegationGraphService.compute_affected_counts(stored, {"d", "b"})
+
+    assert {row["relId"] for row in rows} == {"b->c", "d->e", "e->c"}
+    assert _apply_incremental(stored, {"d", "b"}) == _by_rel(DelegationGraphService.compute_counts(after))
+
+
+def test_incremental_keeps_nodes_downstream_of_an_untouched_cycle_unpropagated():
+    # Le cycle a <-> b n'est pas touché, c est en aval : c -> d reste sans poids
+    before = _edges(("a", "b"), ("b", "a"), ("a", "c"), ("c", "d"), ("y", "c"))
+    after = [edge for edge in before if edge["relId"] != "y->c"] + _edges(("y", "y"))
+    stored = [edge for edge in _stored(before) if edge["relId"] != "y->c"]
+    stored += [{**edge, "count": None, "cycle": False} for edge in _edges(("y", "y"))]
+
+    assert _apply_incremental(stored, {"y", "c"}) == _by_rel(DelegationGraphService.compute_counts(after))
+
+
+def test_incremental_cycle_value_includes_untouched_upstream_weight():
+    # z -> a reste inchangé, d rejoint le cycle a -> b -> a
+    before = _edges(("z", "a"), ("a", "b"), ("b", "a"), ("d", "d"))
+    after = [edge for edge in before if edge["relId"] != "d->d"] + _edges(("d", "b"))
+    stored = [edge for edge in _stored(before) if edge["relId"] != "d->d"]
+    stored += [{**edge, "count": None, "cycle": False} for edge in _edges(("d", "b"))]
+
+    result = _apply_incremental(stored, {"d"})
+
+    assert result == _by_rel(DelegationGraphService.compute_counts(after))
+    assert result["a->b"] == (2 + 1 + 1, True)
@@ -0,0 +1,66 @@
+import pytest
+
+from core.services.vote_cache import VoteCache
+from core.services.vote_service import VoteService
+
+
+pytestmark = pytest.mark.usefixtures("shared_vote_cache")
+
+
+def _dummy_repo():
+    class DummyRepo:
+        calls = []
+        publish = False
+
+        @staticmethod
+        def get_publish_votes_setting(user_id):
+            DummyRepo.calls.append(("setting", user_id))
+            return DummyRepo.publish, {"2026-01-01": {"tech": 10}}
+
+        @staticmethod
+        def get_last_update():
+            DummyRepo.calls.append(("last_update",))
+            return "2026-01-01"
+
+        @staticmethod
+        def get_all_domains():
+            DummyRepo.calls.append(("domains",))
+            return ["tech", "design"]
+
+    return DummyRepo
+
+
+def test_visibility_is_read_once(monkeypatch):
+    repo = _dummy_repo()
+    monkeypatch.setattr("core.services.vote_service.VoteRepository", repo, raising=True)
+
+    assert VoteService._get_visibility("u1") == (False, {"tech": 10})
+    assert VoteService._get_visibility("u1") == (False, {"tech": 10})
+
+    assert repo.calls == [("last_update",), ("setting", "u1")]
+
+
+def test_invalidate_user_reloads_setting(monkeypatch):
+    repo = _dummy_repo()
+    monkeypatch.setattr("core.services.vote_service.VoteRepository", repo, raising=True)
+
+    VoteService._get_visibility("u1")
+    repo.publish = True
+    VoteCache.invalidate_user("u1")
+
+    assert VoteService._get_visibility("u1") == (True, {"tech": 10})
+    assert repo.calls.count(("setting", "u1")) == 2
+    assert repo.calls.count(("last_update",)) == 1
+
+
+def test_invalidate_all_reloads_everything(monkeypatch):
+    repo = _dummy_repo()
+    monkeypatch.setattr("core.services.vote_service.VoteRepository", repo, raising=True)
+
+    VoteService._get_visibility("u1")
+    VoteService._get_visibility("u2")
+    VoteCache.invalidate_all()
+    VoteService._get_visibility("u1")
+
+    assert repo.calls.count(("last_update",)) == 2
+    assert repo.calls.count(("setting", "u1")) == 2